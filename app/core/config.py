@@ -1,6 +1,7 @@
 import json
 import os
 import sys
+import threading
 from app.core.constants import CONFIG_FILE
 
 class ConfigManager:
@@ -16,12 +17,25 @@ class ConfigManager:
         "spotdl_path": "",
         "log_level": "INFO",
         "language": "en",
+        "max_parallel_syncs": 3, # Playlists synced at the same time during batch syncs
+        "persistent_worker": True, # Reuse a long-lived spotDL process instead of spawning one per attempt
+        "adaptive_concurrency": True, # Tune spotDL --threads and parallel playlists from throughput/errors
+        "spotdl_threads": 4, # Starting (or fixed, if not adaptive) spotDL --threads
+        "max_spotdl_threads": 0, # Upper bound for adaptive threads; 0 = based on CPU count
+        "dedupe_tracks": True, # Store each track once (output_path/.library_store) and hardlink it into playlists
+        "use_manifests": True, # Cache resolved spotDL songs (USER_DATA_DIR/manifests) to skip re-searching
+        "verify_downloads": True, # Check downloaded files for truncation and re-download broken ones
+        "watch_library": True, # Keep folder status live (inotify on Linux, polling elsewhere)
+        "discovery_depth": 5, # Folder levels below the music folder searched for playlist folders
+        "read_tags": True, # Identify local files by their embedded Spotify ID/ISRC (needs mutagen)
         "library": [],  # List of dicts: {"url": "...", "name": "...", "type": "playlist/user"}
         "ignored_library_urls": [], # URLs that should not be auto-added from history
         "playlist_usage": {} # Dict: {"playlist_id_or_name": count}
     }
 
     def __init__(self):
+        # Re-entrant: callers mutating the library hold it around their own set() call
+        self.lock = threading.RLock()
         self.config = self.load_config()
 
     def increment_playlist_usage(self, playlist_id):
@@ -59,6 +73,10 @@ class ConfigManager:
 
     def save_config(self, bypass_safety=False):
         """Saves current config to JSON file atomically, stripping non-serializable objects."""
+        with self.lock:
+            self._save_config_locked(bypass_safety)
+
+    def _save_config_locked(self, bypass_safety=False):
         import traceback
         temp_file = CONFIG_FILE + ".tmp"
         
@@ -17,6 +17,16 @@ CONFIG_FILE = os.path.join(USER_DATA_DIR, "config.json")
 HISTORY_FILE = os.path.join(USER_DATA_DIR, "history.json")
 LOG_FILE = os.path.join(USER_DATA_DIR, "app.log")
 SPOTIFY_CACHE_FILE = os.path.join(USER_DATA_DIR, ".spotify_cache")
+RATE_LIMIT_FILE = os.path.join(USER_DATA_DIR, "rate_limits.json")
+SPOTDL_WORKER_LOG_FILE = os.path.join(USER_DATA_DIR, "spotdl_worker.log")
+JOB_DB_FILE = os.path.join(USER_DATA_DIR, "jobs.db")
+QUARANTINE_FILE = os.path.join(USER_DATA_DIR, "quarantine.json")
+MANIFEST_DIR = os.path.join(USER_DATA_DIR, "manifests")
+INTEGRITY_CACHE_FILE = os.path.join(USER_DATA_DIR, "integrity_cache.json")
+CATALOG_DB_FILE = os.path.join(USER_DATA_DIR, "file_catalog.db")
+FUZZY_MATCH_CACHE_FILE = os.path.join(USER_DATA_DIR, "fuzzy_matches.json")
+TAG_CACHE_FILE = os.path.join(USER_DATA_DIR, "tag_cache.json")
+DUPLICATE_CACHE_FILE = os.path.join(USER_DATA_DIR, "duplicate_hashes.json")
 
 REDIRECT_URI = "http://127.0.0.1:8888/callback"
 SCOPES = "user-library-read playlist-read-private playlist-read-collaborative"
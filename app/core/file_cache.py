@@ -0,0 +1,85 @@
+"""
+Shared plumbing of the file-scanning services (integrity probes, tag reads, content hashes,
+fuzzy matches): a dict persisted as one JSON file, and a process-pool map for per-file work.
+
+Imported by modules whose functions run in worker processes, so it must stay importable
+without the GUI (no app.core.constants / customtkinter imports).
+"""
+import atexit
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List
+
+class JsonCache:
+    """
+    A dict (`data`) loaded from and saved to a JSON file. Guard access to `data` with `lock`.
+    Without a path (or with an unreadable file) it starts empty; without a path it is never saved.
+    """
+    SAVE_DELAY = 5.0  # save_later() coalesces the changes of this many seconds into one write
+
+    def __init__(self, path, name: str):
+        self.path = path
+        self.name = name  # Owner, for error messages
+        self.lock = threading.Lock()
+        self.data = self.load()
+        self._timer = None
+        if path:
+            atexit.register(self.flush)
+
+    def load(self) -> dict:
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception:
+                return {}
+        return {}
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            with self.lock:
+                data = json.dumps(self.data, ensure_ascii=False)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        except Exception as e:
+            print(f"{self.name}: Error saving cache: {e}")
+
+    def save_later(self):
+        """Schedules a save in SAVE_DELAY seconds; changes made meanwhile are written by that same save."""
+        if not self.path:
+            return
+        with self.lock:
+            if self._timer:
+                return
+            self._timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Runs a scheduled save now (no-op when none is pending)."""
+        with self.lock:
+            timer, self._timer = self._timer, None
+        if timer:
+            timer.cancel()
+            self.save()
+
+def map_in_processes(fn: Callable, items: List, threshold: int, logger=None, label="Worker") -> List:
+    """
+    fn(item) for every item, in order, spread over a process pool. Fewer than `threshold` items
+    run inline (a pool isn't worth its startup cost), as does everything when no pool can start.
+    `fn` must be a module-level function.
+    """
+    if len(items) < threshold:
+        return [fn(item) for item in items]
+    workers = min(len(items), os.cpu_count() or 2)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fn, items, chunksize=max(1, len(items) // (workers * 4))))
+    except Exception as e:
+        if logger:
+            logger.warning(f"{label} pool unavailable ({e}). Processing files one by one.")
+        return [fn(item) for item in items]
@@ -0,0 +1,288 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from app.core.constants import CATALOG_DB_FILE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    name_lower TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    scanned_at REAL,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    byte_total INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs(parent);
+CREATE INDEX IF NOT EXISTS idx_dirs_name ON dirs(name_lower);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_files_dir ON files(dir, ext);
+"""
+
+class FileCatalog:
+    """
+    Local index (SQLite) of the files under the music folder: path, size, mtime and each
+    directory's mtime. A refresh only re-lists directories whose mtime changed (os.scandir);
+    unchanged directories cost one stat. Status checks and discovery query the catalog
+    instead of listing the disk.
+
+    Sibling directories are checked in a thread pool (one level at a time), so the round
+    trips of a network or slow disk overlap.
+
+    Note: a file rewritten in place doesn't change its directory's mtime; such files keep
+    their old size/mtime until the directory changes or refresh_dir() is called.
+
+    Each directory row also keeps the count and total size of its own files, updated whenever
+    it is re-listed, so disk usage is read without touching the files table or the disk.
+    Totals over several directories come from the files table instead and count each inode
+    once, since the content store hardlinks one copy of a track into every playlist holding it.
+    """
+    SCAN_WORKERS = 8
+
+    def __init__(self, db_path=CATALOG_DB_FILE, skip_dirs=()):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.skip_dirs = set(skip_dirs)  # Directory names never descended into
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Adds the usage/inode columns to catalogs created before them; their directories are re-listed on the next refresh."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(dirs)")}
+        if "file_count" not in columns:
+            self.conn.execute("ALTER TABLE dirs ADD COLUMN file_count INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("ALTER TABLE dirs ADD COLUMN byte_total INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("UPDATE dirs SET mtime_ns = -1")
+        if "inode" not in {row[1] for row in self.conn.execute("PRAGMA table_info(files)")}:
+            self.conn.execute("ALTER TABLE files ADD COLUMN inode INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("UPDATE dirs SET mtime_ns = -1")
+
+    @staticmethod
+    def _norm(path):
+        return os.path.normpath(os.path.abspath(path))
+
+    @staticmethod
+    def _below(path):
+        """LIKE pattern (ESCAPE '\\') matching every path below `path`."""
+        escaped = path.rstrip(os.sep).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return escaped + os.sep.replace("\\", "\\\\") + "%"
+
+    # --- Scanning ---
+    def refresh(self, root: str, max_depth: Optional[int] = None, changed: Optional[List[str]] = None) -> Tuple[int, int]:
+        """
+        Brings the catalog of `root` up to date. Returns (directories re-listed, directories checked).
+        With `max_depth`, directories deeper than that are neither checked nor listed (their
+        names are still cataloged by listing their parent). Re-listed directories are appended
+        to `changed` when given.
+        """
+        root = self._norm(root)
+        if not os.path.isdir(root):
+            self._drop_tree(root)
+            return 0, 0
+        rescanned = checked = 0
+        with self._refresh_lock, ThreadPoolExecutor(max_workers=self.SCAN_WORKERS) as pool:
+            level, depth = [(root, os.path.dirname(root))], 0
+            while level:
+                if len(level) > 1:
+                    results = list(pool.map(lambda item: self._visit(item[0], item[1], depth), level))
+                else:
+                    results = [self._visit(path, parent, depth) for path, parent in level]
+                next_level = []
+                for (path, _), (state, children) in zip(level, results):
+                    if state is None:
+                        continue  # Gone
+                    checked += 1
+                    if state:
+                        rescanned += 1
+                        if changed is not None:
+                            changed.append(path)
+                    if max_depth is None or depth < max_depth:
+                        next_level.extend((c, path) for c in children)
+                level, depth = next_level, depth + 1
+        return rescanned, checked
+
+    def _visit(self, path, parent, depth):
+        """
+        Checks one directory during refresh(): (None, []) if it is gone, (False, subdirectories)
+        if unchanged, (True, subdirectories) after re-listing it.
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._drop_tree(path)
+            return None, []
+        with self._lock:
+            row = self.conn.execute("SELECT mtime_ns, depth FROM dirs WHERE path = ?", (path,)).fetchone()
+            if row and row[1] != depth:
+                # First cataloged on its own (refresh_dir); record its place in this tree
+                self.conn.execute("UPDATE dirs SET parent = ?, depth = ? WHERE path = ?", (parent, depth, path))
+        if row and row[0] == mtime:
+            return False, self.subdirs(path)
+        return True, self._scan_dir(path, parent, depth, mtime)
+
+    def refresh_dir(self, path: str) -> bool:
+        """Re-lists one directory now (not its subdirectories). Returns False if it doesn't exist."""
+        path = self._norm(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._drop_tree(path)
+            return False
+        with self._lock:
+            row = self.conn.execute("SELECT parent, depth FROM dirs WHERE path = ?", (path,)).fetchone()
+        parent, depth = row if row else (os.path.dirname(path), 0)
+        with self._refresh_lock:
+            self._scan_dir(path, parent, depth, mtime)
+        return True
+
+    def _scan_dir(self, path, parent, depth, mtime) -> List[str]:
+        """Lists one directory and replaces its rows. Returns its subdirectories."""
+        files, subdirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.skip_dirs:
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            files.append((entry.path, path, entry.name, os.path.splitext(entry.name)[1].lower(),
+                                          st.st_size, st.st_mtime_ns, entry.inode()))
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("BEGIN")
+            cur.execute("DELETE FROM files WHERE dir = ?", (path,))
+            cur.executemany("INSERT OR REPLACE INTO files (path, dir, name, ext, size, mtime_ns, inode) VALUES (?, ?, ?, ?, ?, ?, ?)", files)
+            cur.execute("INSERT OR REPLACE INTO dirs (path, parent, name_lower, depth, mtime_ns, scanned_at, file_count, byte_total) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (path, parent, os.path.basename(path).lower(), depth, mtime, time.time(), len(files), sum(f[4] for f in files)))
+            known = [r[0] for r in cur.execute("SELECT path FROM dirs WHERE parent = ?", (path,))]
+            # Subdirectories get a row right away (mtime -1 = not listed yet), so refresh() always finds them
+            cur.executemany("INSERT OR IGNORE INTO dirs (path, parent, name_lower, depth, mtime_ns) VALUES (?, ?, ?, ?, -1)",
+                            [(d, path, os.path.basename(d).lower(), depth + 1) for d in subdirs])
+            cur.execute("COMMIT")
+        current = set(subdirs)
+        for gone in known:
+            if gone not in current:
+                self._drop_tree(gone)
+        return subdirs
+
+    def _drop_tree(self, path):
+        """Forgets a directory and everything below it."""
+        like = self._below(path)
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("BEGIN")
+            cur.execute("DELETE FROM files WHERE dir = ? OR dir LIKE ? ESCAPE '\\'", (path, like))
+            cur.execute("DELETE FROM dirs WHERE path = ? OR path LIKE ? ESCAPE '\\'", (path, like))
+            cur.execute("COMMIT")
+
+    # --- Queries ---
+    def is_cataloged(self, path: str) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM dirs WHERE path = ?", (self._norm(path),)).fetchone() is not None
+
+    def subdirs(self, path: str) -> List[str]:
+        with self._lock:
+            rows = self.conn.execute("SELECT path FROM dirs WHERE parent = ?", (self._norm(path),)).fetchall()
+        return [r[0] for r in rows]
+
+    def files_in(self, folder: str, extensions=None) -> List[Tuple[str, int, int]]:
+        """(name, size, mtime_ns) of the files directly in `folder`, optionally filtered by extension."""
+        folder = self._norm(folder)
+        if not self.is_cataloged(folder):
+            self.refresh_dir(folder)
+        with self._lock:
+            rows = self.conn.execute("SELECT name, size, mtime_ns, ext FROM files WHERE dir = ?", (folder,)).fetchall()
+        exts = {e.lower() for e in extensions} if extensions else None
+        return [(name, size, mtime) for name, size, mtime, ext in rows if exts is None or ext in exts]
+
+    def files_under(self, root: str, extensions=None) -> List[Tuple[str, int, int]]:
+        """(path, size, mtime_ns) of every cataloged file below `root`, optionally filtered by extension."""
+        root = self._norm(root)
+        with self._lock:
+            rows = self.conn.execute("SELECT path, size, mtime_ns, ext FROM files WHERE dir = ? OR dir LIKE ? ESCAPE '\\'",
+                                     (root, self._below(root))).fetchall()
+        exts = {e.lower() for e in extensions} if extensions else None
+        return [(path, size, mtime) for path, size, mtime, ext in rows if exts is None or ext in exts]
+
+    def count_files(self, folder: str, extensions=None) -> int:
+        """Number of files directly in `folder` (with one of `extensions`)."""
+        return len(self.files_in(folder, extensions))
+
+    def usage(self, folders) -> Dict[str, Tuple[int, int]]:
+        """{folder: (bytes, file count)} of the files directly in each folder; (0, 0) if not cataloged."""
+        paths = {self._norm(f): f for f in folders}
+        result = {f: (0, 0) for f in paths.values()}
+        keys = list(paths)
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self.conn.execute(f"SELECT path, byte_total, file_count FROM dirs WHERE path IN ({','.join('?' * len(chunk))})",
+                                         chunk).fetchall()
+                for path, size, count in rows:
+                    result[paths[path]] = (size, count)
+        return result
+
+    def total_usage(self, root: str, extensions=None) -> Tuple[int, int]:
+        """(bytes, file count) of everything cataloged at or below `root`, hardlinks counted once."""
+        root = self._norm(root)
+        return self._unique_usage("(dir = ? OR dir LIKE ? ESCAPE '\\')", [root, self._below(root)], extensions)
+
+    def folders_usage(self, folders, extensions=None) -> Tuple[int, int]:
+        """(bytes, file count) of the files directly in any of `folders`, hardlinks counted once."""
+        keys = list({self._norm(f) for f in folders})
+        if not keys:
+            return 0, 0
+        return self._unique_usage(f"dir IN ({','.join('?' * len(keys))})", keys, extensions)
+
+    def _unique_usage(self, where, args, extensions) -> Tuple[int, int]:
+        if extensions:
+            exts = sorted({e.lower() for e in extensions})
+            where += f" AND ext IN ({','.join('?' * len(exts))})"
+            args = [*args, *exts]
+        # Files sharing an inode are one file on disk; inode 0 = unknown, counted per path
+        query = (f"SELECT SUM(size), COUNT(*) FROM (SELECT MAX(size) AS size FROM files WHERE {where} "
+                 "GROUP BY CASE WHEN inode = 0 THEN path ELSE inode END)")
+        with self._lock:
+            row = self.conn.execute(query, args).fetchone()
+        return (row[0] or 0, row[1] or 0) if row else (0, 0)
+
+    def dirs_by_name(self, root: str, max_depth: Optional[int] = None) -> Dict[str, str]:
+        """{lowercased name: path} of the directories under `root`; the shallowest one wins on duplicates."""
+        root = self._norm(root)
+        with self._lock:
+            base = self.conn.execute("SELECT depth FROM dirs WHERE path = ?", (root,)).fetchone()
+            if not base:
+                return {}
+            args = [self._below(root)]
+            query = "SELECT name_lower, path FROM dirs WHERE path LIKE ? ESCAPE '\\'"
+            if max_depth is not None:
+                query += " AND depth <= ?"
+                args.append(base[0] + max_depth)
+            rows = self.conn.execute(query + " ORDER BY depth, path", args).fetchall()
+        result = {}
+        for name, path in rows:
+            result.setdefault(name, path)
+        return result
@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 from datetime import datetime
 from typing import List, Dict
 from app.core.constants import HISTORY_FILE
@@ -9,6 +10,8 @@ class HistoryManager:
     Manages persistent history of downloaded tracks/playlists.
     """
     def __init__(self):
+        # Parallel syncs add entries from several worker threads
+        self._lock = threading.RLock()
         self.history = self.load_history()
 
     def load_history(self) -> List[Dict]:
@@ -41,24 +44,33 @@ class HistoryManager:
         if error:
             entry["error"] = error
             
-        self.history.append(entry)
-        self.save_history()
+        with self._lock:
+            self.history.append(entry)
+            self.save_history()
         return entry
 
-    def set_last_entry_interrupted(self, is_interrupted: bool, error: str = None):
-        """Updates the 'interrupted' flag and optional error message of the most recent entry."""
-        if self.history:
-            self.history[-1]['interrupted'] = is_interrupted
-            if error:
-                self.history[-1]['error'] = error
-            self.save_history()
+    def set_last_entry_interrupted(self, is_interrupted: bool, error: str = None, source: str = None):
+        """Updates the 'interrupted' flag and optional error message of the most recent entry.
+        With `source`, targets the most recent entry for that URL (safe with parallel syncs)."""
+        with self._lock:
+            if source is not None:
+                entry = next((e for e in reversed(self.history) if e.get('source') == source), None)
+            else:
+                entry = self.history[-1] if self.history else None
+            if entry is not None:
+                entry['interrupted'] = is_interrupted
+                if error:
+                    entry['error'] = error
+                self.save_history()
 
     def save_history(self):
         """Saves history to JSON."""
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump(self.history, f, indent=4)
+        with self._lock:
+            with open(HISTORY_FILE, 'w') as f:
+                json.dump(self.history, f, indent=4)
 
     def clear_history(self):
         """Wipes all download history."""
-        self.history = []
-        self.save_history()
+        with self._lock:
+            self.history = []
+            self.save_history()
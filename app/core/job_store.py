@@ -0,0 +1,131 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Tuple
+from app.core.constants import JOB_DB_FILE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running',
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id INTEGER NOT NULL REFERENCES batches(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT,
+    name TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs(batch_id, status);
+CREATE TABLE IF NOT EXISTS track_progress (
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    track TEXT NOT NULL,
+    recorded_at TEXT,
+    PRIMARY KEY (job_id, track)
+);
+"""
+
+def _now():
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+class JobStore:
+    """
+    Durable queue of batch sync jobs (SQLite). Each playlist of a batch is a job that moves
+    pending -> running -> done/failed; downloaded tracks are recorded per job.
+    A batch still 'running' at startup was interrupted and can be resumed.
+    """
+    KEEP_BATCHES = 20  # Finished batches kept for reference
+
+    def __init__(self, db_path=JOB_DB_FILE):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def create_batch(self, kind: str, items: List[Dict], url_key=None, name_key=None) -> Tuple[int, List[int]]:
+        """Records a new batch with one pending job per item. Returns (batch_id, job_ids in item order)."""
+        url_key = url_key or (lambda it: it.get('url'))
+        name_key = name_key or (lambda it: it.get('name'))
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("BEGIN")
+            cur.execute("INSERT INTO batches (kind, created_at) VALUES (?, ?)", (kind, _now()))
+            batch_id = cur.lastrowid
+            job_ids = []
+            for pos, item in enumerate(items):
+                cur.execute(
+                    "INSERT INTO jobs (batch_id, position, url, name, payload, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (batch_id, pos, url_key(item), name_key(item), json.dumps(item), _now()))
+                job_ids.append(cur.lastrowid)
+            cur.execute("COMMIT")
+            self._prune_locked()
+        return batch_id, job_ids
+
+    def _prune_locked(self):
+        self.conn.execute(
+            "DELETE FROM batches WHERE status != 'running' AND id NOT IN "
+            "(SELECT id FROM batches ORDER BY id DESC LIMIT ?)", (self.KEEP_BATCHES,))
+
+    def _set_status(self, job_id, status, error=None, count_attempt=False):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ?, attempts = attempts + ? WHERE id = ?",
+                (status, error, _now(), 1 if count_attempt else 0, job_id))
+
+    def mark_running(self, job_id):
+        self._set_status(job_id, 'running', count_attempt=True)
+
+    def mark_done(self, job_id):
+        self._set_status(job_id, 'done')
+
+    def mark_failed(self, job_id, error=None):
+        self._set_status(job_id, 'failed', error=error)
+
+    def record_track(self, job_id, track: str):
+        """Records one downloaded track of a job (idempotent)."""
+        with self._lock:
+            self.conn.execute("INSERT OR IGNORE INTO track_progress (job_id, track, recorded_at) VALUES (?, ?, ?)",
+                              (job_id, track, _now()))
+
+    def job_tracks(self, job_id) -> List[str]:
+        with self._lock:
+            rows = self.conn.execute("SELECT track FROM track_progress WHERE job_id = ? ORDER BY recorded_at", (job_id,)).fetchall()
+        return [r[0] for r in rows]
+
+    def finish_batch(self, batch_id, status='done'):
+        with self._lock:
+            self.conn.execute("UPDATE batches SET status = ?, finished_at = ? WHERE id = ?", (status, _now(), batch_id))
+
+    def get_unfinished_batch(self) -> Optional[Dict]:
+        """Most recent batch that never finished: {id, kind, created_at, total, remaining}, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id, kind, created_at FROM batches WHERE status = 'running' ORDER BY id DESC LIMIT 1").fetchone()
+            if not row:
+                return None
+            total, remaining = self.conn.execute(
+                "SELECT COUNT(*), SUM(status IN ('pending', 'running')) FROM jobs WHERE batch_id = ?", (row[0],)).fetchone()
+        return {"id": row[0], "kind": row[1], "created_at": row[2], "total": total, "remaining": remaining or 0}
+
+    def resume_jobs(self, batch_id) -> List[Tuple[int, Dict]]:
+        """Jobs of a batch that still need to run, in original order. Jobs left 'running' by a crash become pending."""
+        with self._lock:
+            self.conn.execute("UPDATE jobs SET status = 'pending' WHERE batch_id = ? AND status = 'running'", (batch_id,))
+            rows = self.conn.execute(
+                "SELECT id, payload FROM jobs WHERE batch_id = ? AND status = 'pending' ORDER BY position", (batch_id,)).fetchall()
+        return [(job_id, json.loads(payload)) for job_id, payload in rows]
+
+    def cancel_unfinished(self):
+        """Marks every interrupted batch as cancelled (user chose not to resume)."""
+        with self._lock:
+            self.conn.execute("UPDATE batches SET status = 'cancelled', finished_at = ? WHERE status = 'running'", (_now(),))
@@ -0,0 +1,92 @@
+import json
+import os
+import time
+import threading
+from typing import Dict, List, Tuple
+from app.core.constants import QUARANTINE_FILE
+
+class QuarantineManager:
+    """
+    Remembers tracks spotDL repeatedly fails to find or download (LookupError/AudioProviderError)
+    and holds them out of sync plans until their next retry time. The retry interval doubles
+    with every failure: 6h, 12h, 24h, ... up to 30 days.
+    """
+    BASE_DELAY = 6 * 3600
+    MAX_DELAY = 30 * 24 * 3600
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entries = self.load_entries()
+
+    def load_entries(self) -> Dict[str, Dict]:
+        """Loads quarantine entries from JSON."""
+        if os.path.exists(QUARANTINE_FILE):
+            try:
+                with open(QUARANTINE_FILE, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                return {}
+        return {}
+
+    def save_entries(self):
+        """Saves quarantine entries to JSON."""
+        try:
+            with open(QUARANTINE_FILE, 'w') as f:
+                json.dump(self.entries, f, indent=4)
+        except Exception as e:
+            print(f"QuarantineManager: Error saving entries: {e}")
+
+    @staticmethod
+    def track_key(track: Dict) -> str:
+        """Spotify track ID, or the lowercased track name for tracks without one."""
+        return track.get('id') or f"name:{(track.get('name') or '').lower()}"
+
+    def is_held(self, track: Dict) -> bool:
+        """True while a track is quarantined and not yet due for another try."""
+        with self._lock:
+            entry = self.entries.get(self.track_key(track))
+        return bool(entry) and entry.get('next_retry', 0) > time.time()
+
+    def split(self, tracks: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Splits tracks into (due, held)."""
+        due, held = [], []
+        for track in tracks:
+            (held if self.is_held(track) else due).append(track)
+        return due, held
+
+    def record_failure(self, track: Dict, source: str = None, error: str = None):
+        """Counts another failure and schedules the next retry with exponential backoff."""
+        key = self.track_key(track)
+        with self._lock:
+            entry = self.entries.get(key) or {"name": track.get('name'), "failures": 0, "sources": []}
+            entry['failures'] += 1
+            delay = min(self.MAX_DELAY, self.BASE_DELAY * (2 ** (entry['failures'] - 1)))
+            entry['next_retry'] = time.time() + delay
+            entry['last_error'] = error
+            if source and source not in entry['sources']:
+                entry['sources'].append(source)
+            self.entries[key] = entry
+            self.save_entries()
+        return entry
+
+    def release(self, track: Dict) -> bool:
+        """Forgets a track (it downloaded fine). Returns True if it was quarantined."""
+        key = self.track_key(track)
+        with self._lock:
+            if key not in self.entries:
+                return False
+            del self.entries[key]
+            self.save_entries()
+        return True
+
+    def entries_for_source(self, source: str) -> List[Dict]:
+        """Quarantined tracks seen in a playlist, soonest retry first."""
+        with self._lock:
+            items = [dict(e) for e in self.entries.values() if source in e.get('sources', [])]
+        return sorted(items, key=lambda e: e.get('next_retry', 0))
+
+    def clear(self):
+        """Forgets every quarantined track."""
+        with self._lock:
+            self.entries = {}
+            self.save_entries()
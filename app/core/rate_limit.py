@@ -0,0 +1,79 @@
+import json
+import os
+import time
+import hashlib
+import threading
+from typing import Dict
+from app.core.constants import RATE_LIMIT_FILE
+
+# spotDL falls back to its own bundled API keys when we don't pass ours
+SPOTDL_DEFAULT_KEY = "spotdl_default"
+
+class RateLimitManager:
+    """
+    Persists extreme Spotify rate-limit deadlines per credential set so a ban survives restarts.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.deadlines = self.load_deadlines()
+
+    @staticmethod
+    def credential_key(client_id: str = None) -> str:
+        """Returns a stable, non-reversible key for a client ID (or spotDL's defaults)."""
+        if not client_id:
+            return SPOTDL_DEFAULT_KEY
+        return hashlib.sha1(client_id.strip().encode("utf-8")).hexdigest()[:16]
+
+    def load_deadlines(self) -> Dict[str, float]:
+        """Loads stored deadlines (epoch seconds), dropping the ones already expired."""
+        if os.path.exists(RATE_LIMIT_FILE):
+            try:
+                with open(RATE_LIMIT_FILE, 'r') as f:
+                    data = json.load(f)
+                now = time.time()
+                return {k: float(v) for k, v in data.items() if float(v) > now}
+            except Exception:
+                return {}
+        return {}
+
+    def save_deadlines(self):
+        """Saves deadlines to JSON."""
+        try:
+            with open(RATE_LIMIT_FILE, 'w') as f:
+                json.dump(self.deadlines, f, indent=4)
+        except Exception as e:
+            print(f"RateLimitManager: Error saving deadlines: {e}")
+
+    def set_deadline(self, key: str, seconds: int):
+        """Records a ban of `seconds` for a credential key. Never shortens an existing ban."""
+        deadline = time.time() + int(seconds)
+        with self._lock:
+            if deadline > self.deadlines.get(key, 0):
+                self.deadlines[key] = deadline
+                self.save_deadlines()
+
+    def get_remaining(self, key: str) -> int:
+        """Seconds left until the ban for `key` expires (0 if not banned)."""
+        with self._lock:
+            deadline = self.deadlines.get(key)
+            if not deadline:
+                return 0
+            remaining = int(deadline - time.time())
+            if remaining <= 0:
+                del self.deadlines[key]
+                self.save_deadlines()
+                return 0
+            return remaining
+
+    def get_max_remaining(self, keys) -> int:
+        """Longest remaining ban among the given credential keys."""
+        return max([self.get_remaining(k) for k in keys] or [0])
+
+    def clear(self, key: str = None):
+        """Forgets the ban for one key, or all of them."""
+        with self._lock:
+            if key is None:
+                self.deadlines = {}
+            else:
+                self.deadlines.pop(key, None)
+            self.save_deadlines()
@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from app.services.spotdl_events import Downloaded, LookupFailed, RateLimited, RetryAfter
+
+class ConcurrencyController:
+    """
+    AIMD controller for spotDL's `--threads` and the number of playlists synced at once.
+
+    Every evaluation window it looks at throughput (tracks/min) and the provider error rate:
+    - rate limit or error rate above ERROR_THRESHOLD -> halve both (multiplicative decrease)
+    - throughput holding up                          -> +1 thread, +1 playlist every other step
+    - throughput dropped after an increase           -> step threads back by one
+    Bounds come from the config; with "adaptive_concurrency" off the configured values are used as-is.
+    """
+    WINDOW_SECONDS = 60
+    MIN_SAMPLES = 5          # Finished tracks (ok + failed) needed before a window is judged
+    ERROR_THRESHOLD = 0.25
+    DECREASE_COOLDOWN = 30   # One burst of 429s only halves once
+
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+        self._lock = threading.Lock()
+        self.threads = self._clamp_threads(self.config.get("spotdl_threads") or 4)
+        self.playlists = max(1, (self.max_playlists() + 1) // 2)
+        self._reset_window()
+        self._last_tpm = None
+        self._last_decrease = 0
+        self._increase_steps = 0
+
+    # --- Bounds ---
+    def adaptive(self):
+        return bool(self.config.get("adaptive_concurrency"))
+
+    def max_threads(self):
+        try:
+            return max(1, int(self.config.get("max_spotdl_threads") or min(16, os.cpu_count() or 4)))
+        except (TypeError, ValueError):
+            return 4
+
+    def max_playlists(self):
+        try:
+            return max(1, int(self.config.get("max_parallel_syncs") or 1))
+        except (TypeError, ValueError):
+            return 1
+
+    def _clamp_threads(self, value):
+        try:
+            return max(1, min(self.max_threads(), int(value)))
+        except (TypeError, ValueError):
+            return 1
+
+    # --- Current limits ---
+    def current_threads(self):
+        """Value passed to spotDL's --threads for the next run."""
+        if not self.adaptive():
+            return self._clamp_threads(self.config.get("spotdl_threads") or 4)
+        with self._lock:
+            return self.threads
+
+    def current_playlists(self):
+        """Number of playlists the sync pool may run at once."""
+        if not self.adaptive():
+            return self.max_playlists()
+        with self._lock:
+            return min(self.playlists, self.max_playlists())
+
+    # --- Feedback ---
+    def _reset_window(self):
+        self._window_start = time.time()
+        self._ok = 0
+        self._errors = 0
+        self._rate_limited = False
+
+    def observe(self, event):
+        """Feeds one spotDL output event (from any job/thread)."""
+        if not self.adaptive():
+            return
+        with self._lock:
+            if isinstance(event, Downloaded):
+                self._ok += 1
+            elif isinstance(event, LookupFailed):
+                self._errors += 1
+            elif isinstance(event, (RateLimited, RetryAfter)):
+                self._rate_limited = True
+                self._decrease_locked("rate limited")
+                return
+            if time.time() - self._window_start >= self.WINDOW_SECONDS and self._ok + self._errors >= self.MIN_SAMPLES:
+                self._evaluate_locked()
+
+    def _decrease_locked(self, reason):
+        now = time.time()
+        if now - self._last_decrease < self.DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        old = (self.threads, self.playlists)
+        self.threads = max(1, self.threads // 2)
+        self.playlists = max(1, self.playlists // 2)
+        self._increase_steps = 0
+        self._last_tpm = None
+        self._log_decision(old, reason)
+        self._reset_window()
+
+    def _evaluate_locked(self):
+        elapsed = max(1e-6, time.time() - self._window_start)
+        total = self._ok + self._errors
+        tpm = self._ok * 60 / elapsed
+        error_rate = self._errors / total if total else 0
+        stats = f"{tpm:.1f} tracks/min, {error_rate:.0%} errors"
+
+        if self._rate_limited or error_rate > self.ERROR_THRESHOLD:
+            self._decrease_locked(f"backing off: {stats}")
+            return
+
+        old = (self.threads, self.playlists)
+        if self._last_tpm is not None and tpm < self._last_tpm * 0.9 and self._increase_steps:
+            # The last increase didn't pay off; give one thread back and hold
+            self.threads = max(1, self.threads - 1)
+            self._increase_steps = 0
+            reason = f"throughput dropped: {stats}"
+        else:
+            self.threads = min(self.max_threads(), self.threads + 1)
+            self._increase_steps += 1
+            if self._increase_steps % 2 == 0:
+                self.playlists = min(self.max_playlists(), self.playlists + 1)
+            reason = f"probing up: {stats}"
+        self._last_tpm = tpm
+        if (self.threads, self.playlists) != old:
+            self._log_decision(old, reason)
+        self._reset_window()
+
+    def _log_decision(self, old, reason):
+        self.logger.info(f"[Concurrency] threads {old[0]} -> {self.threads}, playlists {old[1]} -> {self.playlists} ({reason})")
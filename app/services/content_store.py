@@ -0,0 +1,180 @@
+import os
+import threading
+from typing import List, Dict
+from app.utils import sanitize_filename
+from app.services.sync_planner import AUDIO_EXTENSIONS, SyncPlanner
+
+STORE_DIRNAME = ".library_store"
+
+class ContentStore:
+    """
+    Keeps one copy of every track, named after its Spotify track ID, under `output_path/.library_store`.
+    Playlist folders reference the stored file through hardlinks (symlinks when hardlinks aren't possible),
+    so a track shared by many playlists is downloaded and stored only once.
+    """
+    def __init__(self, root: str, logger=None):
+        self.root = root
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._index = None  # {track_id: filename}, built lazily from the store directory
+
+    @classmethod
+    def for_output(cls, output_path: str, logger=None):
+        return cls(os.path.join(output_path, STORE_DIRNAME), logger)
+
+    def _log(self, message):
+        if self.logger:
+            self.logger.info(message)
+
+    def _load(self):
+        if self._index is None:
+            index = {}
+            try:
+                with os.scandir(self.root) as it:
+                    for entry in it:
+                        if entry.is_file() and entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                            index[os.path.splitext(entry.name)[0]] = entry.name
+            except OSError:
+                pass
+            self._index = index
+        return self._index
+
+    def path_for(self, track_id):
+        """Stored file for a track ID, or None."""
+        if not track_id:
+            return None
+        with self._lock:
+            filename = self._load().get(track_id)
+        if not filename:
+            return None
+        path = os.path.join(self.root, filename)
+        if not os.path.exists(path):
+            with self._lock:
+                self._index.pop(track_id, None)
+            return None
+        return path
+
+    @staticmethod
+    def _link(src, dest):
+        """Hardlinks src to dest, falling back to a symlink (e.g. across filesystems)."""
+        try:
+            os.link(src, dest)
+            return True
+        except OSError:
+            pass
+        try:
+            os.symlink(src, dest)
+            return True
+        except OSError:
+            return False
+
+    def link_into(self, track: Dict, folder: str):
+        """Links a stored track into a playlist folder under spotDL's "{artists} - {title}" name."""
+        src = self.path_for(track.get('id'))
+        if not src or not track.get('name'):
+            return False
+        dest = os.path.join(folder, sanitize_filename(track['name']) + os.path.splitext(src)[1])
+        if os.path.exists(dest):
+            return True
+        return self._link(src, dest)
+
+    def link_missing(self, tracks: List[Dict], folder: str) -> List[Dict]:
+        """Links every already-stored track of `tracks` into `folder`. Returns the tracks that were linked."""
+        linked = []
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except OSError:
+            return linked
+        for track in tracks:
+            if self.link_into(track, folder):
+                linked.append(track)
+        return linked
+
+    def ingest(self, track_id, path):
+        """
+        Adds a downloaded file to the store. If the track is already stored, a separate copy
+        in the same format is replaced by a hardlink to the stored one.
+        Only hardlinks are used here, so an existing file is never moved or copied.
+        """
+        if not track_id or not os.path.isfile(path) or os.path.islink(path):
+            return False
+        ext = os.path.splitext(path)[1]
+        existing = self.path_for(track_id)
+        if existing:
+            try:
+                if os.path.splitext(existing)[1].lower() == ext.lower() and not os.path.samefile(existing, path):
+                    tmp = path + ".dedupe"
+                    os.link(existing, tmp)
+                    os.replace(tmp, path)
+            except OSError:
+                pass
+            return True
+
+        target = os.path.join(self.root, track_id + ext)
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            os.link(path, target)
+        except FileExistsError:
+            pass
+        except OSError:
+            return False  # Different filesystem or no hardlink support: leave the file where it is
+        with self._lock:
+            self._load()[track_id] = os.path.basename(target)
+        return True
+
+    def ingest_folder(self, tracks: List[Dict], folder: str, tags=None) -> int:
+        """
+        Ingests the local files of a playlist folder that match `tracks` (by their tags first when
+        `tags`, a TagIndex, is given). Returns how many were stored.
+        """
+        files = SyncPlanner.local_files(folder)
+        tagged = tags.folder_index(folder) if tags else None
+        count = 0
+        for track in tracks:
+            if not track.get('id'):
+                continue
+            filename = SyncPlanner.find_file(track, files, tagged)
+            if filename and self.ingest(track['id'], os.path.join(folder, filename)):
+                count += 1
+        return count
+
+    def stored_inodes(self) -> Dict[tuple, str]:
+        """{(st_dev, st_ino): track ID} of the stored files, to recognize playlist files linked to them."""
+        with self._lock:
+            items = list(self._load().items())
+        inodes = {}
+        for track_id, filename in items:
+            try:
+                st = os.stat(os.path.join(self.root, filename))
+            except OSError:
+                continue
+            inodes[(st.st_dev, st.st_ino)] = track_id
+        return inodes
+
+    def prune(self, track_ids) -> int:
+        """Removes the stored copies of `track_ids` no playlist folder links to anymore. Returns the bytes freed."""
+        freed = 0
+        for track_id in track_ids:
+            path = self.path_for(track_id)
+            try:
+                st = os.stat(path) if path else None
+            except OSError:
+                continue
+            if st and st.st_nlink == 1 and self.discard(track_id, path):
+                freed += st.st_size
+        return freed
+
+    def discard(self, track_id, path=None):
+        """Removes a stored track (e.g. a broken file), only if it is `path` itself when one is given."""
+        stored = self.path_for(track_id)
+        if not stored:
+            return False
+        try:
+            if path and not os.path.samefile(stored, path):
+                return False
+            os.remove(stored)
+        except OSError:
+            return False
+        with self._lock:
+            self._load().pop(track_id, None)
+        return True
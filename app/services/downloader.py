@@ -1,44 +1,566 @@
+import atexit
 import subprocess
+import sys
+import threading
 import time
-import re
 import os
 from app.core.config import ConfigManager
+from app.core.constants import SPOTDL_WORKER_LOG_FILE, MANIFEST_DIR, INTEGRITY_CACHE_FILE, FUZZY_MATCH_CACHE_FILE, TAG_CACHE_FILE
 from app.core.history import HistoryManager
+from app.core.rate_limit import RateLimitManager
+from app.core.quarantine import QuarantineManager
 from app.services.logger import LogService
+from app.services.sync_planner import SyncPlan, SyncPlanner
+from app.services.spotdl_worker import SpotDLWorker
+from app.services.content_store import ContentStore
+from app.services.spotdl_events import SpotDLOutputTracker, SpotDLEventParser, Downloaded, LookupFailed, RateLimited, RetryAfter
+from app.services.spotdl_manifest import ManifestCache, track_id_from_url
+from app.services.integrity import IntegrityVerifier
+from app.services.fuzzy_matcher import FuzzyMatcher
+from app.services.tag_index import TagIndex
+from app.services.retry_scheduler import RetryLater
+from app.services.concurrency import ConcurrencyController
+from app.services.jobs import DownloadJob, JobCancelled, process_group_kwargs
+from app.utils import filename_signature
+
+CANCELLED_MSG = "Cancelled by user."
 
 class DownloaderService:
-    def __init__(self, config: ConfigManager, history: HistoryManager, logger: LogService):
+    def __init__(self, config: ConfigManager, history: HistoryManager, logger: LogService, rate_limits: RateLimitManager = None,
+                 quarantine: QuarantineManager = None):
         self.config = config
         self.history = history
         self.logger = logger
-        self.active_process = None
+        self.rate_limits = rate_limits or RateLimitManager()
+        self.quarantine = quarantine or QuarantineManager()
+        # Adapts spotDL --threads and playlist parallelism to throughput/errors
+        self.concurrency = ConcurrencyController(config, logger)
+        # One process handle per running job (parallel syncs), guarded by a lock
+        self.active_processes = {}
+        self._process_lock = threading.Lock()
+        # Job handles of running downloads (cancel/pause/resume/preemption), with nesting counts
+        self._jobs = {}
+        self._foreground = 0
+        # Shared cool-down: a rate limit seen by one job pauses every job
+        self._pause_lock = threading.Lock()
+        self._pause_until = 0
+        # Idle persistent spotDL workers, checked out one per running job
+        self._idle_workers = []
+        self._worker_lock = threading.Lock()
+        self._worker_disabled = False
+        atexit.register(self.shutdown_workers)
+        self._store = None
+        # Resolved spotDL songs (metadata + YouTube match) per playlist
+        self.manifests = ManifestCache(MANIFEST_DIR)
+        # Probe results of downloaded files, cached by (path, size, mtime)
+        self.verifier = IntegrityVerifier(INTEGRITY_CACHE_FILE, logger)
+        self.matcher = FuzzyMatcher(FUZZY_MATCH_CACHE_FILE)
+        self.tags = TagIndex(TAG_CACHE_FILE, logger)
+
+    def content_store(self):
+        """Shared track store under the current output path, or None when deduplication is off."""
+        if not self.config.get("dedupe_tracks"):
+            return None
+        output_path = self.config.get("output_path")
+        if self._store is None or self._store.root != ContentStore.for_output(output_path).root:
+            self._store = ContentStore.for_output(output_path, self.logger)
+        return self._store
+
+    def _ingest_into_store(self, store, plan: SyncPlan, folder):
+        """Moves a playlist's tracks into the shared store (by hardlink) after a sync."""
+        if not store:
+            return
+        try:
+            count = store.ingest_folder(plan.tracks, folder, self.tag_index())
+            if count:
+                self.logger.info(f"Content store: {count} track(s) of this playlist are shared on disk.")
+        except Exception as e:
+            self.logger.warning(f"Content store ingest failed: {e}")
+
+    def _use_worker(self):
+        """Persistent workers only apply to the bundled spotDL (a custom binary can't be imported)."""
+        return (self.config.get("persistent_worker")
+                and not self.config.get("spotdl_path")
+                and not self._worker_disabled)
+
+    def _checkout_worker(self):
+        """Returns an idle live worker, starting a new one if needed. None if workers are unavailable."""
+        with self._worker_lock:
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.is_alive():
+                    return worker
+        worker = SpotDLWorker(self.logger, stderr_path=SPOTDL_WORKER_LOG_FILE)
+        if worker.start():
+            return worker
+        self.logger.warning(f"spotDL worker unavailable ({worker.last_error}). Falling back to one process per attempt.")
+        self._worker_disabled = True
+        return None
+
+    def _checkin_worker(self, worker):
+        """Returns a worker to the idle pool; dead workers are dropped and replaced on next checkout."""
+        if worker is None:
+            return
+        if worker.is_alive():
+            with self._worker_lock:
+                self._idle_workers.append(worker)
+        else:
+            self.logger.warning("spotDL worker exited unexpectedly. A new one will be started for the next job.")
+
+    def shutdown_workers(self):
+        """Stops all idle workers."""
+        with self._worker_lock:
+            workers, self._idle_workers = self._idle_workers, []
+        for worker in workers:
+            worker.stop()
+
+    def _start_process(self, cmd, spotdl_args, cwd):
+        """
+        Starts one spotDL run. Uses a persistent worker when possible, else a fresh process.
+        Returns (process, worker); both expose stdout lines, wait(), terminate() and returncode.
+        """
+        if self._use_worker():
+            worker = self._checkout_worker()
+            if worker:
+                try:
+                    return worker.run(spotdl_args, cwd), worker
+                except Exception as e:
+                    self.logger.warning(f"{e}. Using a fresh process for this attempt.")
+                    worker.kill()
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            cwd=cwd,
+            bufsize=1,
+            encoding='utf-8',
+            errors='replace',
+            **process_group_kwargs()
+        )
+        return process, None
+
+    def pause_all(self, seconds):
+        """Pauses every job (current and upcoming attempts) for `seconds`."""
+        with self._pause_lock:
+            self._pause_until = max(self._pause_until, time.time() + seconds)
+
+    def pause_remaining(self):
+        """Seconds left on the shared rate-limit pause."""
+        with self._pause_lock:
+            return max(0, self._pause_until - time.time())
+
+    def wait_if_paused(self, status_callback=None, job: DownloadJob = None):
+        """Blocks while the shared rate-limit pause is active (raises JobCancelled if `job` is cancelled)."""
+        remaining = self.pause_remaining()
+        if remaining > 0 and status_callback:
+            status_callback(f"Rate limited. Waiting {int(remaining)}s...")
+        while remaining > 0:
+            if job:
+                job.sleep(min(1, remaining))
+            else:
+                time.sleep(min(1, remaining))
+            remaining = self.pause_remaining()
+
+    # --- Job handles ---
+    def _register_job(self, job):
+        with self._process_lock:
+            self._jobs[job] = self._jobs.get(job, 0) + 1
+
+    def _unregister_job(self, job):
+        with self._process_lock:
+            count = self._jobs.get(job, 0) - 1
+            if count > 0:
+                self._jobs[job] = count
+            else:
+                self._jobs.pop(job, None)
+
+    def running_jobs(self, background_only=False):
+        with self._process_lock:
+            return [j for j in self._jobs if j.background or not background_only]
+
+    def cancel_all(self, background_only=False):
+        """Cancels running downloads (kills their process trees, no further retries)."""
+        jobs = self.running_jobs(background_only)
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def foreground_count(self):
+        """Foreground (individual) syncs currently running; each takes one batch slot."""
+        with self._process_lock:
+            return self._foreground
+
+    def begin_foreground(self):
+        """
+        Called before a foreground sync. Pauses one running background (batch) job so the foreground
+        sync gets its slot right away. Returns the paused job (pass it to end_foreground).
+        """
+        with self._process_lock:
+            self._foreground += 1
+            candidates = [j for j in self._jobs if j.background and not j.paused and not j.cancelled]
+        if not candidates:
+            return None
+        job = candidates[-1]
+        job.pause()
+        self.logger.info(f"Preempted batch job '{job.label}' for a foreground sync.")
+        return job
+
+    def end_foreground(self, preempted=None):
+        with self._process_lock:
+            self._foreground = max(0, self._foreground - 1)
+        if preempted is not None:
+            preempted.resume()
+            self.logger.info(f"Resumed batch job '{preempted.label}'.")
+
+    def _cancelled_result(self, url, playlist_name, downloaded_tracks, failed_tracks, record_history):
+        self.logger.info(f"Download cancelled: {playlist_name or url}")
+        if record_history:
+            self.history.add_entry(url, downloaded_tracks, name=playlist_name)
+        return False, downloaded_tracks, failed_tracks, True, CANCELLED_MSG
+
+    def credential_key(self, extra_args=None):
+        """
+        Rate-limit key for the credentials spotDL runs with: the `--client-id` in `extra_args`
+        (Quick Download passes the user's app), else spotDL's bundled defaults.
+        """
+        args = list(extra_args or [])
+        client_id = args[args.index("--client-id") + 1] if "--client-id" in args[:-1] else None
+        return self.rate_limits.credential_key(client_id)
+
+    def rate_limit_remaining(self, extra_args=None):
+        """Seconds left on a persisted spotDL ban for those credentials (0 if none)."""
+        return self.rate_limits.get_remaining(self.credential_key(extra_args))
+
+    def tag_index(self):
+        """The TagIndex when tag identification is enabled and mutagen is installed, else None."""
+        if self.config.get("read_tags") and self.tags.available:
+            return self.tags
+        return None
+
+    def _update_quarantine(self, url, attempted, folder, failures):
+        """
+        After a completed sync: tracks still missing that spotDL reported as LookupError/AudioProviderError
+        (`failures`: (name, url) of LookupFailed events) go to (or stay in) quarantine; tracks on disk are
+        released. Tracks missing for other reasons (crashes, rate limits) are left for the next sync.
+        Returns the quarantined tracks.
+        """
+        failed_sigs = {filename_signature(name) for name, _ in failures if name}
+        failed_ids = {track_id_from_url(u) for _, u in failures if u}
+        try:
+            result = SyncPlanner(self.matcher, self.tag_index()).plan(attempted, folder)
+            for track in result.present:
+                self.quarantine.release(track)
+            quarantined = []
+            for track in result.missing:
+                track_id = track.get('id') or track_id_from_url(track.get('url'))
+                if track_id not in failed_ids and SyncPlanner.signature(track) not in failed_sigs:
+                    continue
+                entry = self.quarantine.record_failure(track, source=url, error="Not found / download failed")
+                self.logger.info(f"Quarantined '{track.get('name')}' (failure {entry['failures']}).")
+                quarantined.append(track)
+            return quarantined
+        except Exception as e:
+            self.logger.warning(f"Quarantine update failed: {e}")
+            return []
+
+    def _verify_tracks(self, tracks, folder, store=None):
+        """
+        Checks the local files of `tracks` and deletes broken ones (and their content store copy),
+        so `--overwrite skip` can't keep a truncated file forever. Returns the tracks that were broken.
+        """
+        if not tracks or not self.config.get("verify_downloads"):
+            return []
+        files = SyncPlanner.local_files(folder)
+        tagged = self.tag_index().folder_index(folder) if self.tag_index() else None
+        by_path = {}
+        for track in tracks:
+            filename = SyncPlanner.find_file(track, files, tagged)
+            if filename:
+                by_path[os.path.join(folder, filename)] = track
+        try:
+            broken = self.verifier.verify([(path, t.get('duration_ms')) for path, t in by_path.items()])
+        except Exception as e:
+            self.logger.warning(f"Integrity check failed: {e}")
+            return []
+        removed = []
+        for path, reason in broken:
+            track = by_path[path]
+            self.logger.warning(f"Broken file '{os.path.basename(path)}' ({reason}). It will be downloaded again.")
+            if store and track.get('id'):
+                store.discard(track['id'], path)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.verifier.forget(path)
+            self.tags.forget(path)
+            removed.append(track)
+        return removed
+
+    def _spotdl_prefix(self):
+        """Command that launches spotDL (custom binary, bundled module or frozen app)."""
+        spotdl_path = self.config.get("spotdl_path")
+        if spotdl_path:
+            return [spotdl_path]
+        if getattr(sys, 'frozen', False):
+            return [sys.executable, "--internal-spotdl-run"]
+        return [sys.executable, "-m", "spotdl"]
+
+    def _cookie_args(self):
+        cookie_file = self.config.get("cookie_file")
+        if cookie_file and os.path.exists(cookie_file):
+            return ["--cookie-file", cookie_file]
+        return []
+
+    def _use_manifests(self):
+        return bool(self.config.get("use_manifests"))
+
+    def _run_save(self, queries, save_file, cwd, job):
+        """
+        Runs `spotdl save --preload` for track URLs. Returns True if the save file was written.
+        Stops early on a rate limit; the download step then handles it with its usual retries
+        (or, for a long ban, finds the deadline recorded here and aborts).
+        """
+        args = ["save", *queries, "--save-file", save_file, "--preload", *self._cookie_args()]
+        parser = SpotDLEventParser()
+        process, worker = self._start_process(self._spotdl_prefix() + args, args, cwd)
+        with self._process_lock:
+            self.active_processes[id(process)] = process
+        job.attach(process)
+        limited = False
+        try:
+            for line in process.stdout:
+                line = line.strip()
+                if not line:
+                    continue
+                self.logger.log(line)
+                for event in parser.parse(line):
+                    self.concurrency.observe(event)
+                    if isinstance(event, (RateLimited, RetryAfter)) and not limited:
+                        limited = True
+                        if isinstance(event, RetryAfter) and event.seconds > 600:
+                            # Persist the ban like _download does, so the download step doesn't hit it again
+                            self.logger.error(f"CRITICAL: Extreme subprocess rate limit ({event.seconds}s) while resolving tracks.")
+                            self.rate_limits.set_deadline(self.credential_key(), event.seconds)
+                        process.terminate()
+            process.wait()
+        finally:
+            job.detach()
+            with self._process_lock:
+                self.active_processes.pop(id(process), None)
+            self._checkin_worker(worker)
+        return not limited and not job.cancelled and process.returncode == 0 and os.path.exists(save_file)
+
+    def _prepare_manifest(self, url, plan: SyncPlan, folder, job, status_callback=None):
+        """Prunes the playlist manifest and resolves missing tracks that are not in it yet."""
+        try:
+            self.manifests.prune(url, [t['url'] for t in plan.tracks if t.get('url')])
+            _, unresolved = self.manifests.split(url, plan.missing_urls)
+        except Exception as e:
+            self.logger.warning(f"spotDL manifest unavailable: {e}")
+            return
+        if not unresolved:
+            if plan.missing:
+                self.logger.info(f"All {len(plan.missing)} missing track(s) are resolved in the manifest. No search needed.")
+            return
+        self.logger.info(f"Resolving {len(unresolved)} new track(s) into the spotDL manifest...")
+        if status_callback:
+            status_callback(f"Resolving {len(unresolved)} track(s)...")
+        save_file = self.manifests.path_for(url)[:-len(".spotdl")] + ".save.spotdl"
+        try:
+            for i in range(0, len(unresolved), SyncPlanner.BATCH_SIZE):
+                job.checkpoint()
+                if self.pause_remaining() > 0 or self.rate_limit_remaining() > 0:
+                    break
+                if not self._run_save(unresolved[i:i + SyncPlanner.BATCH_SIZE], save_file, folder, job):
+                    break
+                self.manifests.merge(url, save_file)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            self.logger.warning(f"spotDL save failed ({e}). Downloading the remaining tracks by URL.")
+        finally:
+            try:
+                os.remove(save_file)
+            except OSError:
+                pass
+
+    def _batch_queries(self, url, batch, index):
+        """spotDL queries for one batch: a .spotdl file for resolved tracks plus plain URLs for the rest."""
+        if not self._use_manifests():
+            return batch, None
+        try:
+            resolved, unresolved = self.manifests.split(url, batch)
+            if not resolved:
+                return batch, None
+            path = self.manifests.write_batch(url, resolved, index)
+            return [path, *unresolved], path
+        except Exception as e:
+            self.logger.warning(f"spotDL manifest unavailable: {e}")
+            return batch, None
+
+    def download_planned(self, url, plan: SyncPlan, playlist_name=None, status_callback=None, **kwargs):
+        """
+        Downloads only the tracks a SyncPlan marked as missing, in batches of track URLs.
+        Tracks already held in the content store are linked in first, without network I/O.
+        Quarantined tracks (repeated lookup/provider failures) are left out until they are due.
+        Skips spotDL entirely when nothing is missing. Same return shape as download().
+        With defer_retries, a failed batch raises RetryLater; pass its state back as resume_state
+        (with a fresh plan) to continue.
+        """
+        resume = kwargs.pop('resume_state', None) or {}
+        job = kwargs.setdefault('job', DownloadJob(playlist_name or url, background=kwargs.get('defer_retries', False)))
+        self._register_job(job)
+        try:
+            return self._download_planned(url, plan, playlist_name, status_callback, resume, **kwargs)
+        finally:
+            self._unregister_job(job)
+
+    def _download_planned(self, url, plan: SyncPlan, playlist_name, status_callback, resume, **kwargs):
+        folder = kwargs.get('cwd') or self.config.get("output_path")
+        store = self.content_store()
+        broken = self._verify_tracks(plan.present, folder, store)
+        if broken:
+            plan = SyncPlan(plan.tracks, [t for t in plan.present if t not in broken], plan.missing + broken)
+        linked = []
+        if store and plan.missing:
+            try:
+                linked = store.link_missing(plan.missing, folder)
+            except Exception as e:
+                self.logger.warning(f"Content store link failed: {e}")
+            if linked:
+                self.logger.info(f"Linked {len(linked)} track(s) from the content store into '{playlist_name or url}'.")
+                plan = SyncPlan(plan.tracks, plan.present + linked, [t for t in plan.missing if t not in linked])
+        linked_names = list(resume.get('tracks', [])) + [t['name'] for t in linked]
+
+        for track in plan.present:
+            self.quarantine.release(track)
+        due, held = self.quarantine.split(plan.missing)
+        if held:
+            self.logger.info(f"Holding back {len(held)} quarantined track(s) of '{playlist_name or url}' until their retry time.")
+            plan = SyncPlan(plan.tracks, plan.present, due)
+        if kwargs.get('on_track'):
+            for t in linked:
+                kwargs['on_track'](t['name'])
+
+        if plan.is_up_to_date:
+            self.logger.info(f"'{playlist_name or url}' is up to date ({len(plan.present)} tracks on disk). spotDL not launched.")
+            if linked_names:
+                self.history.add_entry(url, linked_names, name=playlist_name)
+            self._ingest_into_store(store, plan, folder)
+            return True, linked_names, [], False, None
+
+        if self._use_manifests():
+            try:
+                self._prepare_manifest(url, plan, folder, kwargs['job'], status_callback)
+            except JobCancelled:
+                return self._cancelled_result(url, playlist_name, linked_names, list(resume.get('failed', [])), True)
+
+        batches = plan.batches(SyncPlanner.BATCH_SIZE)
+        self.logger.info(f"Sync plan for '{playlist_name or url}': {len(plan.missing)} missing, {len(plan.present)} on disk ({len(batches)} batch(es)).")
+        
+        all_tracks, all_failed = list(linked_names), list(resume.get('failed', []))
+        # (name, url) of every lookup/provider failure; only these tracks are quarantined
+        failures = list(resume.get('failures', []))
+        kwargs['on_failure'] = lambda e: failures.append((e.name, e.url))
+        all_ok, last_error = True, None
+        batch_resume = resume.get('batch_state')
+        for i, batch in enumerate(batches, 1):
+            if status_callback and len(batches) > 1:
+                status_callback(f"Batch {i}/{len(batches)}")
+            queries, batch_file = self._batch_queries(url, batch, i)
+            try:
+                ok, tracks, failed, crashed, error_msg = self.download(url, playlist_name, status_callback, queries=queries,
+                                                                       record_history=False, resume_state=batch_resume, **kwargs)
+            except RetryLater as e:
+                # Finished batches are on disk, so the resumed job re-plans and only keeps the retry budget
+                raise RetryLater(e.delay, e.reason, {"tracks": all_tracks, "failed": all_failed, "failures": failures,
+                                                     "batch_state": e.state})
+            finally:
+                if batch_file:
+                    try:
+                        os.remove(batch_file)
+                    except OSError:
+                        pass
+            batch_resume = None
+            all_tracks.extend(tracks)
+            all_failed.extend(f for f in failed if f not in all_failed)
+            all_ok = all_ok and ok
+            last_error = error_msg or last_error
+            if crashed:
+                # One history entry per playlist sync, however many batches ran
+                self.history.add_entry(url, all_tracks, name=playlist_name)
+                # A killed spotDL may have left a half-written file behind
+                self._verify_tracks(plan.missing, folder, store)
+                self._ingest_into_store(store, plan, folder)
+                return False, all_tracks, all_failed, True, error_msg
+
+        broken = self._verify_tracks(plan.missing, folder, store)
+        if broken:
+            self.logger.info(f"Re-queueing {len(broken)} broken download(s) of '{playlist_name or url}'.")
+            try:
+                ok, _, _, crashed, error_msg = self.download(url, playlist_name, status_callback, queries=[t['url'] for t in broken],
+                                                             record_history=False, **kwargs)
+                all_ok = all_ok and ok and not crashed
+                last_error = error_msg or last_error
+            except RetryLater:
+                # The broken files are gone, so the next sync downloads them again
+                all_ok = False
+            self._verify_tracks(broken, folder, store)
+
+        self.history.add_entry(url, all_tracks, name=playlist_name)
+        quarantined = self._update_quarantine(url, plan.missing, folder, failures)
+        if quarantined and self._use_manifests():
+            # A stale YouTube match may be the cause; search these again next time
+            self.manifests.forget(url, [t['url'] for t in quarantined if t.get('url')])
+        self._ingest_into_store(store, plan, folder)
+        return all_ok, all_tracks, all_failed, False, last_error
 
     def download(self, url, playlist_name=None, status_callback=None, **kwargs):
+        """
+        Runs spotDL for `url` (or explicit `queries`) with retries. Returns
+        (success, downloaded_tracks, failed_tracks, crashed, error_msg). Pass `job` (DownloadJob)
+        to cancel/pause it from another thread.
+        """
+        job = kwargs.get('job') or DownloadJob(playlist_name or url, background=kwargs.get('defer_retries', False))
+        kwargs['job'] = job
+        self._register_job(job)
+        try:
+            return self._download(url, playlist_name, status_callback, **kwargs)
+        except JobCancelled:
+            return False, [], [], True, CANCELLED_MSG
+        finally:
+            self._unregister_job(job)
+
+    def _download(self, url, playlist_name=None, status_callback=None, **kwargs):
         cwd = kwargs.get('cwd')
+        # Explicit spotDL queries (e.g. only the missing track URLs); defaults to the playlist URL
+        queries = kwargs.get('queries') or [url]
+        record_history = kwargs.get('record_history', True)
+        # Pool jobs park between attempts (RetryLater) instead of sleeping in the worker thread
+        defer_retries = kwargs.get('defer_retries', False)
+        resume = kwargs.get('resume_state') or {}
+        on_track = kwargs.get('on_track')  # Called with each downloaded track name (progress journal)
+        on_failure = kwargs.get('on_failure')  # Called with each LookupFailed event (quarantine)
+        job = kwargs['job']
         
-        print(f"DEBUG: DownloaderService.download called with url={url}, cwd={cwd}")
+        self.logger.debug(f"DownloaderService.download called with url={url}, cwd={cwd}, queries={len(queries)}")
         """
         Synchronously runs spotdl download for a given URL.
         Returns (success: bool, downloaded_tracks: list)
         blocks until finished.
         """
-        spotdl_path = self.config.get("spotdl_path")
         output_path = self.config.get("output_path")
-        cookie_file = self.config.get("cookie_file")
         
-        if not spotdl_path:
-            import sys
-            if getattr(sys, 'frozen', False):
-                cmd = [sys.executable, "--internal-spotdl-run", url, "--output", "{artists} - {title}.{output-ext}", "--overwrite", "skip"]
-            else:
-                cmd = [sys.executable, "-m", "spotdl", url, "--output", "{artists} - {title}.{output-ext}", "--overwrite", "skip"]
-        else:
-            # Construct Command
-            cmd = [spotdl_path, url, "--output", "{artists} - {title}.{output-ext}", "--overwrite", "skip"]
+        spotdl_args = [*queries, "--output", "{artists} - {title}.{output-ext}", "--overwrite", "skip"]
         
         # Add cookie file if provided
-        if cookie_file and os.path.exists(cookie_file):
-             cmd.extend(["--cookie-file", cookie_file])
+        spotdl_args.extend(self._cookie_args())
+        # Caller-specific spotDL options (e.g. Quick Download's --format)
+        spotdl_args.extend(kwargs.get('extra_args') or [])
+
+        cmd_prefix = self._spotdl_prefix()
 
         # Prepare working directory
         if not cwd:
@@ -49,112 +571,105 @@ class DownloaderService:
                 os.makedirs(cwd)
             except: pass
 
+        # Refuse to touch Spotify while a persisted ban is still running (would only extend it)
+        extra_args = kwargs.get('extra_args')
+        remaining = self.rate_limit_remaining(extra_args)
+        if remaining > 0:
+            self.logger.error(f"Extreme Rate Limit active ({remaining}s remaining). Skipping {url}.")
+            if status_callback: status_callback("Aborted: Extreme Rate Limit")
+            return False, [], [], True, f"Extreme Rate Limit active: {remaining}s remaining. Sync refused."
+
         self.logger.info(f"Starting download for: {url}")
         
         max_retries = 6
-        downloaded_tracks = []
-        failed_tracks = []
-        process_output = []
+        # Parsed output state; downloaded/failed tracks accumulate across attempts. Callers may pass
+        # their own `tracker` to read skipped tracks afterwards
+        tracker = resume.get('tracker') or kwargs.get('tracker') or SpotDLOutputTracker()
+        downloaded_tracks = tracker.downloaded
+        failed_tracks = tracker.failed
 
-        for attempt in range(1, max_retries + 1):
+        for attempt in range(resume.get('attempt', 1), max_retries + 1):
+            worker = None
+            retry_delay = None
             try:
+                # Wait out a cool-down triggered by any parallel job before spawning
+                self.wait_if_paused(status_callback, job)
+                job.checkpoint()
+                if attempt > 1 and self.rate_limit_remaining(extra_args) > 0:
+                    # A parallel job hit an extreme limit meanwhile; retrying would only extend the ban
+                    self.logger.error(f"Extreme Rate Limit recorded by another job. Stopping {url}.")
+                    return False, downloaded_tracks, failed_tracks, True, "Extreme Rate Limit active. Sync aborted."
                 self.logger.info(f"Attempt {attempt}/{max_retries}...")
                 
-                # Use subprocess.Popen to read output in real-time
-                 # IMPORTANT: encoding='utf-8', errors='replace' for stability
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    cwd=cwd,
-                    bufsize=1,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-                self.active_process = process
+                # Thread count is re-read every attempt; the concurrency controller may have changed it
+                attempt_args = [*spotdl_args, "--threads", str(self.concurrency.current_threads())]
+                
+                # Read output in real-time, from a persistent worker or a fresh process
+                process, worker = self._start_process(cmd_prefix + attempt_args, attempt_args, cwd)
+                with self._process_lock:
+                    self.active_processes[id(process)] = process
+                job.attach(process)
 
                 if status_callback:
                     status_callback(f"Starting attempt {attempt}...")
 
-                rate_limit_detected = False
-                has_provider_errors = False
+                tracker.start_attempt()
                 
                 # Real-time output reading
                 for line in process.stdout:
                     line = line.strip()
-                    if line:
-                        self.logger.log(line)
-                        process_output.append(line)
-                        
-                        # Provider Error Detection (Phase 104)
-                        if "AudioProviderError" in line or "LookupError" in line or "YT-DLP download error" in line:
-                            has_provider_errors = True
+                    if not line:
+                        continue
+                    self.logger.log(line)
+                    for event in tracker.feed(line):
+                        self.concurrency.observe(event)
+                        if isinstance(event, Downloaded):
+                            if status_callback:
+                                status_callback(f"Downloaded: {event.name}")
+                            if on_track:
+                                on_track(event.name)
+                        elif isinstance(event, LookupFailed) and on_failure:
+                            on_failure(event)
+                        elif isinstance(event, RetryAfter) and event.seconds > 600:
+                            # Extreme Limit Detection
+                            seconds = event.seconds
+                            self.logger.error(f"CRITICAL: Extreme subprocess rate limit ({seconds}s). Aborting.")
+                            self.rate_limits.set_deadline(self.credential_key(extra_args), seconds)
+                            process.terminate()
                             
-                            # Phase 108: Extract failed track name if possible
-                            # Log format often: "AudioProviderError: ... - https://..." or "LookupError: ...: Artist - Title"
-                            try:
-                                if "LookupError" in line and "song:" in line:
-                                    failed_name = line.split("song:")[1].strip()
-                                    if failed_name not in failed_tracks: failed_tracks.append(failed_name)
-                                elif "AudioProviderError" in line and "http" not in line:
-                                     # Sometimes it's hard to get name from provider error without context, 
-                                     # but we catch what we can.
-                                     pass
-                            except: pass
-                        
-                        # Rate Limit Detection
-                        trig = line.lower()
-                         # Refined: Only trigger for 429/Rate Limit related to Spotify
-                        if ("429" in line or "rate/request limit" in trig or "max retries reached" in trig or "responseerror" in trig) and "spotify" in trig:
-                            rate_limit_detected = True
-                        
-                        # Extreme Limit Detection
-                        if "retry will occur after:" in trig:
-                            try:
-                                match = re.search(r"after:\s*(\d+)", trig)
-                                if match:
-                                    seconds = int(match.group(1))
-                                    if seconds > 600:
-                                        self.logger.error(f"CRITICAL: Extreme subprocess rate limit ({seconds}s). Aborting.")
-                                        process.terminate()
-                                        
-                                        # Force History Entry (Phase 76)
-                                        self.history.add_entry(url, downloaded_tracks, name=playlist_name)
-                                        # (Interrupted status will be set by the UI caller)
-                                        
-                                        raise Exception("EXTREME_RATE_LIMIT_ABORT")
-                            except Exception as e:
-                                if str(e) == "EXTREME_RATE_LIMIT_ABORT": raise e
-                                pass
-
-                        # Track Detection
-                        if 'Downloaded "' in line:
-                             try:
-                                track_name = line.split('Downloaded "')[1].split('"')[0]
-                                if track_name not in downloaded_tracks:
-                                    downloaded_tracks.append(track_name)
-                                    if status_callback:
-                                        status_callback(f"Downloaded: {track_name}")
-                             except: pass
+                            # Force History Entry (Phase 76)
+                            if record_history:
+                                self.history.add_entry(url, downloaded_tracks, name=playlist_name)
+                            # (Interrupted status will be set by the UI caller)
+                            
+                            raise Exception("EXTREME_RATE_LIMIT_ABORT")
 
+                rate_limit_detected = tracker.rate_limited
+                has_provider_errors = tracker.has_provider_errors
                 process.wait()
-                self.active_process = None
+                job.detach()
+                with self._process_lock:
+                    self.active_processes.pop(id(process), None)
+                self._checkin_worker(worker)
+                worker = None
+                if job.cancelled:
+                    return self._cancelled_result(url, playlist_name, downloaded_tracks, failed_tracks, record_history)
                 
                 if downloaded_tracks:
                      # Success (or partial success)
                      name = playlist_name
                      # Try to resolve name from config if missing (skipped here for simplicity, caller should provide)
                      
-                     self.history.add_entry(url, downloaded_tracks, name=name)
+                     if record_history:
+                         self.history.add_entry(url, downloaded_tracks, name=name)
                      
                      return (process.returncode == 0 and not has_provider_errors), downloaded_tracks, failed_tracks, False, None
 
                 if process.returncode == 0:
                     if has_provider_errors:
                         self.logger.warning("Download finished with provider errors (No new tracks).")
-                        self.history.add_entry(url, [], name=playlist_name)
-                        self.history.save_history()
+                        if record_history:
+                            self.history.add_entry(url, [], name=playlist_name)
                         return False, [], failed_tracks, False, "Provider errors occurred (LookupError/AudioProviderError)"
                         
                     self.logger.info("Download finished (No new tracks).")
@@ -165,13 +680,23 @@ class DownloaderService:
                 if attempt < max_retries:
                     if rate_limit_detected:
                         wait_time = min(300, 60 * attempt)
-                        self.logger.info(f"Rate limited. Cooling down {wait_time}s...")
+                        self.logger.info(f"Rate limited. Cooling down {wait_time}s (all jobs paused)...")
                         if status_callback: status_callback(f"Rate limited. Waiting {wait_time}s...")
+                        self.pause_all(wait_time)
+                        retry_delay = wait_time
                     else:
-                        wait_time = 3
-                    time.sleep(wait_time)
+                        retry_delay = 3
                 
             except Exception as e:
+                job.detach()
+                if 'process' in locals():
+                    with self._process_lock:
+                        self.active_processes.pop(id(process), None)
+                if worker:
+                    # Worker state is unknown after an error mid-job; don't reuse it
+                    worker.kill()
+                if job.cancelled:
+                    return self._cancelled_result(url, playlist_name, downloaded_tracks, failed_tracks, record_history)
                 is_extreme = str(e) == "EXTREME_RATE_LIMIT_ABORT"
                 if is_extreme:
                     if status_callback: status_callback("Aborted: Extreme Rate Limit")
@@ -180,20 +705,38 @@ class DownloaderService:
                 
                 self.logger.error(f"Error syncing {url}: {e}")
                 if attempt < max_retries:
-                    time.sleep(5)
+                    retry_delay = 5
                 else:
                     return False, downloaded_tracks, failed_tracks, True, str(e)
 
+            if retry_delay is not None:
+                if defer_retries:
+                    raise RetryLater(retry_delay, f"attempt {attempt} failed", {"attempt": attempt + 1, "tracker": tracker})
+                try:
+                    if self.pause_remaining() > 0:
+                        self.wait_if_paused(job=job)
+                    else:
+                        job.sleep(retry_delay)
+                except JobCancelled:
+                    return self._cancelled_result(url, playlist_name, downloaded_tracks, failed_tracks, record_history)
+
         # All retries failed
         self.logger.error("All retry attempts failed.")
         
         # Force History Entry (Phase 78)
-        self.history.add_entry(url, [], name=playlist_name)
+        if record_history:
+            self.history.add_entry(url, [], name=playlist_name)
         # (Interrupted status will be set by the UI caller)
 
         return False, [], failed_tracks, True, "All retry attempts failed."
 
     def terminate(self):
-        """Kills the active process if any."""
-        if self.active_process:
-            self.active_process.terminate()
+        """Cancels every running job and kills every active process, if any."""
+        self.cancel_all()
+        with self._process_lock:
+            processes = list(self.active_processes.values())
+        for process in processes:
+            try:
+                process.terminate()
+            except Exception:
+                pass
@@ -0,0 +1,182 @@
+import hashlib
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+from app.core.file_cache import JsonCache
+
+class DuplicateGroup:
+    """
+    Paths with identical content. `copies` is the number of distinct files among them
+    (hardlinks of one file count once); `stamps` maps each path to its scanned (size, mtime_ns).
+    """
+    def __init__(self, size: int, paths: List[str], copies: int, stamps: Dict[str, Tuple[int, int]]):
+        self.size = size
+        self.paths = paths
+        self.copies = copies
+        self.stamps = stamps
+
+    @property
+    def reclaimable(self) -> int:
+        """Bytes freed by keeping a single copy."""
+        return self.size * (self.copies - 1)
+
+class DuplicateFinder:
+    """
+    Finds byte-identical audio files: files are grouped by size, then by a hash of their first
+    and last EDGE bytes, and only files that still collide are hashed in full. Files of a unique
+    size are never opened. Hashes are cached by (path, size, mtime), so repeat scans only read
+    new or changed files.
+    """
+    EDGE = 64 * 1024
+    HASH_WORKERS = 8         # Hashing is I/O bound; threads overlap reads on slow/network disks
+    CHUNK = 1024 * 1024
+
+    def __init__(self, cache_file, logger=None):
+        self.cache_file = cache_file
+        self.logger = logger
+        self._cache = JsonCache(cache_file, "DuplicateFinder")
+        self._lock, self.cache = self._cache.lock, self._cache.data
+
+    def save_cache(self):
+        self._cache.save()
+
+    # --- Hashing ---
+    def _partial_hash(self, path, size) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            h.update(f.read(self.EDGE))
+            if size > 2 * self.EDGE:
+                f.seek(size - self.EDGE)
+                h.update(f.read(self.EDGE))
+            elif size > self.EDGE:
+                h.update(f.read())
+        return h.hexdigest()
+
+    def _full_hash(self, path) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _cached_hash(self, path, size, mtime, full):
+        """Partial (or full) hash of a file, from the cache when the file is unchanged. None if unreadable."""
+        slot = 3 if full else 2
+        with self._lock:
+            entry = self.cache.get(path)
+        if not entry or entry[:2] != [size, mtime]:
+            entry = [size, mtime, None, None]
+        if entry[slot] is None:
+            try:
+                entry[slot] = self._full_hash(path) if full else self._partial_hash(path, size)
+            except OSError:
+                return None
+            with self._lock:
+                self.cache[path] = entry
+        return entry[slot]
+
+    def _hash_groups(self, groups, pool, full) -> List[List[Tuple]]:
+        """Splits each group of (path, size, mtime) by hash; groups left with one file are dropped."""
+        items = [f for group in groups for f in group]
+        hashes = pool.map(lambda f: self._cached_hash(f[0], f[1], f[2], full), items)
+        split = defaultdict(list)
+        for f, digest in zip(items, hashes):
+            if digest is not None:
+                split[(f[1], digest)].append(f)
+        return [g for g in split.values() if len(g) > 1]
+
+    # --- Scanning ---
+    def find(self, files: Iterable[Tuple[str, int, int]]) -> List[DuplicateGroup]:
+        """
+        Groups of identical files among the library's (path, size, mtime_ns) entries, largest
+        reclaimable space first.
+        """
+        files_list = list(files)
+        by_size = defaultdict(list)
+        for path, size, mtime in files_list:
+            if size > 0:
+                by_size[size].append((path, size, mtime))
+
+        # Hardlinks of one file (e.g. playlists sharing the track store) are hashed once and aren't duplicates
+        candidates, links = [], defaultdict(list)
+        for group in by_size.values():
+            if len(group) < 2:
+                continue
+            inodes = {}
+            for f in group:
+                try:
+                    st = os.stat(f[0])
+                except OSError:
+                    continue
+                first = inodes.setdefault((st.st_dev, st.st_ino), f)
+                links[first[0]].append(f)
+            if len(inodes) > 1:
+                candidates.append(list(inodes.values()))
+
+        with ThreadPoolExecutor(max_workers=self.HASH_WORKERS) as pool:
+            groups = self._hash_groups(candidates, pool, full=False)
+            # The partial hash already covers files of up to 2 * EDGE bytes
+            small = [g for g in groups if g[0][1] <= 2 * self.EDGE]
+            large = [g for g in groups if g[0][1] > 2 * self.EDGE]
+            confirmed = small + self._hash_groups(large, pool, full=True)
+        # `files` is the whole library: entries of files that are gone are dropped
+        seen = {f[0] for f in files_list}
+        with self._lock:
+            for path in [p for p in self.cache if p not in seen]:
+                del self.cache[path]
+        self.save_cache()
+
+        result = []
+        for g in confirmed:
+            members = [m for f in g for m in links[f[0]]]
+            result.append(DuplicateGroup(g[0][1], sorted(m[0] for m in members), len(g), {m[0]: (m[1], m[2]) for m in members}))
+        result.sort(key=lambda g: g.reclaimable, reverse=True)
+        return result
+
+    # --- Actions ---
+    @staticmethod
+    def _unchanged(group, path):
+        """stat of `path` if it still has the size/mtime it was scanned with, else None."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st if group.stamps.get(path) == (st.st_size, st.st_mtime_ns) else None
+
+    def resolve(self, group: DuplicateGroup, mode: str, keep=None) -> int:
+        """
+        Keeps one file of a group (`keep`, default the first path) and either replaces the others with
+        hardlinks to it (mode "link") or deletes them (mode "delete"). Files changed since the scan are
+        left alone. Returns the bytes reclaimed: a file only frees space once all its links are gone.
+        """
+        keep = keep or group.paths[0]
+        kept = self._unchanged(group, keep)
+        if not kept:
+            return 0
+        kept_inode = (kept.st_dev, kept.st_ino)
+        removed = defaultdict(int)   # inode -> links replaced/deleted
+        nlinks = {}
+        for path in group.paths:
+            st = self._unchanged(group, path)
+            if not st or (st.st_dev, st.st_ino) == kept_inode:
+                continue  # Changed since the scan, or a hardlink of the kept file (takes no extra space)
+            inode = (st.st_dev, st.st_ino)
+            nlinks.setdefault(inode, st.st_nlink)
+            tmp = path + ".duplink"
+            try:
+                if mode == "link":
+                    os.link(keep, tmp)
+                    os.replace(tmp, path)
+                else:
+                    os.remove(path)
+            except OSError as e:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                if self.logger:
+                    self.logger.warning(f"Duplicate '{os.path.basename(path)}' not {'linked' if mode == 'link' else 'deleted'}: {e}")
+                continue
+            with self._lock:
+                self.cache.pop(path, None)
+            removed[inode] += 1
+        return sum(group.size for inode, count in removed.items() if count >= nlinks[inode])
@@ -0,0 +1,257 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+              IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct("iIII")
+
+class _Inotify:
+    """Minimal ctypes binding of Linux inotify."""
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm = libc.inotify_rm_watch
+        self._rm.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask):
+        wd = self._add(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd):
+        self._rm(self.fd, wd)
+
+    def read_events(self):
+        """Yields (wd, mask, name) for the events currently queued."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            yield wd, mask, name
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+class LibraryWatcher:
+    """
+    Keeps the file catalog of the music folder current while the app runs.
+
+    Uses inotify on Linux (one watch per directory, new directories are watched as they appear)
+    and falls back to polling the catalog (incremental: one stat per unchanged directory)
+    elsewhere or when inotify is unavailable/out of watches. Changes are debounced: once
+    events stop for DEBOUNCE seconds (at most MAX_DELAY after the first one), the affected
+    directories are re-listed and `on_change(set_of_directories)` is called from the watcher thread.
+    """
+    DEBOUNCE = 1.5
+    MAX_DELAY = 10
+    POLL_INTERVAL = 30
+
+    def __init__(self, catalog, root, on_change=None, logger=None):
+        self.catalog = catalog
+        self.root = os.path.normpath(os.path.abspath(root))
+        self.on_change = on_change
+        self.logger = logger
+        self.mode = None  # "inotify" or "polling" once started
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = None
+        self._watches = {}  # wd -> directory
+        self._dirty = set()
+        self._first_dirty = 0
+        self._last_event = 0
+
+    def _log(self, message):
+        if self.logger:
+            self.logger.info(message)
+
+    def start(self):
+        if self._thread:
+            return
+        if sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+                self._watch_tree(self.root)
+                self.mode = "inotify"
+            except OSError as e:
+                self._close_inotify()
+                self._log(f"Library watcher: inotify unavailable ({e}). Polling every {self.POLL_INTERVAL}s instead.")
+        self.mode = self.mode or "polling"
+        target = self._run_inotify if self.mode == "inotify" else self._run_polling
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._close_inotify()
+
+    def _close_inotify(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        self._watches = {}
+
+    # --- inotify ---
+    def _watch_tree(self, top, mark=False):
+        """
+        Adds a watch for `top` and every directory below it (skipping the catalog's skip_dirs).
+        With `mark`, each directory is also queued for re-listing (it may already hold files).
+        """
+        stack = [top]
+        while stack:
+            path = stack.pop()
+            try:
+                wd = self._inotify.add_watch(path, WATCH_MASK)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise  # Out of inotify watches: caller falls back to polling
+                continue
+            self._watches[wd] = path
+            if mark:
+                self._mark(path)
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False) and entry.name not in self.catalog.skip_dirs:
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+    def _unwatch_tree(self, top):
+        """Drops the watches of a directory that moved away (its watches would report stale paths)."""
+        prefix = top + os.sep
+        for wd, path in list(self._watches.items()):
+            if path == top or path.startswith(prefix):
+                self._inotify.rm_watch(wd)
+                self._watches.pop(wd, None)
+
+    def _run_inotify(self):
+        try:
+            while not self._stop.is_set():
+                timeout = self.DEBOUNCE if self._dirty else 1.0
+                ready, _, _ = select.select([self._inotify.fd], [], [], timeout)
+                if ready:
+                    self._handle_events()
+                self._maybe_flush()
+        except (OSError, ValueError) as e:
+            if self._stop.is_set():
+                return
+            self._close_inotify()
+            self._log(f"Library watcher: inotify failed ({e}). Polling every {self.POLL_INTERVAL}s instead.")
+            self.mode = "polling"
+            self._run_polling()
+
+    def _handle_events(self):
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost; re-check the whole tree through the catalog
+                self._mark(self.root)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # The parent gets its own IN_DELETE/IN_MOVED_FROM; only the root needs handling here
+                if directory == self.root:
+                    self._mark(self.root)
+                continue
+            if name in self.catalog.skip_dirs:
+                continue
+            self._mark(directory)
+            if mask & IN_ISDIR and mask & (IN_DELETE | IN_MOVED_FROM):
+                self._unwatch_tree(os.path.join(directory, name))
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self._watch_tree(os.path.join(directory, name), mark=True)
+                except OSError as e:
+                    self._log(f"Library watcher: cannot watch new folder ({e}).")
+
+    # --- Polling ---
+    def _run_polling(self):
+        while not self._stop.wait(self.POLL_INTERVAL):
+            changed = []
+            try:
+                self.catalog.refresh(self.root, changed=changed)
+            except Exception as e:
+                self._log(f"Library watcher: catalog refresh failed ({e}).")
+                continue
+            if changed and self.on_change:
+                self._notify(set(changed))
+
+    # --- Debounce ---
+    def _mark(self, directory):
+        now = time.time()
+        if not self._dirty:
+            self._first_dirty = now
+        self._dirty.add(directory)
+        self._last_event = now
+
+    def _maybe_flush(self):
+        if not self._dirty:
+            return
+        now = time.time()
+        if now - self._last_event < self.DEBOUNCE and now - self._first_dirty < self.MAX_DELAY:
+            return
+        dirty, self._dirty = self._dirty, set()
+        changed = set()
+        for directory in dirty:
+            try:
+                if directory == self.root:
+                    found = []
+                    self.catalog.refresh(self.root, changed=found)
+                    changed.update(found)
+                else:
+                    self.catalog.refresh_dir(directory)
+                    changed.add(directory)
+            except Exception as e:
+                self._log(f"Library watcher: catalog update failed for {directory} ({e}).")
+        if changed and self.on_change:
+            self._notify(changed)
+
+    def _notify(self, changed):
+        try:
+            self.on_change(changed)
+        except Exception as e:
+            self._log(f"Library watcher: change handler failed ({e}).")
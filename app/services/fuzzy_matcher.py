@@ -0,0 +1,127 @@
+import difflib
+import heapq
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.core.file_cache import JsonCache
+
+# Words that differ between otherwise identical releases ("Song - Remastered 2011", "Song - Radio Edit")
+_VERSION_NOISE = re.compile(r"\b(?:\d{4}|remaster(?:ed)?|version|edit|radio|mono|stereo|digital|single|album|original|mix|explicit)\b")
+
+def loose_form(signature: str) -> str:
+    """Signature without release/version noise, used for fuzzy scoring."""
+    return " ".join(_VERSION_NOISE.sub(" ", signature or "").split())
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TrigramIndex:
+    """
+    Character-trigram inverted index over a list of strings. Candidates for a query are the
+    items sharing the most trigrams with it; only those are scored with difflib.
+    Trigrams present in a large share of the items carry no signal and are skipped.
+    """
+    MAX_CANDIDATES = 8
+    QUERY_GRAMS = 12           # Rarest trigrams of a query used to find candidates
+    MIN_OVERLAP = 0.3          # Share of those trigrams a candidate must have
+    STOP_GRAM_SHARE = 0.02     # Trigrams in more than this share of the items are ignored
+
+    def __init__(self, items: Iterable[str]):
+        self.items = list(items)
+        self.exact = defaultdict(list)
+        postings = defaultdict(list)
+        for i, item in enumerate(self.items):
+            self.exact[item].append(i)
+            for gram in trigrams(item):
+                postings[gram].append(i)
+        limit = max(50, int(len(self.items) * self.STOP_GRAM_SHARE))
+        self.postings = {g: ids for g, ids in postings.items() if len(ids) <= limit}
+        self.stop_grams = set(postings) - set(self.postings)
+        self.frequency = {g: len(ids) for g, ids in self.postings.items()}
+
+    def candidates(self, query: str) -> List[int]:
+        # The rarest trigrams tell the items apart; counting the common ones too costs more than it adds
+        grams = sorted((g for g in trigrams(query) if g in self.postings), key=self.frequency.__getitem__)[:self.QUERY_GRAMS]
+        # One Counter over all posting lists: counting runs in C instead of one update() per trigram
+        counts = Counter(chain.from_iterable(self.postings[g] for g in grams))
+        need = max(1, int(len(grams) * self.MIN_OVERLAP))
+        hits = [(c, i) for i, c in counts.items() if c >= need]
+        return [i for _, i in heapq.nlargest(self.MAX_CANDIDATES, hits)]
+
+    def best(self, query: str, threshold: float, exclude=None) -> Tuple[Optional[int], float]:
+        """Index and score of the most similar item scoring at least `threshold`, or (None, 0)."""
+        # Same string (e.g. the signatures differed only in version noise): no scoring needed
+        for i in self.exact.get(query, ()):
+            if not exclude or i not in exclude:
+                return i, 1.0
+        best_i, best_score = None, threshold
+        # The query is seq2: SequenceMatcher indexes seq2 once and reuses it for every candidate
+        sm = difflib.SequenceMatcher(None, autojunk=False)
+        sm.set_seq2(query)
+        for i in self.candidates(query):
+            if exclude and i in exclude:
+                continue
+            sm.set_seq1(self.items[i])
+            if sm.real_quick_ratio() < best_score or sm.quick_ratio() < best_score:
+                continue
+            score = sm.ratio()
+            if score >= best_score:
+                best_i, best_score = i, score
+        return (best_i, best_score) if best_i is not None else (None, 0.0)
+
+class FuzzyMatcher:
+    """
+    Pairs track signatures that didn't match exactly (remasters, sanitization differences,
+    renamed files) with local file signatures through a TrigramIndex. Pairing is one-to-one.
+    Confirmed matches are cached (expected -> local) and reused while the local file exists.
+    """
+    THRESHOLD = 0.85
+    MAX_CACHE = 50000
+
+    def __init__(self, cache_file=None):
+        self._cache = JsonCache(cache_file, "FuzzyMatcher")
+        self._lock, self.cache = self._cache.lock, self._cache.data
+
+    def save_cache(self):
+        with self._lock:
+            if len(self.cache) > self.MAX_CACHE:
+                for key in list(self.cache)[:len(self.cache) - self.MAX_CACHE]:
+                    del self.cache[key]
+        # Status checks call match() often; coalesce their writes instead of saving every time
+        self._cache.save_later()
+
+    def match(self, missing: List[str], spare: List[str], remember=True) -> Dict[str, str]:
+        """
+        Pairs `missing` signatures (no exact local file) with `spare` local signatures
+        (not claimed by an exact match). Returns {missing signature: local signature}.
+        """
+        if not missing or not spare:
+            return {}
+        result, used = {}, set()
+        spare_set = set(spare)
+        todo = []
+        with self._lock:
+            for sig in missing:
+                cached = self.cache.get(sig)
+                if cached in spare_set and cached not in used:
+                    result[sig] = cached
+                    used.add(cached)
+                else:
+                    todo.append(sig)
+        if todo:
+            pool = [s for s in dict.fromkeys(spare) if s not in used]
+            index = TrigramIndex(loose_form(s) for s in pool)
+            taken = set()
+            learned = {}
+            for sig in todo:
+                i, _ = index.best(loose_form(sig), self.THRESHOLD, exclude=taken)
+                if i is not None:
+                    taken.add(i)
+                    result[sig] = learned[sig] = pool[i]
+            if learned and remember:
+                with self._lock:
+                    self.cache.update(learned)
+                self.save_cache()
+        return result
@@ -73,7 +73,7 @@ class I18nService:
                 "created_by_me": "Created by Me",
                 "followed_playlists": "Followed Playlists",
                 "quick_download": "Quick Download",
-                "url_placeholder": "Enter Spotify Track or Playlist link",
+                "url_placeholder": "Enter Spotify Track or Playlist links (separate several with spaces)",
                 "format": "Format",
                 "ready": "Ready",
                 "sync_library": "Library",
@@ -153,7 +153,7 @@ class I18nService:
                 "history_clear_confirm_qn": "Are you sure you want to clear your download history?",
                 "open_download_folder_qn": "Download successful. Would you like to open the folder?",
                 "history_cleared_msg": "History has been wiped.",
-                "tip_download": "Add this link to the download queue",
+                "tip_download": "Add these links to the download queue (downloaded in parallel)",
                 "tip_refresh_lib": "Check Spotify for new tracks in your library",
                 "tip_import_folder": "Import an existing local music folder",
                 "tip_add_profile": "Pick playlists directly from a Spotify profile",
@@ -194,7 +194,55 @@ class I18nService:
                 "use_saved_creds_qn": "Found saved Spotify API credentials in your settings.\n\nWould you like to use these existing credentials to login?",
                 "use_saved_creds_options": "\nYes = Use Saved\nNo = Enter Manually\nCancel = Abort Login",
                 "login_browser_opened": "A browser window has opened for Spotify login. Please authorize the application.\nOnce authorized, the setup will complete automatically.",
-                "auth_success": "Successfully authenticated!"
+                "auth_success": "Successfully authenticated!",
+                "rate_limit_active_msg": "Spotify has rate-limited this app. To avoid extending the ban, syncing is paused.\n\nPlease try again in {remaining}.",
+                "rate_limit_countdown": "⛔ Spotify rate limit: {remaining} left",
+                "running_lbl": "running",
+                "parallel_syncs": "Parallel Syncs",
+                "tip_parallel_syncs": "How many playlists are synced at the same time during Sync All",
+                "resume_batch_qn": "A batch sync was interrupted with {remaining} of {total} playlists left.\n\nResume it now?",
+                "quarantined_tracks": "Quarantined tracks ({count}) - skipped until their retry time:",
+                "quarantine_line": "{name}  (failures: {failures}, next try: {next})",
+                "stop_sync": "Stop",
+                "tip_stop_sync": "Stop the running batch: cancel queued playlists and kill running downloads",
+                "partial_sync": "Partially synced",
+                "missing_lbl": "Missing",
+                "cancel": "Cancel",
+                "find_duplicates": "Find Duplicates",
+                "tip_find_duplicates": "Find identical audio files in the music folder and reclaim their space",
+                "duplicates_title": "Duplicate Files",
+                "duplicates_scanning": "Scanning for duplicates",
+                "duplicates_summary": "{groups} duplicate group(s), {files} extra cop(ies), {size} reclaimable",
+                "duplicates_more": "... and {count} more group(s)",
+                "duplicates_hint": "✓ marks the copy that is kept. Hardlinking keeps every file where it is but stores it once (same drive only). Deleting removes the other copies; playlists that contained them download them again on their next sync.",
+                "duplicates_link": "Hardlink Copies",
+                "duplicates_delete": "Delete Copies",
+                "duplicates_none": "No duplicate files found.",
+                "duplicates_delete_confirm": "Delete {files} duplicate file(s)? This cannot be undone.",
+                "duplicates_done": "Reclaimed {size}.",
+                "disk_usage": "Disk Usage",
+                "tip_disk_usage": "Size and file count of every playlist folder, sortable (largest first)",
+                "usage_summary": "{size} in {files} files · {count} playlists",
+                "usage_col_name": "Playlist",
+                "usage_col_group": "Group",
+                "usage_col_files": "Files",
+                "usage_col_size": "Size",
+                "usage_line": "Size: {size} ({files} files)",
+                "usage_short": "{size} · {files} files",
+                "disk_space_title": "Low Disk Space",
+                "disk_space_low": "The missing tracks need about {needed}, but only {free} is free on the music drive. Sync anyway?",
+                "orphans": "Orphans",
+                "orphans_count": "Orphans ({count})",
+                "tip_orphans": "Files in playlist folders whose tracks were removed from the playlist on Spotify",
+                "orphans_title": "Orphaned Files",
+                "orphans_summary": "{files} file(s) no longer in any library playlist ({size} freed by deleting them)",
+                "orphans_hint": "Based on the track lists from the last Refresh Metadata. Archiving moves the files to .orphan_archive in the music folder; deleting removes them.",
+                "orphans_skipped": "{count} folder(s) were skipped because a playlist in them has no track list yet (run Refresh Metadata).",
+                "orphans_archive": "Archive",
+                "orphans_delete": "Delete",
+                "orphans_none": "No orphaned files found.",
+                "orphans_delete_confirm": "Delete {files} file(s)? This cannot be undone.",
+                "orphans_done": "{count} file(s) processed."
             },
             "tr": {
                 "library": "Kütüphane",
@@ -244,7 +292,7 @@ class I18nService:
                 "created_by_me": "Benim Oluşturduklarım",
                 "followed_playlists": "Takip Edilen Listeler",
                 "quick_download": "Hızlı İndir",
-                "url_placeholder": "Spotify Şarkı veya Çalma Listesi Linki Girin",
+                "url_placeholder": "Spotify Şarkı veya Çalma Listesi Linklerini Girin (birden fazlasını boşlukla ayırın)",
                 "format": "Dosya türü",
                 "ready": "Hazır",
                 "sync_library": "Kütüphane",
@@ -325,7 +373,7 @@ class I18nService:
                 "history_clear_confirm_qn": "İndirme geçmişini temizlemek istediğinizden emin misiniz?",
                 "open_download_folder_qn": "İndirme başarılı. Klasörü açmak ister misiniz?",
                 "history_cleared_msg": "Geçmiş başarıyla temizlendi.",
-                "tip_download": "Bu linki indirme sırasına ekle",
+                "tip_download": "Bu linkleri indirme sırasına ekle (paralel indirilir)",
                 "tip_refresh_lib": "Kütüphanenizdeki yeni şarkılar için Spotify'ı kontrol et",
                 "tip_import_folder": "Mevcut bir yerel müzik klasörünü içe aktar",
                 "tip_add_profile": "Çalma listelerini doğrudan bir Spotify profilinden seç",
@@ -366,7 +414,55 @@ class I18nService:
                 "use_saved_creds_qn": "Ayarlarınızda kayıtlı Spotify API kimlik bilgileri bulundu.\n\nBu bilgileri giriş yapmak için kullanmak ister misiniz?",
                 "use_saved_creds_options": "\nEvet = Kayıtlıyı Kullan\nHayır = Manuel Gir\nİptal = Vazgeç",
                 "login_browser_opened": "Spotify girişi için tarayıcı açıldı. Lütfen uygulamaya izin verin.\nOnayladıktan sonra kurulum otomatik olarak tamamlanacaktır.",
-                "auth_success": "Başarıyla kimlik doğrulandı!"
+                "auth_success": "Başarıyla kimlik doğrulandı!",
+                "rate_limit_active_msg": "Spotify bu uygulamaya hız sınırı uyguladı. Yasağı uzatmamak için eşitleme duraklatıldı.\n\nLütfen {remaining} sonra tekrar deneyin.",
+                "rate_limit_countdown": "⛔ Spotify hız sınırı: {remaining} kaldı",
+                "running_lbl": "çalışıyor",
+                "parallel_syncs": "Paralel Eşitleme",
+                "tip_parallel_syncs": "Tümünü Eşitle sırasında aynı anda kaç çalma listesinin eşitleneceği",
+                "resume_batch_qn": "Bir toplu senkronizasyon {total} çalma listesinden {remaining} tanesi kalmışken yarıda kesildi.\n\nŞimdi devam edilsin mi?",
+                "quarantined_tracks": "Karantinadaki parçalar ({count}) - yeniden deneme zamanına kadar atlanıyor:",
+                "quarantine_line": "{name}  (hata: {failures}, sonraki deneme: {next})",
+                "stop_sync": "Durdur",
+                "tip_stop_sync": "Çalışan toplu işlemi durdur: sıradaki listeleri iptal et ve süren indirmeleri sonlandır",
+                "partial_sync": "Kısmen eşitlendi",
+                "missing_lbl": "Eksik",
+                "cancel": "İptal",
+                "find_duplicates": "Kopyaları Bul",
+                "tip_find_duplicates": "Müzik klasöründeki aynı ses dosyalarını bul ve kapladıkları alanı geri kazan",
+                "duplicates_title": "Kopya Dosyalar",
+                "duplicates_scanning": "Kopyalar taranıyor",
+                "duplicates_summary": "{groups} kopya grubu, {files} fazla kopya, {size} geri kazanılabilir",
+                "duplicates_more": "... ve {count} grup daha",
+                "duplicates_hint": "✓ saklanan kopyayı gösterir. Sabit bağlantı her dosyayı yerinde bırakır ama diskte tek kez tutar (yalnızca aynı sürücüde). Silme diğer kopyaları kaldırır; onları içeren çalma listeleri bir sonraki senkronizasyonda yeniden indirir.",
+                "duplicates_link": "Kopyaları Bağla",
+                "duplicates_delete": "Kopyaları Sil",
+                "duplicates_none": "Kopya dosya bulunamadı.",
+                "duplicates_delete_confirm": "{files} kopya dosya silinsin mi? Bu işlem geri alınamaz.",
+                "duplicates_done": "{size} geri kazanıldı.",
+                "disk_usage": "Disk Kullanımı",
+                "tip_disk_usage": "Her çalma listesi klasörünün boyutu ve dosya sayısı, sıralanabilir (en büyük önce)",
+                "usage_summary": "{size}, {files} dosya · {count} çalma listesi",
+                "usage_col_name": "Çalma Listesi",
+                "usage_col_group": "Grup",
+                "usage_col_files": "Dosya",
+                "usage_col_size": "Boyut",
+                "usage_line": "Boyut: {size} ({files} dosya)",
+                "usage_short": "{size} · {files} dosya",
+                "disk_space_title": "Disk Alanı Az",
+                "disk_space_low": "Eksik şarkılar yaklaşık {needed} gerektiriyor, ancak müzik sürücüsünde yalnızca {free} boş. Yine de senkronize edilsin mi?",
+                "orphans": "Sahipsiz Dosyalar",
+                "orphans_count": "Sahipsiz ({count})",
+                "tip_orphans": "Şarkıları Spotify'da çalma listesinden çıkarılmış, çalma listesi klasörlerindeki dosyalar",
+                "orphans_title": "Sahipsiz Dosyalar",
+                "orphans_summary": "{files} dosya artık hiçbir kütüphane çalma listesinde değil (silinirse {size} boşalır)",
+                "orphans_hint": "Son Meta Verileri Yenile işlemindeki şarkı listelerine göre. Arşivleme dosyaları müzik klasöründeki .orphan_archive klasörüne taşır; silme onları kaldırır.",
+                "orphans_skipped": "{count} klasör atlandı, çünkü içlerindeki bir çalma listesinin henüz şarkı listesi yok (Meta Verileri Yenile'yi çalıştırın).",
+                "orphans_archive": "Arşivle",
+                "orphans_delete": "Sil",
+                "orphans_none": "Sahipsiz dosya bulunamadı.",
+                "orphans_delete_confirm": "{files} dosya silinsin mi? Bu işlem geri alınamaz.",
+                "orphans_done": "{count} dosya işlendi."
             }
         }
 
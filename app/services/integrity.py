@@ -0,0 +1,180 @@
+"""
+Post-download integrity checks.
+
+`probe_file` runs in worker processes, so this module must stay importable without the GUI
+(no app.core.constants / customtkinter imports).
+"""
+import os
+import shutil
+import struct
+import subprocess
+from typing import List, Tuple
+
+try:
+    import mutagen
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+from app.core.file_cache import JsonCache, map_in_processes
+
+MIN_AUDIO_BYTES = 32 * 1024
+
+def _has_audio_header(path, head: bytes) -> bool:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".mp3":
+        return head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0)
+    if ext == ".flac":
+        return head[:4] == b"fLaC"
+    if ext in (".ogg", ".opus"):
+        return head[:4] == b"OggS"
+    if ext == ".m4a":
+        return head[4:8] == b"ftyp"
+    if ext == ".wav":
+        return head[:4] == b"RIFF"
+    return True
+
+def _mp4_complete(path, size) -> bool:
+    """Walks the top-level MP4 atoms: they must cover the file exactly and include 'moov'."""
+    offset, has_moov = 0, False
+    with open(path, "rb") as f:
+        while offset < size:
+            f.seek(offset)
+            header = f.read(16)
+            if len(header) < 8:
+                return False
+            length, kind = struct.unpack(">I4s", header[:8])
+            if length == 1 and len(header) == 16:
+                length = struct.unpack(">Q", header[8:16])[0]
+            elif length == 0:
+                length = size - offset
+            if length < 8:
+                return False
+            has_moov = has_moov or kind == b"moov"
+            offset += length
+    return has_moov and offset == size
+
+def _ffprobe_duration(ffprobe, path):
+    """
+    (duration, decode_error) from ffprobe. duration is None when ffprobe reports none ("N/A");
+    decode_error is ffprobe's message when it could not decode the file.
+    Raises when ffprobe itself can't run (timeout, OSError).
+    """
+    result = subprocess.run(
+        [ffprobe, "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", path],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=60)
+    if result.returncode != 0:
+        stderr = result.stderr.strip()
+        return None, stderr.splitlines()[-1] if stderr else f"ffprobe exited with code {result.returncode}"
+    try:
+        return float(result.stdout.strip()), None
+    except ValueError:
+        return None, None
+
+def probe_file(path) -> Tuple[object, object, str]:
+    """
+    Checks one audio file: header, container completeness and duration.
+    Duration comes from ffprobe when installed, else mutagen, else it is None.
+    Returns (readable, duration_seconds, reason). `readable` is False only on a positive finding
+    (too small, wrong header, incomplete container, decode error reported by ffprobe) and None
+    when the file couldn't be checked (I/O error, tool failure, parser quirk): such files are kept.
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(16)
+    except OSError as e:
+        return None, None, str(e) or type(e).__name__
+    if size < MIN_AUDIO_BYTES:
+        return False, None, f"too small ({size} bytes)"
+    if not _has_audio_header(path, head):
+        return False, None, "unrecognized header"
+    try:
+        if path.lower().endswith(".m4a") and not _mp4_complete(path, size):
+            return False, None, "incomplete MP4 container"
+        ffprobe = shutil.which("ffprobe")
+        if ffprobe:
+            duration, error = _ffprobe_duration(ffprobe, path)
+            return (False, None, error) if error else (True, duration, "")
+        if MUTAGEN_AVAILABLE:
+            audio = mutagen.File(path)
+            if audio is None or not getattr(audio, "info", None):
+                return None, None, "format not recognized by mutagen"
+            return True, float(audio.info.length or 0), ""
+        return True, None, ""
+    except Exception as e:
+        return None, None, str(e) or type(e).__name__
+
+class IntegrityVerifier:
+    """
+    Verifies downloaded files in a process pool and compares their duration with Spotify's.
+    Probe results are cached by (path, size, mtime), so unchanged files are never probed twice.
+    """
+    POOL_THRESHOLD = 8       # Fewer files are probed inline; a pool isn't worth its startup cost
+    MAX_SHORTFALL = 0.15     # A file may be this much shorter than the Spotify track...
+    MIN_SHORTFALL = 10       # ...and at least this many seconds, before it counts as truncated
+
+    def __init__(self, cache_file, logger=None):
+        self.cache_file = cache_file
+        self.logger = logger
+        self._cache = JsonCache(cache_file, "IntegrityVerifier")
+        self._lock, self.cache = self._cache.lock, self._cache.data
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+
+    def is_truncated(self, duration, expected_ms) -> bool:
+        if not duration or not expected_ms:
+            return False
+        expected = expected_ms / 1000
+        return expected - duration > max(self.MIN_SHORTFALL, expected * self.MAX_SHORTFALL)
+
+    def verify(self, items: List[Tuple[str, object]]) -> List[Tuple[str, str]]:
+        """
+        Checks (path, expected_duration_ms) pairs. Returns the broken files as (path, reason).
+        Only files that are new or changed since their last check are probed.
+        """
+        results, to_probe, stamps = {}, [], {}
+        for path, _ in items:
+            try:
+                stamps[path] = self._stamp(path)
+            except OSError:
+                continue
+            with self._lock:
+                cached = self.cache.get(path)
+            if cached and cached[:2] == stamps[path]:
+                results[path] = cached[2:]
+            elif path not in to_probe:
+                to_probe.append(path)
+
+        if to_probe:
+            probes = map_in_processes(probe_file, to_probe, self.POOL_THRESHOLD, self.logger, "Integrity check")
+            for path, (readable, duration, reason) in zip(to_probe, probes):
+                results[path] = [readable, duration, reason]
+                if readable is None:
+                    # Not checked: keep the file and try again next time
+                    if self.logger:
+                        self.logger.debug(f"Integrity check skipped '{os.path.basename(path)}': {reason}")
+                    continue
+                with self._lock:
+                    self.cache[path] = stamps[path] + results[path]
+            self._cache.save()
+
+        broken = []
+        for path, expected_ms in items:
+            if path not in results:
+                continue
+            readable, duration, reason = results[path]
+            if readable is None:
+                continue
+            if not readable:
+                broken.append((path, reason))
+            elif self.is_truncated(duration, expected_ms):
+                broken.append((path, f"truncated ({int(duration)}s of {int(expected_ms / 1000)}s)"))
+        return broken
+
+    def forget(self, path):
+        with self._lock:
+            self.cache.pop(path, None)
@@ -0,0 +1,137 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+
+class JobCancelled(Exception):
+    """Raised at a job checkpoint after the job was cancelled."""
+
+# --- Process tree helpers ---
+
+def process_group_kwargs():
+    """Popen kwargs that put the child in its own process group, so the whole tree can be signalled."""
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+def kill_process_tree(process):
+    """Kills a process and everything it spawned (ffmpeg, yt-dlp helpers)."""
+    if process is None or process.poll() is not None:
+        return
+    try:
+        if sys.platform == "win32":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(os.getpgid(process.pid), signal.SIGKILL)
+    except Exception:
+        try:
+            process.kill()
+        except Exception:
+            pass
+
+def signal_process_tree(process, sig):
+    """Sends a signal to a process group (POSIX only). Returns True if delivered."""
+    if sys.platform == "win32" or process is None or process.poll() is not None:
+        return False
+    try:
+        os.killpg(os.getpgid(process.pid), sig)
+        return True
+    except Exception:
+        return False
+
+class DownloadJob:
+    """
+    Handle for one download: cancel, pause and resume.
+    Cancel kills the running spotDL process tree and stops further attempts/batches.
+    Pause suspends the process tree where the OS allows it (SIGSTOP) and always holds the job
+    at its next checkpoint (before an attempt, batch or retry).
+    """
+    def __init__(self, label="", background=False):
+        self.label = label
+        self.background = background  # Batch (pool) job; may be preempted by a foreground sync
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._lock = threading.Lock()
+        self._process = None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def attach(self, process):
+        """Registers the process currently running for this job."""
+        with self._lock:
+            self._process = process
+        if self.paused:
+            self._suspend(process)
+        if self.cancelled:
+            self._kill(process)
+
+    def detach(self):
+        with self._lock:
+            self._process = None
+
+    def _kill(self, process):
+        # Persistent-worker runs expose terminate() only; the worker itself is killed
+        if isinstance(process, subprocess.Popen):
+            kill_process_tree(process)
+        elif process is not None:
+            try:
+                process.terminate()
+            except Exception:
+                pass
+
+    def _suspend(self, process):
+        target = getattr(getattr(process, "worker", None), "process", process)
+        if isinstance(target, subprocess.Popen) and hasattr(signal, "SIGSTOP"):
+            signal_process_tree(target, signal.SIGSTOP)
+
+    def _continue(self, process):
+        target = getattr(getattr(process, "worker", None), "process", process)
+        if isinstance(target, subprocess.Popen) and hasattr(signal, "SIGCONT"):
+            signal_process_tree(target, signal.SIGCONT)
+
+    def cancel(self):
+        """Stops the job: kills its process tree and prevents any further attempt."""
+        self._cancelled.set()
+        self._running.set()  # Wake a paused job so it can observe the cancellation
+        with self._lock:
+            process = self._process
+        if process is not None:
+            self._continue(process)
+            self._kill(process)
+
+    def pause(self):
+        if self.cancelled:
+            return
+        self._running.clear()
+        with self._lock:
+            process = self._process
+        if process is not None:
+            self._suspend(process)
+
+    def resume(self):
+        with self._lock:
+            process = self._process
+        if process is not None:
+            self._continue(process)
+        self._running.set()
+
+    def checkpoint(self):
+        """Blocks while paused; raises JobCancelled if the job was cancelled."""
+        self._running.wait()
+        if self.cancelled:
+            raise JobCancelled(self.label)
+
+    def sleep(self, seconds):
+        """Sleeps up to `seconds`, waking early (and raising) on cancel."""
+        if self._cancelled.wait(seconds):
+            raise JobCancelled(self.label)
+        self.checkpoint()
@@ -1,34 +1,84 @@
+import atexit
 import logging
-import os
+import logging.handlers
+import queue
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+
+LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
 
 class LogService:
-    def __init__(self, log_file="spotdl_debug.log"):
-        self.gui_callback = None
-        
-        # Setup File Logging
-        logging.basicConfig(
-            filename=log_file,
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-    def set_gui_callback(self, callback):
-        """Sets a callback function (str) -> None for GUI updates."""
-        self.gui_callback = callback
-        
-    def log(self, message: str):
-        """Logs to file, GUI, and console."""
-        print(message)
-        logging.info(message)
-        if self.gui_callback:
-            self.gui_callback(message)
-            
+    """
+    Queue-based log pipeline. Records are written to the file (and console) by a background
+    listener thread; lines meant for the Logs tab are buffered here and pulled by the GUI in batches.
+    """
+    GUI_FLUSH_MS = 100      # How often the GUI drains the buffer
+    MAX_GUI_LINES = 5000    # Lines kept in the Logs tab (and in the pending buffer)
+
+    def __init__(self, log_file="spotdl_debug.log", level="INFO"):
+        self._gui_lock = threading.Lock()
+        self._gui_pending = deque(maxlen=self.MAX_GUI_LINES)
+
+        # Setup File Logging (written off the calling thread)
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+        handlers = [file_handler]
+        if sys.stdout:  # None in windowed (frozen) builds
+            handlers.append(logging.StreamHandler(sys.stdout))
+
+        self._queue = queue.Queue(-1)
+        self._listener = logging.handlers.QueueListener(self._queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.shutdown)
+
+        root = logging.getLogger()
+        root.addHandler(logging.handlers.QueueHandler(self._queue))
+        self.set_level(level)
+
+    def shutdown(self):
+        """Flushes queued records and stops the writer thread."""
+        try:
+            if self._listener._thread:
+                self._listener.stop()
+        except Exception:
+            pass
+
+    def set_level(self, level):
+        """Applies the `log_level` setting (name like "INFO") to the file and the Logs tab."""
+        self.level = LOG_LEVELS.get(str(level).upper(), logging.INFO)
+        logging.getLogger().setLevel(self.level)
+
+    def drain_gui(self):
+        """Returns (and clears) the lines waiting for the Logs tab."""
+        with self._gui_lock:
+            lines = list(self._gui_pending)
+            self._gui_pending.clear()
+        return lines
+
+    def log(self, message: str, level=logging.INFO):
+        """Logs to file, console and the Logs tab buffer."""
+        if level < self.level:
+            return
+        logging.log(level, message)
+        line = f"{datetime.now().strftime('%H:%M:%S')} - {message}\n"
+        with self._gui_lock:
+            self._gui_pending.append(line)
+
+    def debug(self, message: str):
+        self.log(message, logging.DEBUG)
+
     def info(self, message: str):
         self.log(message)
-        
+
     def error(self, message: str):
-        self.log(f"ERROR: {message}")
+        self.log(f"ERROR: {message}", logging.ERROR)
 
     def warning(self, message: str):
-        self.log(f"WARNING: {message}")
+        self.log(f"WARNING: {message}", logging.WARNING)
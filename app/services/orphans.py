@@ -0,0 +1,119 @@
+import os
+import shutil
+from collections import defaultdict
+from typing import Dict, List
+from app.services.sync_planner import SyncPlanner, AUDIO_EXTENSIONS
+from app.utils import filename_signature
+
+ARCHIVE_DIRNAME = ".orphan_archive"  # Inside output_path; skipped by the file catalog
+
+class OrphanReport:
+    """
+    Reverse index of the library: `owners` maps each local audio file to the playlists whose
+    current track list contains it; `orphans` lists (path, size) of files no playlist claims.
+    `total_bytes` is the space deleting the orphans frees: hardlinks shared with files that stay
+    count for nothing. `store_ids` maps orphans linked into the content store to their track ID.
+    """
+    def __init__(self, owners: Dict[str, List[str]], orphans: List[tuple], skipped: int = 0,
+                 total_bytes: int = 0, store_ids: Dict[str, str] = None):
+        self.owners = owners
+        self.orphans = orphans
+        self.skipped = skipped  # Folders left out because a playlist in them has no track list yet
+        self.total_bytes = total_bytes
+        self.store_ids = store_ids or {}
+
+class OrphanFinder:
+    """
+    Builds the file -> playlists index from the file catalog and the playlists' stored track data
+    (expected_files / expected_ids from Refresh Metadata), without listing the disk. Files are
+    claimed by tag, signature or fuzzy match, the same way folder status is computed.
+    """
+    def __init__(self, catalog, matcher=None, tag_index=None, store=None):
+        self.catalog = catalog
+        self.matcher = matcher
+        self.tag_index = tag_index
+        self.store = store  # ContentStore whose copies go along with their last playlist link
+
+    def build(self, playlists) -> OrphanReport:
+        """`playlists` are (name, folder, expected_files, expected_ids) tuples."""
+        by_folder = defaultdict(list)
+        for name, folder, expected_files, expected_ids in playlists:
+            by_folder[os.path.normpath(os.path.abspath(folder))].append((name, expected_files, expected_ids))
+
+        owners, orphans, skipped = {}, [], 0
+        for folder, members in by_folder.items():
+            if any(not expected for _, expected, _ in members):
+                skipped += 1  # Unknown track list: any file here might still belong to it
+                continue
+            files = self.catalog.files_in(folder, AUDIO_EXTENSIONS)
+            if not files:
+                continue
+            by_sig = defaultdict(list)
+            for name, _, _ in files:
+                by_sig[filename_signature(os.path.splitext(name)[0])].append(name)
+            tagged = self.tag_index.folder_index(folder, files) if self.tag_index else None
+            stems = [os.path.splitext(f[0])[0] for f in files]
+            for playlist_name, expected, ids in members:
+                status = SyncPlanner.match_expected(expected, stems, matcher=self.matcher,
+                                                    expected_ids=ids, tagged=tagged)
+                for sig in status.claimed:
+                    for name in by_sig.get(sig, ()):
+                        owners.setdefault(os.path.join(folder, name), []).append(playlist_name)
+            orphans.extend((os.path.join(folder, name), size) for name, size, _ in files
+                           if os.path.join(folder, name) not in owners)
+        orphans.sort()
+        total_bytes, store_ids = self._reclaimable(orphans)
+        return OrphanReport(owners, orphans, skipped, total_bytes, store_ids)
+
+    def _reclaimable(self, orphans):
+        """
+        (bytes freed by deleting `orphans` and pruning their store copies, {orphan path: store track ID}).
+        A file only frees space once all its hardlinks are gone.
+        """
+        stored = self.store.stored_inodes() if self.store else {}
+        by_inode = defaultdict(list)
+        for path, _ in orphans:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            by_inode[(st.st_dev, st.st_ino)].append((path, st))
+        total, store_ids = 0, {}
+        for inode, links in by_inode.items():
+            track_id = stored.get(inode)
+            if track_id:
+                store_ids.update((path, track_id) for path, _ in links)
+            st = links[0][1]
+            if len(links) + (1 if track_id else 0) >= st.st_nlink:
+                total += st.st_size
+        return total, store_ids
+
+    @staticmethod
+    def archive(paths, root) -> int:
+        """Moves files into root/ARCHIVE_DIRNAME, keeping their relative paths. Returns how many moved."""
+        moved = 0
+        archive_root = os.path.join(root, ARCHIVE_DIRNAME)
+        for path in paths:
+            try:
+                rel = os.path.relpath(path, root)
+                if rel.startswith(os.pardir):
+                    rel = os.path.basename(path)  # Playlist folder outside the music folder
+                target = os.path.join(archive_root, rel)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(path, target)
+                moved += 1
+            except OSError:
+                continue
+        return moved
+
+    @staticmethod
+    def delete(paths) -> int:
+        """Deletes files. Returns how many were removed."""
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+        return removed
@@ -0,0 +1,71 @@
+import heapq
+import itertools
+import threading
+import time
+
+class RetryLater(Exception):
+    """
+    Raised by a job that should be retried after `delay` seconds instead of sleeping in its thread.
+    `state` is handed back to the job when it resumes (e.g. attempt number, tracks so far).
+    """
+    def __init__(self, delay, reason="", state=None):
+        super().__init__(reason or f"retry in {delay}s")
+        self.delay = max(0, delay)
+        self.reason = reason
+        self.state = state
+        self.context = None  # Free slot for the caller's own resume data
+
+class RetryScheduler:
+    """
+    Parks jobs until a due time (min-heap on due time). Cancelled jobs are dropped lazily.
+    """
+    def __init__(self):
+        self._heap = []  # (due, seq, key)
+        self._entries = {}  # key -> (seq, payload); a heap item is live only if its seq matches
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def schedule(self, key, delay, payload=None):
+        """Parks `key` for `delay` seconds. Re-scheduling a key replaces its previous entry."""
+        with self._lock:
+            seq = next(self._seq)
+            self._entries[key] = (seq, payload)
+            heapq.heappush(self._heap, (time.time() + delay, seq, key))
+
+    def cancel_all(self):
+        """Drops every parked job and returns their keys."""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._heap.clear()
+        return keys
+
+    def _prune(self):
+        # Drop heap items of cancelled or re-scheduled keys (caller holds the lock)
+        while self._heap:
+            _, seq, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry and entry[0] == seq:
+                return
+            heapq.heappop(self._heap)
+
+    def pop_due(self):
+        """Returns (key, payload) of one job whose due time has passed, or None."""
+        with self._lock:
+            self._prune()
+            if self._heap and self._heap[0][0] <= time.time():
+                _, _, key = heapq.heappop(self._heap)
+                return key, self._entries.pop(key)[1]
+        return None
+
+    def next_due_in(self):
+        """Seconds until the next parked job is due (0 if overdue), or None when nothing is parked."""
+        with self._lock:
+            self._prune()
+            if not self._heap:
+                return None
+            return max(0, self._heap[0][0] - time.time())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
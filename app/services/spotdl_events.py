@@ -0,0 +1,132 @@
+"""
+Typed events parsed from spotDL's console output.
+
+Shared by DownloaderService.download and the Quick Download path so both react to
+the same lines the same way.
+"""
+import re
+from collections import deque
+
+class SpotDLEvent:
+    """Base class; `line` is the raw output line the event came from."""
+    def __init__(self, line):
+        self.line = line
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v!r}" for k, v in vars(self).items() if k != "line")
+        return f"{type(self).__name__}({fields})"
+
+class Downloaded(SpotDLEvent):
+    def __init__(self, line, name, url=None):
+        super().__init__(line)
+        self.name = name
+        self.url = url
+
+class Skipped(SpotDLEvent):
+    """Track already on disk ("Skipping X (file already exists)")."""
+    def __init__(self, line, name):
+        super().__init__(line)
+        self.name = name
+
+class LookupFailed(SpotDLEvent):
+    """
+    spotDL could not find or fetch a track; `name` (and `url`, its Spotify track URL) are None
+    when the line doesn't name it.
+    """
+    def __init__(self, line, name=None, url=None):
+        super().__init__(line)
+        self.name = name
+        self.url = url
+
+class RateLimited(SpotDLEvent):
+    """Spotify answered 429 / rate limit."""
+
+class RetryAfter(SpotDLEvent):
+    """Spotify asked for a cool-down of `seconds`."""
+    def __init__(self, line, seconds):
+        super().__init__(line)
+        self.seconds = seconds
+
+class SpotDLEventParser:
+    """Turns single output lines into events. Patterns are compiled once per process."""
+    DOWNLOADED = re.compile(r'Downloaded "(?P<name>[^"]+)"(?::\s*(?P<url>\S+))?')
+    SKIPPED = re.compile(r'Skipping (?P<name>.+?) \(file already exists\)')
+    PROVIDER_ERROR = re.compile(r'AudioProviderError|LookupError|YT-DLP download error')
+    LOOKUP_SONG = re.compile(r'LookupError.*?song:\s*(?P<name>.+)$')
+    TRACK_URL = re.compile(r'https?://open\.spotify\.com/track/[A-Za-z0-9]+')
+    RETRY_AFTER = re.compile(r'retry will occur after:\s*(?P<seconds>\d+)', re.IGNORECASE)
+    # Only 429 / rate limit lines that concern Spotify
+    RATE_LIMIT = re.compile(r'429|rate/request limit|max retries reached|responseerror', re.IGNORECASE)
+    SPOTIFY = re.compile(r'spotify', re.IGNORECASE)
+
+    def parse(self, line):
+        """Returns the events found in one stripped output line (usually zero or one)."""
+        events = []
+        m = self.DOWNLOADED.search(line)
+        if m:
+            events.append(Downloaded(line, m.group('name'), m.group('url')))
+            return events
+        m = self.SKIPPED.search(line)
+        if m:
+            events.append(Skipped(line, m.group('name').strip().strip('"')))
+            return events
+        if self.PROVIDER_ERROR.search(line):
+            m = self.LOOKUP_SONG.search(line)
+            u = self.TRACK_URL.search(line)
+            events.append(LookupFailed(line, m.group('name').strip() if m else None, u.group(0) if u else None))
+        if self.RATE_LIMIT.search(line) and self.SPOTIFY.search(line):
+            events.append(RateLimited(line))
+        m = self.RETRY_AFTER.search(line)
+        if m:
+            events.append(RetryAfter(line, int(m.group('seconds'))))
+        return events
+
+class SpotDLOutputTracker:
+    """
+    Per-download state built from events: downloaded/skipped/failed tracks (deduplicated with sets),
+    per-attempt flags, and a bounded tail of raw output instead of the whole log.
+    """
+    TAIL_LINES = 200
+    _parser = SpotDLEventParser()
+
+    def __init__(self):
+        self.downloaded = []
+        self.skipped = []
+        self.failed = []
+        self._seen_downloaded = set()
+        self._seen_skipped = set()
+        self._seen_failed = set()
+        self.tail = deque(maxlen=self.TAIL_LINES)
+        self.start_attempt()
+
+    def start_attempt(self):
+        """Resets the flags that only describe the current spotDL run."""
+        self.rate_limited = False
+        self.has_provider_errors = False
+
+    def feed(self, line):
+        """Parses one stripped line and returns its new events (repeats of a known track are dropped)."""
+        self.tail.append(line)
+        events = []
+        for event in self._parser.parse(line):
+            if isinstance(event, Downloaded):
+                if event.name in self._seen_downloaded:
+                    continue
+                self._seen_downloaded.add(event.name)
+                self.downloaded.append(event.name)
+            elif isinstance(event, Skipped):
+                if event.name in self._seen_skipped:
+                    continue
+                self._seen_skipped.add(event.name)
+                self.skipped.append(event.name)
+            elif isinstance(event, LookupFailed):
+                self.has_provider_errors = True
+                if event.name:
+                    if event.name in self._seen_failed:
+                        continue
+                    self._seen_failed.add(event.name)
+                    self.failed.append(event.name)
+            elif isinstance(event, RateLimited):
+                self.rate_limited = True
+            events.append(event)
+        return events
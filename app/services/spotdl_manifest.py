@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Tuple
+
+_TRACK_ID = re.compile(r"track[/:]([A-Za-z0-9]{22})")
+
+def track_id_from_url(url: str):
+    """Spotify track ID from an open.spotify.com/spotify: URL, or None."""
+    match = _TRACK_ID.search(url or "")
+    return match.group(1) if match else None
+
+class ManifestCache:
+    """
+    Per-playlist spotDL "save" manifests (`<playlist>.spotdl`, a JSON list of spotDL song dicts).
+
+    Tracks are resolved once with `spotdl save --preload`, which stores the Spotify metadata and
+    the YouTube match (`download_url`). Later downloads are driven from a manifest file, so
+    spotDL neither queries Spotify nor searches YouTube again for tracks already resolved.
+    Songs are keyed by Spotify track ID; tracks that leave the playlist are pruned.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(root, exist_ok=True)
+        except OSError:
+            pass
+
+    def path_for(self, playlist_url: str) -> str:
+        key = hashlib.sha1((playlist_url or "").encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root, f"{key}.spotdl")
+
+    @staticmethod
+    def song_key(song: Dict):
+        return song.get('song_id') or track_id_from_url(song.get('url'))
+
+    @staticmethod
+    def _read(path) -> List[Dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except Exception:
+            return []
+
+    @staticmethod
+    def _write(path, songs: List[Dict]):
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(songs, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def load(self, playlist_url: str) -> Dict[str, Dict]:
+        """Resolved songs of a playlist, keyed by track ID."""
+        with self._lock:
+            songs = self._read(self.path_for(playlist_url))
+        return {self.song_key(s): s for s in songs if self.song_key(s)}
+
+    def _store(self, playlist_url, songs: Dict[str, Dict]):
+        try:
+            self._write(self.path_for(playlist_url), list(songs.values()))
+        except Exception as e:
+            print(f"ManifestCache: Error saving manifest: {e}")
+
+    def split(self, playlist_url: str, track_urls: List[str]) -> Tuple[List[Dict], List[str]]:
+        """Splits track URLs into (songs resolved with a download_url, URLs that still need resolving)."""
+        songs = self.load(playlist_url)
+        resolved, unresolved = [], []
+        for url in track_urls:
+            song = songs.get(track_id_from_url(url))
+            if song and song.get('download_url'):
+                resolved.append(song)
+            else:
+                unresolved.append(url)
+        return resolved, unresolved
+
+    def merge(self, playlist_url: str, save_file: str) -> int:
+        """Adds the songs of a `spotdl save` output file to the playlist manifest. Returns the count."""
+        new_songs = [s for s in self._read(save_file) if self.song_key(s)]
+        if not new_songs:
+            return 0
+        with self._lock:
+            songs = {self.song_key(s): s for s in self._read(self.path_for(playlist_url)) if self.song_key(s)}
+            for song in new_songs:
+                songs[self.song_key(song)] = song
+            self._store(playlist_url, songs)
+        return len(new_songs)
+
+    def prune(self, playlist_url: str, track_urls: List[str]) -> int:
+        """Drops songs that are no longer in the playlist. Returns the number removed."""
+        keep = {track_id_from_url(u) for u in track_urls}
+        with self._lock:
+            songs = {self.song_key(s): s for s in self._read(self.path_for(playlist_url)) if self.song_key(s)}
+            stale = [k for k in songs if k not in keep]
+            if stale:
+                for key in stale:
+                    del songs[key]
+                self._store(playlist_url, songs)
+        return len(stale)
+
+    def forget(self, playlist_url: str, track_urls: List[str]) -> int:
+        """Drops the YouTube match of tracks whose download failed, so they are searched again next time."""
+        ids = {track_id_from_url(u) for u in track_urls}
+        with self._lock:
+            songs = {self.song_key(s): s for s in self._read(self.path_for(playlist_url)) if self.song_key(s)}
+            hits = [k for k in songs if k in ids]
+            for key in hits:
+                del songs[key]
+            if hits:
+                self._store(playlist_url, songs)
+        return len(hits)
+
+    def write_batch(self, playlist_url: str, songs: List[Dict], index: int) -> str:
+        """Writes the songs of one download batch to a temporary .spotdl file and returns its path."""
+        path = self.path_for(playlist_url)[:-len(".spotdl")] + f".batch{index}.spotdl"
+        self._write(path, songs)
+        return path
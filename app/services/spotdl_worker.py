@@ -0,0 +1,302 @@
+"""
+Long-lived spotDL worker.
+
+The worker side (`worker_main`) imports spotDL once and then runs jobs sent over stdin,
+one JSON object per line. Output is streamed back on the original stdout as JSON events:
+
+    -> {"op": "run", "job": 1, "args": ["https://...", "--output", "..."], "cwd": "/music/x"}
+    <- {"event": "ready"}
+    <- {"event": "line", "job": 1, "text": "Downloaded \"Artist - Title\": https://..."}
+    <- {"event": "done", "job": 1, "code": 0}
+
+The client side (`SpotDLWorker`) owns one worker process and exposes each job through
+`WorkerRun`, which mimics the parts of `subprocess.Popen` the downloader uses.
+
+NOTE: This module must not import app.core.constants (it pulls in customtkinter).
+"""
+import io
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from app.services.jobs import process_group_kwargs, kill_process_tree
+
+READY_TIMEOUT = 120  # First spotDL import can be slow on cold disks
+
+# --- Worker side ---
+
+class _LineWriter(io.TextIOBase):
+    """File-like object that forwards complete lines of a job's output as JSON events."""
+    def __init__(self, emit, job_id):
+        self._emit = emit
+        self._job_id = job_id
+        self._buffer = ""
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self._buffer += text
+        # Rich redraws progress bars with \r; treat it like a line break
+        while True:
+            cut = min([i for i in (self._buffer.find("\n"), self._buffer.find("\r")) if i >= 0], default=-1)
+            if cut < 0:
+                break
+            line, self._buffer = self._buffer[:cut], self._buffer[cut + 1:]
+            if line.strip():
+                self._emit({"event": "line", "job": self._job_id, "text": line})
+        return len(text)
+
+    def flush(self):
+        if self._buffer.strip():
+            self._emit({"event": "line", "job": self._job_id, "text": self._buffer})
+        self._buffer = ""
+
+def _reuse_spotify_client():
+    """
+    Makes SpotifyClient.init reuse the existing client while a job asks for the same credentials,
+    so jobs skip re-authentication. A job with other credentials (e.g. Quick Download with the
+    user's --client-id) gets a fresh client instead of silently running on the previous one's.
+    """
+    try:
+        from spotdl.utils.spotify import SpotifyClient
+    except Exception:
+        return
+    original_init = SpotifyClient.init
+    current = {"key": None}
+
+    def _init(*args, **kwargs):
+        key = (args, kwargs)
+        if getattr(SpotifyClient, "_instance", None) is not None:
+            if key == current["key"]:
+                return SpotifyClient._instance
+            SpotifyClient._instance = None
+        client = original_init(*args, **kwargs)
+        current["key"] = key
+        return client
+
+    SpotifyClient.init = _init
+
+def worker_main():
+    """Entry point of the worker process."""
+    import logging
+
+    # Keep the protocol channel private: everything else printed to fd 1 goes to stderr
+    proto = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    write_lock = threading.Lock()
+
+    def emit(obj):
+        with write_lock:
+            proto.write(json.dumps(obj) + "\n")
+            proto.flush()
+
+    try:
+        from spotdl.console.entry_point import entry_point
+        _reuse_spotify_client()
+    except Exception as e:
+        emit({"event": "error", "message": f"spotDL import failed: {e}"})
+        return 1
+
+    emit({"event": "ready", "pid": os.getpid()})
+    baseline_handlers = list(logging.getLogger().handlers)
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+
+    for raw in sys.stdin:
+        try:
+            request = json.loads(raw)
+        except ValueError:
+            continue
+        op = request.get("op")
+        if op == "quit":
+            break
+        if op == "ping":
+            emit({"event": "pong"})
+            continue
+        if op != "run":
+            continue
+
+        job_id = request.get("job")
+        writer = _LineWriter(emit, job_id)
+        code = 0
+        sys.stdout = sys.stderr = writer
+        sys.argv = ["spotdl", *request.get("args", [])]
+        try:
+            if request.get("cwd"):
+                os.chdir(request["cwd"])
+            result = entry_point()
+            code = result if isinstance(result, int) else 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException as e:
+            writer.write(f"Worker job error: {type(e).__name__}: {e}\n")
+            code = 1
+        finally:
+            writer.flush()
+            sys.stdout, sys.stderr = real_stdout, real_stderr
+            # spotDL installs its log handlers on every run; drop them so lines aren't duplicated
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                if handler not in baseline_handlers:
+                    root.removeHandler(handler)
+        emit({"event": "done", "job": job_id, "code": code})
+    return 0
+
+# --- Client side ---
+
+class WorkerRun:
+    """One job running inside a SpotDLWorker. Quacks like the Popen object the downloader reads."""
+    def __init__(self, worker, job_id):
+        self.worker = worker
+        self.job_id = job_id
+        self.returncode = None
+        # Bounded: a slow consumer back-pressures the reader instead of buffering the whole run
+        self._events = queue.Queue(maxsize=1000)
+        self.stdout = self._lines()
+
+    def _lines(self):
+        while True:
+            event = self._events.get()
+            kind = event.get("event")
+            if kind == "line":
+                yield event.get("text", "") + "\n"
+            elif kind in ("done", "crashed"):
+                self.returncode = event.get("code", -1)
+                return
+
+    def wait(self, timeout=None):
+        # Output is fully consumed by the caller before wait(); drain anything left
+        for _ in self.stdout:
+            pass
+        return self.returncode
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        """A job can't be interrupted in-process; kill the worker (it is restarted on demand)."""
+        self.worker.kill()
+
+    def kill(self):
+        self.worker.kill()
+
+class SpotDLWorker:
+    """
+    Client for one persistent spotDL worker process. Runs one job at a time.
+    """
+    def __init__(self, logger, stderr_path=None):
+        self.logger = logger
+        self.stderr_path = stderr_path
+        self.process = None
+        self._reader = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._current = None
+        self._next_job = 0
+        self.last_error = None
+
+    @staticmethod
+    def worker_command():
+        """Command line that starts a worker (bundled app routes through main.py)."""
+        if getattr(sys, 'frozen', False):
+            return [sys.executable, "--internal-spotdl-worker"]
+        return [sys.executable, "-m", "app.services.spotdl_worker"]
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None and self._ready.is_set()
+
+    def start(self):
+        """Spawns the worker and waits until spotDL is imported. Returns True on success."""
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ, PYTHONUNBUFFERED="1", PYTHONIOENCODING="utf-8", NO_COLOR="1", TERM="dumb")
+        env["PYTHONPATH"] = project_root + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+        stderr = open(self.stderr_path, "a", encoding="utf-8") if self.stderr_path else subprocess.DEVNULL
+        self._ready.clear()
+        self.last_error = None
+        try:
+            self.process = subprocess.Popen(
+                self.worker_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                bufsize=1,
+                cwd=project_root,
+                env=env,
+                **process_group_kwargs()
+            )
+        except Exception as e:
+            self.last_error = str(e)
+            return False
+        finally:
+            if stderr is not subprocess.DEVNULL:
+                stderr.close()
+
+        self._reader = threading.Thread(target=self._read_loop, args=(self.process,), daemon=True)
+        self._reader.start()
+        if not self._ready.wait(READY_TIMEOUT) or self.process.poll() is not None:
+            self.last_error = self.last_error or "Worker did not become ready."
+            self.kill()
+            return False
+        self.logger.info(f"spotDL worker started (pid {self.process.pid}).")
+        return True
+
+    def _read_loop(self, process):
+        for raw in process.stdout:
+            try:
+                event = json.loads(raw)
+            except ValueError:
+                continue
+            kind = event.get("event")
+            if kind == "ready":
+                self._ready.set()
+            elif kind == "error":
+                self.last_error = event.get("message")
+            elif kind in ("line", "done"):
+                current = self._current
+                if current and current.job_id == event.get("job"):
+                    current._events.put(event)
+                    if kind == "done":
+                        self._current = None
+        # EOF: the worker exited or crashed. Fail the running job so the caller can retry.
+        if process is not self.process:
+            return
+        self._ready.clear()
+        current, self._current = self._current, None
+        if current:
+            current._events.put({"event": "crashed", "code": -1})
+
+    def run(self, args, cwd=None):
+        """Starts a job and returns its WorkerRun. The worker must be alive and idle."""
+        with self._lock:
+            self._next_job += 1
+            run = WorkerRun(self, self._next_job)
+            self._current = run
+            try:
+                self.process.stdin.write(json.dumps({"op": "run", "job": run.job_id, "args": list(args), "cwd": cwd}) + "\n")
+                self.process.stdin.flush()
+            except Exception as e:
+                self._current = None
+                raise RuntimeError(f"spotDL worker unavailable: {e}")
+        return run
+
+    def stop(self):
+        """Asks the worker to exit after its current job."""
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.stdin.write(json.dumps({"op": "quit"}) + "\n")
+                self.process.stdin.flush()
+            except Exception:
+                pass
+
+    def kill(self):
+        """Kills the worker and any ffmpeg/yt-dlp children it started."""
+        kill_process_tree(self.process)
+        self._ready.clear()
+
+if __name__ == "__main__":
+    sys.exit(worker_main())
@@ -1,6 +1,8 @@
+import threading
 import time
 from app.core.constants import SPOTIPY_AVAILABLE, SPOTIFY_CACHE_FILE
 from app.core.config import ConfigManager
+from app.core.rate_limit import RateLimitManager
 from app.services.logger import LogService
 
 if SPOTIPY_AVAILABLE:
@@ -9,11 +11,15 @@ if SPOTIPY_AVAILABLE:
     from spotipy.exceptions import SpotifyException
 
 class SpotifyService:
-    def __init__(self, config: ConfigManager, logger: LogService):
+    def __init__(self, config: ConfigManager, logger: LogService, rate_limits: RateLimitManager = None):
         self.config = config
         self.logger = logger
+        self.rate_limits = rate_limits or RateLimitManager()
         self.sp = None
         self.status_callback = None
+        # Rate-limit waits in safe_call block on this so they can be interrupted
+        self._wait_cond = threading.Condition()
+        self._wait_generation = 0
 
     def set_status_callback(self, callback):
         """Sets a callback(str) -> None for status updates."""
@@ -23,6 +29,24 @@ class SpotifyService:
         if self.status_callback:
             self.status_callback(message)
 
+    def interrupt_waits(self):
+        """Wakes every safe_call currently waiting out a rate limit; those calls raise instead of retrying."""
+        with self._wait_cond:
+            self._wait_generation += 1
+            self._wait_cond.notify_all()
+
+    def _wait(self, seconds):
+        """Sleeps up to `seconds`. Returns False if interrupt_waits() was called meanwhile."""
+        deadline = time.time() + seconds
+        with self._wait_cond:
+            generation = self._wait_generation
+            while generation == self._wait_generation:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return True
+                self._wait_cond.wait(remaining)
+        return False
+
     def get_auth_manager(self):
         """Returns the auth manager if client id/secret are set."""
         client_id = self.config.get("spotify_client_id")
@@ -75,11 +99,25 @@ class SpotifyService:
             self.logger.error(f"Failed to initialize Spotify: {e}")
             return False
 
+    def credential_key(self):
+        """Rate-limit key for the API credentials configured in Settings."""
+        return self.rate_limits.credential_key(self.config.get("spotify_client_id"))
+
+    def rate_limit_remaining(self):
+        """Seconds left on a persisted ban for the configured credentials (0 if none)."""
+        return self.rate_limits.get_remaining(self.credential_key())
+
     def safe_call(self, func, *args, **kwargs):
         """Wraps Spotify API calls with rate limit handling."""
         if not self.sp:
             return None
 
+        # Honor a ban recorded earlier (possibly in a previous session) instead of extending it
+        remaining = self.rate_limit_remaining()
+        if remaining > 0:
+            self.logger.warning(f"Spotify API call refused: Extreme Rate Limit active for {remaining}s.")
+            raise Exception(f"Extreme Rate Limit: {remaining}s remaining")
+
         retries = 0
         max_retries = 3
 
@@ -99,12 +137,15 @@ class SpotifyService:
                 if is_rate_limit:
                     if wait_time > 600:
                          self.logger.error(f"EXTREME API Rate Limit: {wait_time}s. Aborting.")
+                         self.rate_limits.set_deadline(self.credential_key(), wait_time)
                          self.update_status(None)
                          raise Exception(f"Extreme Rate Limit: {wait_time}s")
                     
                     self.logger.info(f"Rate limited. Waiting {wait_time}s...")
                     self.update_status(f"Rate Limited: Waiting {wait_time}s")
-                    time.sleep(wait_time)
+                    if not self._wait(wait_time):
+                        self.update_status(None)
+                        raise Exception("Spotify call cancelled while waiting out a rate limit")
                     retries += 1
                     
                     if retries > max_retries:
@@ -113,28 +154,41 @@ class SpotifyService:
                 else:
                     raise e
         return None
-    def get_playlist_tracks_with_dates(self, playlist_id):
-        """Fetches list of (track_name, added_at_iso_string) for a playlist."""
+    def get_playlist_tracks(self, playlist_id):
+        """Fetches the playlist's tracks as dicts: id, url, name, artists, title, added_at, duration_ms, isrc."""
         if not self.sp:
             return []
 
         tracks = []
         try:
-            results = self.safe_call(self.sp.playlist_items, playlist_id, fields="items(added_at,track(name,artists(name))),next")
+            fields = "items(added_at,track(id,name,duration_ms,artists(name),external_urls(spotify),external_ids(isrc))),next"
+            results = self.safe_call(self.sp.playlist_items, playlist_id, fields=fields)
             while results:
                 for item in results['items']:
-                    if item.get('track'):
-                        name = item['track']['name']
-                        artists = ", ".join([a['name'] for a in item['track']['artists']])
-                        full_name = f"{artists} - {name}"
-                        added_at = item.get('added_at')
-                        tracks.append((full_name, added_at))
+                    t = item.get('track')
+                    if t:
+                        artists = [a['name'] for a in t.get('artists') or []]
+                        track_id = t.get('id')
+                        tracks.append({
+                            "id": track_id,
+                            "url": (t.get('external_urls') or {}).get('spotify') or (f"https://open.spotify.com/track/{track_id}" if track_id else None),
+                            "name": f"{', '.join(artists)} - {t['name']}",
+                            "artists": artists,
+                            "title": t['name'],
+                            "added_at": item.get('added_at'),
+                            "duration_ms": t.get('duration_ms'),
+                            "isrc": (t.get('external_ids') or {}).get('isrc')
+                        })
                 
                 if results.get('next'):
                     results = self.safe_call(self.sp.next, results)
                 else:
                     results = None
         except Exception as e:
-            self.logger.error(f"Error fetching tracks with dates: {e}")
+            self.logger.error(f"Error fetching playlist tracks: {e}")
             
         return tracks
+
+    def get_playlist_tracks_with_dates(self, playlist_id):
+        """Fetches list of (track_name, added_at_iso_string) for a playlist."""
+        return [(t['name'], t['added_at']) for t in self.get_playlist_tracks(playlist_id)]
@@ -0,0 +1,167 @@
+import os
+from typing import List, Dict, Optional
+from app.utils import track_signature, filename_signature
+
+AUDIO_EXTENSIONS = ('.mp3', '.flac', '.m4a', '.ogg', '.opus', '.wav')
+
+class SyncPlan:
+    """
+    Result of diffing a playlist's Spotify track list against its local folder.
+    """
+    def __init__(self, tracks: List[Dict], present: List[Dict], missing: List[Dict]):
+        self.tracks = tracks
+        self.present = present
+        self.missing = missing
+
+    @property
+    def is_up_to_date(self) -> bool:
+        return not self.missing
+
+    @property
+    def missing_urls(self) -> List[str]:
+        return [t['url'] for t in self.missing if t.get('url')]
+
+    def batches(self, size: int) -> List[List[str]]:
+        """Splits the missing track URLs into spotDL invocations of at most `size` queries."""
+        urls = self.missing_urls
+        return [urls[i:i + size] for i in range(0, len(urls), size)]
+
+class FolderStatus:
+    """
+    Exact per-track status of a folder against a playlist's expected filenames.
+    `missing` holds one display name per missing track; `claimed` the signatures of the local
+    files that belong to the playlist.
+    """
+    def __init__(self, total: int, present: int, missing: List[str], claimed=None):
+        self.total = total
+        self.present = present
+        self.missing = missing
+        self.claimed = claimed if claimed is not None else set()
+
+    @property
+    def is_complete(self) -> bool:
+        return self.total > 0 and not self.missing
+
+    @property
+    def label(self) -> str:
+        return f"{self.present}/{self.total}"
+
+class SyncPlanner:
+    """
+    Decides which tracks of a playlist still need downloading, without asking spotDL.
+    Files are identified by their tags first (`tags`, a TagIndex: Spotify ID/ISRC), then by
+    signature. Tracks without either match are paired with the leftover local files through
+    `matcher` (a FuzzyMatcher) when one is given.
+    """
+    BATCH_SIZE = 50
+
+    def __init__(self, matcher=None, tags=None):
+        self.matcher = matcher
+        self.tags = tags
+
+    @staticmethod
+    def local_files(folder: str) -> Dict[str, str]:
+        """Audio files in a folder, keyed by the signature of their filename stem."""
+        files = {}
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                        files[filename_signature(os.path.splitext(entry.name)[0])] = entry.name
+        except OSError:
+            pass
+        return files
+
+    @staticmethod
+    def local_signatures(folder: str) -> set:
+        """Signatures of the audio files in a folder."""
+        return set(SyncPlanner.local_files(folder))
+
+    @staticmethod
+    def signature(track: Dict) -> str:
+        """Canonical signature of a Spotify track dict (see app.utils.track_signature)."""
+        if track.get('title'):
+            return track_signature(track.get('artists') or [], track['title'])
+        return filename_signature(track.get('name') or "")
+
+    @staticmethod
+    def find_file(track: Dict, files: Dict[str, str], tagged=None) -> Optional[str]:
+        """Filename of a track by its tags (a TagIndex.folder_index() result) or in a local_files() mapping, or None."""
+        if tagged:
+            by_id, by_isrc = tagged
+            filename = by_id.get(track.get('id')) or by_isrc.get(track.get('isrc'))
+            if filename:
+                return filename
+        return files.get(SyncPlanner.signature(track))
+
+    @staticmethod
+    def match_expected(expected_files: List, local_stems, matcher=None, expected_ids=None, tagged=None) -> FolderStatus:
+        """
+        Tests each track's signature (`expected_files`: one signature per track) against the
+        signatures of the folder's stems, built into a set once: one set lookup per track.
+        Entries saved before signatures existed (lists of filename variants) still match.
+        With `expected_ids` ([track_id, isrc] per track) and `tagged` (TagIndex.folder_index()),
+        tracks are identified by their tags first. Tracks left over are handed to `matcher`
+        together with the unclaimed stems.
+        """
+        signatures = {filename_signature(s) for s in local_stems}
+        by_id, by_isrc = tagged or ({}, {})
+        ids = expected_ids if expected_ids and len(expected_ids) == len(expected_files) else None
+        claimed = set()
+        present, missing = 0, []
+        for i, entry in enumerate(expected_files or []):
+            if ids and (by_id or by_isrc):
+                track_id, isrc = ids[i]
+                filename = by_id.get(track_id) or by_isrc.get(isrc)
+                if filename:
+                    present += 1
+                    claimed.add(filename_signature(os.path.splitext(filename)[0]))
+                    continue
+            if isinstance(entry, str):
+                sig = filename_signature(entry)
+                found = sig if sig in signatures else None
+                label = entry
+            else:
+                found = next((s for s in map(filename_signature, entry) if s in signatures), None)
+                label = entry[0] if entry else ""
+            if found:
+                present += 1
+                claimed.add(found)
+            else:
+                missing.append(label)
+        if matcher and missing:
+            matched = matcher.match([filename_signature(m) for m in missing], list(signatures - claimed))
+            if matched:
+                still = [m for m in missing if filename_signature(m) not in matched]
+                present += len(missing) - len(still)
+                missing = still
+                claimed.update(matched.values())
+        return FolderStatus(present + len(missing), present, missing, claimed)
+
+    def plan(self, tracks: List[Dict], folder: str, local_signatures: Optional[set] = None) -> SyncPlan:
+        """Splits `tracks` into present/missing based on the files in `folder`."""
+        if local_signatures is None:
+            local_signatures = self.local_signatures(folder)
+        tagged = self.tags.folder_index(folder) if self.tags else None
+
+        present, missing = [], []
+        claimed = set()
+        for track in tracks:
+            if not track.get('url'):
+                continue  # Local files / unavailable tracks can't be downloaded
+            sig = self.signature(track)
+            filename = self.tags.find(track, tagged) if tagged else None
+            if filename:
+                present.append(track)
+                claimed.add(filename_signature(os.path.splitext(filename)[0]))
+            elif sig in local_signatures:
+                present.append(track)
+                claimed.add(sig)
+            else:
+                missing.append(track)
+        if self.matcher and missing:
+            matched = self.matcher.match([self.signature(t) for t in missing], list(set(local_signatures) - claimed))
+            if matched:
+                present += [t for t in missing if self.signature(t) in matched]
+                missing = [t for t in missing if self.signature(t) not in matched]
+        return SyncPlan(tracks, present, missing)
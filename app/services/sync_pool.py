@@ -0,0 +1,131 @@
+import threading
+from collections import deque
+from app.services.logger import LogService
+from app.services.retry_scheduler import RetryLater, RetryScheduler
+
+class SyncPool:
+    """
+    Bounded worker pool that runs several playlist syncs at the same time.
+    Workers honor the downloader's global rate-limit pause before picking up a job.
+    A job that raises RetryLater is parked in a RetryScheduler and the worker moves on to
+    the next playlist; the job is resumed as job_fn(item, retry=<RetryLater>) once it is due.
+    """
+    def __init__(self, downloader, logger: LogService, max_workers=2, progress_callback=None, limit_fn=None):
+        self.downloader = downloader
+        self.logger = logger
+        self.max_workers = max(1, int(max_workers or 1))
+        # Optional () -> int giving the current number of jobs allowed at once (adaptive concurrency)
+        self.limit_fn = limit_fn
+        self.progress_callback = progress_callback  # (done, total, running_labels) -> None
+        self.scheduler = RetryScheduler()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._running = []
+        self._done = 0
+        self._total = 0
+        self._pending = deque()
+        self._in_flight = 0
+
+    def _report(self):
+        if self.progress_callback:
+            with self._lock:
+                snapshot = (self._done, self._total, list(self._running))
+            try:
+                self.progress_callback(*snapshot)
+            except Exception:
+                pass
+
+    def cancel(self):
+        """Drops queued and parked jobs; jobs already running finish normally."""
+        with self._cond:
+            dropped = len(self._pending) + len(self.scheduler.cancel_all())
+            self._done += dropped
+            self._pending.clear()
+            self._cond.notify_all()
+        if dropped:
+            self.logger.info(f"Sync pool: cancelled {dropped} queued/parked job(s).")
+        self._report()
+
+    def _limit(self):
+        if not self.limit_fn:
+            return self.max_workers
+        try:
+            return max(1, min(self.max_workers, int(self.limit_fn())))
+        except Exception:
+            return self.max_workers
+
+    def _next_task(self):
+        """Blocks until a due parked job or a fresh item is available. None when all work is finished."""
+        with self._cond:
+            while True:
+                if self._in_flight >= self._limit():
+                    # Over the current limit (it may have been lowered); let running jobs finish first
+                    self._cond.wait(timeout=1.0)
+                    continue
+                due = self.scheduler.pop_due()
+                if due is not None:
+                    self._in_flight += 1
+                    return due
+                if self._pending:
+                    self._in_flight += 1
+                    return self._pending.popleft(), None
+                if self._in_flight == 0 and not len(self.scheduler):
+                    return None
+                next_due = self.scheduler.next_due_in()
+                self._cond.wait(timeout=min(1.0, next_due) if next_due is not None else 1.0)
+
+    def run(self, items, job_fn, label_fn=None):
+        """Runs job_fn(item) for every item and returns results in input order (None if a job raised)."""
+        label_fn = label_fn or str
+        with self._lock:
+            self._total = len(items)
+            self._done = 0
+            self._running = []
+            self._pending = deque(range(len(items)))
+            self._in_flight = 0
+        results = [None] * len(items)
+
+        def _run_one(index, retry):
+            item = items[index]
+            label = label_fn(item)
+            # Don't start new work while another job is cooling down from a rate limit
+            self.downloader.wait_if_paused()
+            with self._lock:
+                self._running.append(label)
+            self._report()
+            finished = True
+            if retry is None:
+                self.logger.info(f"[{index + 1}/{self._total}] Syncing: {label}")
+            else:
+                self.logger.info(f"[{index + 1}/{self._total}] Resuming: {label}")
+            try:
+                results[index] = job_fn(item) if retry is None else job_fn(item, retry=retry)
+            except RetryLater as e:
+                # Park instead of sleeping; this worker picks up another playlist meanwhile
+                finished = False
+                self.logger.info(f"Parked '{label}' for {int(e.delay)}s ({e.reason or 'retry'}).")
+                self.scheduler.schedule(index, e.delay, e)
+            except Exception as e:
+                self.logger.error(f"Sync job failed for {label}: {e}")
+            finally:
+                with self._cond:
+                    self._running.remove(label)
+                    self._in_flight -= 1
+                    if finished:
+                        self._done += 1
+                    self._cond.notify_all()
+                self._report()
+
+        def _worker():
+            while True:
+                task = self._next_task()
+                if task is None:
+                    return
+                _run_one(*task)
+
+        threads = [threading.Thread(target=_worker, daemon=True) for _ in range(min(self.max_workers, len(items)))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
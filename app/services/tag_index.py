@@ -0,0 +1,147 @@
+"""
+Identifies audio files by the metadata spotDL embeds in their tags (Spotify URL, ISRC).
+
+`read_tags` runs in worker processes, so this module must stay importable without the GUI
+(no app.core.constants / customtkinter imports).
+"""
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+try:
+    import mutagen
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+from app.core.file_cache import JsonCache, map_in_processes
+from app.services.spotdl_manifest import track_id_from_url
+
+TAGGED_EXTENSIONS = ('.mp3', '.flac', '.m4a', '.ogg', '.opus')
+_ISRC = re.compile(r"^[A-Z]{2}[A-Z0-9]{3}[0-9]{7}$")
+
+def _texts(value):
+    """Text values of a tag, whatever the container (ID3 frame, MP4 freeform, Vorbis string)."""
+    if isinstance(value, (list, tuple)):
+        for v in value:
+            yield from _texts(v)
+    elif isinstance(value, bytes):
+        yield value.decode('utf-8', 'ignore')
+    elif getattr(value, 'url', None):
+        yield value.url
+    elif getattr(value, 'text', None) is not None:
+        yield from _texts(list(value.text))
+    else:
+        yield str(value)
+
+def _load_tags(path):
+    try:
+        audio = mutagen.File(path)
+        return audio.tags if audio is not None else None
+    except Exception:
+        if not path.lower().endswith(".mp3"):
+            raise
+        # A damaged MPEG stream still has readable ID3 tags
+        from mutagen.id3 import ID3
+        return ID3(path)
+
+def read_tags(path) -> Tuple[Optional[str], Optional[str]]:
+    """(Spotify track ID, ISRC) from a file's tags; either is None when absent or unreadable."""
+    if not MUTAGEN_AVAILABLE:
+        return None, None
+    try:
+        tags = _load_tags(path)
+        if not tags:
+            return None, None
+        track_id = isrc = None
+        for key, value in tags.items():
+            key = str(key).lower()
+            for text in _texts(value):
+                if not isrc and ('isrc' in key or key.startswith('tsrc')):
+                    candidate = text.strip().upper().replace("-", "")
+                    isrc = candidate if _ISRC.match(candidate) else None
+                if not track_id and 'spotify' in text:
+                    track_id = track_id_from_url(text)
+        return track_id, isrc
+    except Exception:
+        return None, None
+
+class TagIndex:
+    """
+    Maps audio files to Spotify track IDs and ISRCs through their tags, read with mutagen in a
+    process pool. Results are cached per folder by (name, size, mtime), so only new or changed
+    files are read.
+    Without mutagen every lookup is empty and callers fall back to filename matching.
+    """
+    POOL_THRESHOLD = 16      # Fewer files are read inline; a pool isn't worth its startup cost
+
+    def __init__(self, cache_file, logger=None):
+        self.cache_file = cache_file
+        self.logger = logger
+        self._cache = JsonCache(cache_file, "TagIndex")
+        self._lock, self.cache = self._cache.lock, self._cache.data
+
+    @property
+    def available(self) -> bool:
+        return MUTAGEN_AVAILABLE
+
+    def folder_index(self, folder: str, files=None) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        ({track_id: filename}, {isrc: filename}) for the tagged audio files in `folder`.
+        `files` are (name, size, mtime_ns) rows when already known (file catalog); else the folder is listed.
+        Only files that are new or changed since their last read are opened.
+        """
+        if not MUTAGEN_AVAILABLE:
+            return {}, {}
+        folder = os.path.normpath(os.path.abspath(folder))
+        if files is None:
+            files = []
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            st = entry.stat()
+                            files.append((entry.name, st.st_size, st.st_mtime_ns))
+            except OSError:
+                return {}, {}
+        files = [f for f in files if f[0].lower().endswith(TAGGED_EXTENSIONS)]
+
+        with self._lock:
+            cached = self.cache.get(folder) or {}
+        entries, to_read = {}, []
+        for name, size, mtime in files:
+            hit = cached.get(name)
+            if hit and hit[:2] == [size, mtime]:
+                entries[name] = hit
+            else:
+                entries[name] = [size, mtime, None, None]
+                to_read.append(name)
+        if to_read:
+            paths = [os.path.join(folder, n) for n in to_read]
+            for name, tags in zip(to_read, map_in_processes(read_tags, paths, self.POOL_THRESHOLD, self.logger, "Tag reader")):
+                entries[name][2:] = list(tags)
+        if to_read or len(entries) != len(cached):
+            # Replacing the folder's entries also drops files that left it. A status pass touches
+            # many folders, so the whole cache is written once after it rather than per folder
+            with self._lock:
+                self.cache[folder] = entries
+            self._cache.save_later()
+
+        by_id, by_isrc = {}, {}
+        for name, (_, _, track_id, isrc) in entries.items():
+            if track_id:
+                by_id.setdefault(track_id, name)
+            if isrc:
+                by_isrc.setdefault(isrc, name)
+        return by_id, by_isrc
+
+    @staticmethod
+    def find(track: Dict, tagged: Tuple[Dict[str, str], Dict[str, str]]) -> Optional[str]:
+        """Filename of a track in a folder_index() result, by Spotify ID then ISRC, or None."""
+        by_id, by_isrc = tagged
+        return by_id.get(track.get('id') or track_id_from_url(track.get('url'))) or by_isrc.get(track.get('isrc'))
+
+    def forget(self, path):
+        folder, name = os.path.split(os.path.normpath(os.path.abspath(path)))
+        with self._lock:
+            (self.cache.get(folder) or {}).pop(name, None)
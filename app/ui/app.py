@@ -1,5 +1,4 @@
 import customtkinter as ctk
-import logging
 import json
 import os
 import sys
@@ -73,16 +72,31 @@ from io import BytesIO
 from concurrent.futures import ThreadPoolExecutor
 import re
 
-from app.core.constants import APP_NAME, APP_VERSION, SPOTIPY_AVAILABLE, REDIRECT_URI, SCOPES, LOG_FILE, SPOTIFY_CACHE_FILE
+from app.core.constants import APP_NAME, APP_VERSION, SPOTIPY_AVAILABLE, REDIRECT_URI, SCOPES, LOG_FILE, SPOTIFY_CACHE_FILE, DUPLICATE_CACHE_FILE
 from app.core.config import ConfigManager
 from app.core.history import HistoryManager
+from app.core.rate_limit import RateLimitManager
+from app.core.job_store import JobStore
+from app.core.quarantine import QuarantineManager
+from app.core.file_catalog import FileCatalog
 from app.services.logger import LogService
 from app.services.spotify import SpotifyService
 from app.services.downloader import DownloaderService
+from app.services.spotdl_events import SpotDLOutputTracker
+from app.services.sync_pool import SyncPool
+from app.services.retry_scheduler import RetryLater
+from app.services.sync_planner import SyncPlanner, AUDIO_EXTENSIONS
+from app.services.content_store import STORE_DIRNAME
+from app.services.fs_watcher import LibraryWatcher
+from app.services.duplicates import DuplicateFinder
+from app.services.orphans import OrphanFinder, ARCHIVE_DIRNAME
 from app.services.i18n import I18nService
-from app.utils import normalize_spotify_url, get_safe_dirname, format_timestamp, get_resource_path
+from app.utils import normalize_spotify_url, get_safe_dirname, format_timestamp, get_resource_path, format_duration, track_signature, filename_signature, format_size
 from app.ui.dialogs.group_select import GroupSelectDialog
 from app.ui.dialogs.playlist_select import PlaylistSelectionDialog
+from app.ui.dialogs.duplicates import DuplicatesDialog
+from app.ui.dialogs.disk_usage import DiskUsageDialog
+from app.ui.dialogs.orphans import OrphansDialog
 
 # Try importing spotipy for direct usage in UI thread helpers
 try:
@@ -96,6 +110,9 @@ class SpotDLApp(ctk.CTk):
     """
     Main GUI Application Class.
     """
+    DEFAULT_TRACK_BYTES = 8 * 1024 * 1024     # Disk preflight estimate before anything is downloaded
+    DISK_RESERVE_BYTES = 512 * 1024 * 1024    # Free space the preflight keeps untouched
+
     def __init__(self):
         super().__init__()
         self.title(APP_NAME)
@@ -114,22 +131,32 @@ class SpotDLApp(ctk.CTk):
         
         # Runtime UI mapping for smooth reordering without breaking config JSON
         self._item_widgets = {} # {id(item): widget_reference}
+        self._group_usage_labels = {} # {id(group): (group, size label)}
         
         # Initialize Managers & Services
         self.config_manager = ConfigManager()
         self.history_manager = HistoryManager()
+        self.rate_limit_manager = RateLimitManager()
+        self.job_store = JobStore()
+        self.quarantine_manager = QuarantineManager()
+        self._active_pools = []  # SyncPools of running batches (Stop cancels them)
+        # Indexed view of the music folder; status checks and discovery read it instead of the disk
+        self.file_catalog = FileCatalog(skip_dirs={STORE_DIRNAME, ARCHIVE_DIRNAME})
+        self.orphan_report = None  # OrphanReport of the last metadata refresh
+        self.library_watcher = None
         self.i18n = I18nService()
         self.i18n.set_language(self.config_manager.get("language") or "en")
         
         # Setup Services
-        self.logger = LogService(log_file=LOG_FILE)
-        self.logger.set_gui_callback(self.log_message)
+        self.logger = LogService(log_file=LOG_FILE, level=self.config_manager.get("log_level"))
         
-        self.spotify_service = SpotifyService(self.config_manager, self.logger)
+        self.spotify_service = SpotifyService(self.config_manager, self.logger, self.rate_limit_manager)
         self.spotify_service.set_status_callback(self.set_active_task)
         self.spotify_service.initialize_client()
         
-        self.downloader = DownloaderService(self.config_manager, self.history_manager, self.logger)
+        self.downloader = DownloaderService(self.config_manager, self.history_manager, self.logger, self.rate_limit_manager,
+                                            self.quarantine_manager)
+        self.duplicate_finder = DuplicateFinder(DUPLICATE_CACHE_FILE, self.logger)
 
         # Layout Layout
         self.grid_rowconfigure(0, weight=1)
@@ -155,6 +182,10 @@ class SpotDLApp(ctk.CTk):
         self.lbl_active_task = ctk.CTkLabel(self, text="", font=("Arial", 10, "italic"), text_color="gray")
         self.lbl_active_task.grid(row=1, column=0, sticky="e", padx=25, pady=(0, 10))
 
+        # Persisted Rate Limit Countdown (survives restarts)
+        self.lbl_rate_limit = ctk.CTkLabel(self, text="", font=("Arial", 11, "bold"), text_color="#ff5555")
+        self.lbl_rate_limit.grid(row=1, column=0, sticky="w", padx=25, pady=(0, 10))
+
         # Session Tracking
         self.session_new_downloads = []
         self.feed_expanded = True  # Tracks if the download feed is visible
@@ -172,6 +203,7 @@ class SpotDLApp(ctk.CTk):
         self.setup_settings_tab()
         self.setup_logs_tab()
         self.setup_about_tab()
+        self._flush_log_sink()
 
         # Initial Load with delay to ensure mainloop is ready
         self.after(800, self._startup_tasks)
@@ -179,24 +211,15 @@ class SpotDLApp(ctk.CTk):
     def _startup_tasks(self):
         """Hidden background refreshes after boot."""
         self._recover_interrupted_syncs()
+        self._tick_rate_limit_countdown()
+        self._offer_batch_resume()
         self.update_profile_display()
+        self._start_library_watcher()
         
         # We already rendered local results in setup_library_tab.
         # Minimal logging to confirm boot is clean.
         self.log_message(f"App initialized. Version {APP_VERSION}")
 
-    def log_message(self, message):
-        """Logs a message to the Logs tab text area."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        try:
-            full_msg = f"{timestamp} - {message}\n"
-            self.txt_logs.configure(state="normal")
-            self.txt_logs.insert("end", full_msg)
-            self.txt_logs.see("end")
-            self.txt_logs.configure(state="disabled")
-        except:
-             pass
-
     def setup_profile_tab(self):
         """Builds the My Profile tab."""
         self.tab_profile.grid_columnconfigure(0, weight=1)
@@ -776,9 +799,54 @@ class SpotDLApp(ctk.CTk):
         else:
             self.lbl_profile_status.configure(text="Ready", text_color="gray")
 
+    def _refresh_catalog(self):
+        """Brings the file catalog of the music folder up to date (only changed folders are re-listed)."""
+        output_base = self.config_manager.get("output_path")
+        try:
+            rescanned, checked = self.file_catalog.refresh(output_base)
+            if rescanned:
+                self.logger.debug(f"File catalog: re-listed {rescanned} of {checked} folder(s).")
+        except Exception as e:
+            self.log_message(f"File catalog refresh failed: {e}")
+
+    def _start_library_watcher(self):
+        """(Re)starts the live watcher of the music folder if it is enabled and the folder changed."""
+        root = self.config_manager.get("output_path")
+        enabled = self.config_manager.get("watch_library")
+        watcher = self.library_watcher
+        if watcher and (not enabled or watcher.root != os.path.normpath(os.path.abspath(root))):
+            self.library_watcher = None
+            threading.Thread(target=watcher.stop, daemon=True).start()
+            watcher = None
+        if watcher or not enabled or not os.path.isdir(root):
+            return
+
+        def _start():
+            # Adding one watch per folder can take a moment on big trees
+            new_watcher = LibraryWatcher(self.file_catalog, root, on_change=self._on_library_fs_change, logger=self.logger)
+            new_watcher.start()
+            self.library_watcher = new_watcher
+            self.logger.debug(f"Library watcher started ({new_watcher.mode}).")
+        threading.Thread(target=_start, daemon=True).start()
+
+    def _on_library_fs_change(self, changed):
+        """Watcher callback (watcher thread): re-checks only the library rows whose folders changed."""
+        changed = {os.path.normcase(p) for p in changed}
+        affected = []
+        for entry in list(getattr(self, '_lib_status_queue', [])):
+            try:
+                folder = os.path.normcase(os.path.normpath(os.path.abspath(self._get_item_path(entry[0]))))
+            except Exception:
+                continue
+            if folder in changed:
+                affected.append(entry)
+        if affected:
+            self._async_lib_status_worker(affected, refresh_catalog=False, quiet=True)
+
     def _async_status_worker(self, queue):
         """Processes sync status checks in the background and updates UI."""
         self.set_active_task(self.i18n.t("checking_profile_sync"))
+        self._refresh_catalog()
         
         # Build lookup map from library to handle imported/custom paths
         library = self.config_manager.get("library") or []
@@ -797,8 +865,9 @@ class SpotDLApp(ctk.CTk):
                 lib_item = lib_map.get(url)
                 l_path = lib_item.get('local_path') if lib_item else pl.get('local_path')
                 e_files = lib_item.get('expected_files') if lib_item else pl.get('expected_files')
+                e_ids = lib_item.get('expected_ids') if lib_item else None
 
-                status_text, status_color, _ = self.get_playlist_sync_status(pl_name, track_count, l_path, e_files)
+                status_text, status_color, _ = self.get_playlist_sync_status(pl_name, track_count, l_path, e_files, expected_ids=e_ids)
                 
                 # Check for "Synced" status - but prioritize library URL match for logic
                 is_synced = (status_text == self.i18n.t("synced")) or (lib_item is not None and status_text != self.i18n.t("new"))
@@ -834,6 +903,9 @@ class SpotDLApp(ctk.CTk):
         self.after(0, lambda: self.lbl_profile_status.configure(text=self.i18n.t("ready"), text_color="gray"))
 
     def download_selected_playlists(self):
+        if self._refuse_if_rate_limited(self.downloader.rate_limit_remaining()):
+            return
+
         selected = []
         full_synced = []
         partial_confirmed = []
@@ -856,8 +928,9 @@ class SpotDLApp(ctk.CTk):
                     lib_item = lib_map.get(url)
                     l_path = lib_item.get('local_path') if lib_item else None
                     e_files = lib_item.get('expected_files') if lib_item else None
+                    e_ids = lib_item.get('expected_ids') if lib_item else None
                     
-                    status_text, _, _ = self.get_playlist_sync_status(pl['name'], track_count, l_path, e_files)
+                    status_text, _, _ = self.get_playlist_sync_status(pl['name'], track_count, l_path, e_files, expected_ids=e_ids)
                     
                     is_interrupted = lib_item.get('sync_interrupted', False) if lib_item else False
                     
@@ -943,26 +1016,6 @@ class SpotDLApp(ctk.CTk):
         # Run batch download in thread
         threading.Thread(target=self.run_batch_profile_download, args=(download_queue,), daemon=True).start()
 
-    def _sanitize_filename(self, filename: str) -> str:
-        """
-        Sanitizes a string to match spotDL's default filename behavior.
-        Replaces invalid filesystem characters and standardizes whitespace.
-        """
-        if not filename:
-            return ""
-        # 1. Standardize whitespace
-        filename = " ".join(filename.split())
-        # 2. Characters spotDL/OS usually replace or strip
-        # Note: spotDL uses a complex mapping, but these are the most common
-        invalid = '<>:"/\\|?*'
-        for char in invalid:
-            filename = filename.replace(char, '_')
-        # 3. Handle specific formatting quirks (optional but helpful)
-        # spotDL often replaces special quotes with standard ones
-        filename = filename.replace('’', "'").replace('“', '"').replace('”', '"')
-        return filename.strip()
-
-
     def _safe_spotify_call(self, func, *args, **kwargs):
         """
         Wraps Spotify API calls with rate-limit handling.
@@ -1004,29 +1057,50 @@ class SpotDLApp(ctk.CTk):
         return None
 
 
-    def get_playlist_sync_status(self, name, total_tracks, local_path=None, expected_files=None):
+    def _status_folder(self, name, local_path=None):
+        if local_path and os.path.exists(local_path):
+            return local_path
+        return os.path.join(self.config_manager.get("output_path"), get_safe_dirname(name))
+
+    def get_playlist_folder_status(self, name, local_path=None, expected_files=None, expected_ids=None):
+        """
+        Exact per-track status (FolderStatus: present/missing) from the playlist's expected filenames,
+        or None when they aren't known yet (fetched by Refresh Metadata).
+        With `expected_ids` ([track_id, isrc] per track), files are identified by their tags first.
+        """
+        if not name or not expected_files:
+            return None
+        try:
+            folder = self._status_folder(name, local_path)
+            files = self.file_catalog.files_in(folder, AUDIO_EXTENSIONS)
+            tag_index = self.downloader.tag_index() if expected_ids else None
+            tagged = tag_index.folder_index(folder, files) if tag_index else None
+            return SyncPlanner.match_expected(expected_files, (os.path.splitext(f[0])[0] for f in files),
+                                              matcher=self.downloader.matcher, expected_ids=expected_ids, tagged=tagged)
+        except Exception:
+            return None
+
+    def get_playlist_sync_status(self, name, total_tracks, local_path=None, expected_files=None, folder_status=None, expected_ids=None):
         """
         Ultra-fast status check. Returns (status_text, color, count).
-        Simply checks if the folder exists and contains ANY music files.
+        With expected filenames, count is the exact number of tracks present and a partly
+        downloaded folder is "Partial"; otherwise any music file in the folder counts as synced.
         Detailed sync state (New Songs) is handled by the worker timestamps.
         """
-        if local_path and os.path.exists(local_path):
-            full_path = local_path
-        else:
-            safe_name = get_safe_dirname(name)
-            base_path = self.config_manager.get("output_path")
-            full_path = os.path.join(base_path, safe_name)
+        full_path = self._status_folder(name, local_path) if name else None
         
         if not name: return self.i18n.t("new"), "gray", 0
-        
-        if not os.path.exists(full_path):
-            return self.i18n.t("new"), "gray", 0
+
+        folder_status = folder_status or self.get_playlist_folder_status(name, local_path, expected_files, expected_ids)
+        if folder_status and folder_status.total:
+            if folder_status.is_complete:
+                return self.i18n.t("synced"), "green", folder_status.present
+            if folder_status.present:
+                return self.i18n.t("partial_sync"), "orange", folder_status.present
             
-        # If the folder exists, check for content
+        # Audio files in the folder, from the file catalog (0 if the folder doesn't exist)
         try:
-             # Fast check: are there likely enough files?
-             files = [f for f in os.listdir(full_path) if f.endswith(('.mp3', '.flac', '.m4a', '.ogg'))]
-             count = len(files)
+             count = self.file_catalog.count_files(full_path, AUDIO_EXTENSIONS)
              
              if count == 0:
                  return self.i18n.t("new"), "gray", 0
@@ -1041,60 +1115,149 @@ class SpotDLApp(ctk.CTk):
         except Exception:
             return self.i18n.t("new"), "gray", 0
 
-    def run_batch_profile_download(self, download_queue):
-        self.log_message("Starting Batch Download from Profile...")
+    def run_batch_profile_download(self, download_queue, resume_batch=None):
+        if resume_batch is not None:
+            resumed = self.job_store.resume_jobs(resume_batch)
+            batch_id, job_ids = resume_batch, [jid for jid, _ in resumed]
+            download_queue = [payload for _, payload in resumed]
+            self.log_message(f"Resuming Batch Download from Profile: {len(download_queue)} playlist(s) left.")
+        else:
+            self.log_message("Starting Batch Download from Profile...")
+            batch_id, job_ids = self.job_store.create_batch("profile", download_queue,
+                                                            url_key=lambda it: it["data"]['external_urls']['spotify'],
+                                                            name_key=lambda it: it["data"]['name'])
+        job_of = {id(it): jid for it, jid in zip(download_queue, job_ids)}
         total = len(download_queue)
-        successful_downloads = 0
-        total_tracks = 0
+        successful_downloads = [0]
+        total_tracks = [0]
         
-        for i, item in enumerate(download_queue):
+        def _download_item(item, retry=None):
             pl = item["data"]
-            target_cwd = item["cwd"]
+            # No folder chosen: spotDL writes to the output path, so plan against it
+            target_cwd = item["cwd"] or self.config_manager.get("output_path")
+            job_id = job_of.get(id(item))
             
             name = pl['name']
             url = pl['external_urls']['spotify']
             pl_id = pl.get('id', name) 
             
-            # Increment Usage Stat
-            self.config_manager.increment_playlist_usage(pl_id)
-            
-            self.log_message(f"[{i+1}/{total}] Processing: {name}")
-            self.lbl_profile_status.configure(text=f"Processing [{i+1}/{total}]: {name}...")
-            
-            if target_cwd:
-                 self.log_message(f"  -> Saving to: {os.path.basename(target_cwd)}")
+            if retry is None:
+                self.job_store.mark_running(job_id)
+                # Increment Usage Stat
+                self.config_manager.increment_playlist_usage(pl_id)
+                
+                if target_cwd:
+                     self.log_message(f"  -> Saving '{name}' to: {os.path.basename(target_cwd)}")
             
             # Callback to update status with track name
             def update_status(track):
-                self.lbl_profile_status.configure(text=f"[{i+1}/{total}] {name}: Downloading '{track}'...")
+                self.after(0, lambda: self.lbl_profile_status.configure(text=f"{name}: Downloading '{track}'..."))
+
+            if retry and retry.context:
+                # Resumed after being parked: reuse the track list fetched the first time
+                remote_tracks = retry.context
+            else:
+                _, _, remote_tracks = self._prepare_sync_context(url, None)
 
             # Capture all 5 returns
-            success, tracks, failed_tracks, crashed, error_msg = self.downloader.download(url, cwd=target_cwd, status_callback=update_status, playlist_name=name)
+            try:
+                success, tracks, failed_tracks, crashed, error_msg = self._download_with_plan(
+                    url, name, target_cwd, remote_tracks, status_callback=update_status,
+                    defer_retries=True, resume_state=retry.state if retry else None,
+                    on_track=lambda t: self.job_store.record_track(job_id, t))
+            except RetryLater as e:
+                e.context = remote_tracks
+                raise
+            if crashed:
+                self.job_store.mark_failed(job_id, error_msg)
+            else:
+                self.job_store.mark_done(job_id)
             if success or len(tracks) > 0:
-                successful_downloads += 1
-                total_tracks += len(tracks)
-                
                 # Explicitly add to library if not already there
-                library = self.config_manager.get("library") or []
-                norm_url = normalize_spotify_url(url)
-                
-                # Use assistant helper to avoid duplicates and handle groups
-                if norm_url not in self._get_all_library_urls(library):
-                    self.log_message(f"Adding '{name}' to library.")
-                    library.append({
-                        "url": norm_url,
-                        "name": name,
-                        "type": "playlist",
-                        "total_tracks": pl['tracks']['total'],
-                        "last_synced": self._get_sync_timestamp(),
-                        "local_path": target_cwd
-                    })
-                    self.config_manager.set("library", self._deduplicate_library(library))
+                with self.config_manager.lock:
+                    successful_downloads[0] += 1
+                    total_tracks[0] += len(tracks)
+                    library = self.config_manager.get("library") or []
+                    norm_url = normalize_spotify_url(url)
+                    
+                    # Use assistant helper to avoid duplicates and handle groups
+                    if norm_url not in self._get_all_library_urls(library):
+                        self.log_message(f"Adding '{name}' to library.")
+                        library.append({
+                            "url": norm_url,
+                            "name": name,
+                            "type": "playlist",
+                            "total_tracks": pl['tracks']['total'],
+                            "last_synced": self._get_sync_timestamp(),
+                            "local_path": target_cwd
+                        })
+                        self.config_manager.set("library", self._deduplicate_library(library))
                 
                 for t in tracks:
                     self.log_download(t)
+
+        def _on_progress(done, total_count, running):
+            running_str = ", ".join(running[:3])
+            self.after(0, lambda: self.lbl_profile_status.configure(text=f"Processing [{done}/{total_count}]: {running_str}..."))
+
+        pool = self._create_sync_pool(_on_progress)
+        try:
+            pool.run(download_queue, _download_item, label_fn=lambda it: it["data"]['name'])
+        finally:
+            self._release_sync_pool(pool)
+        self.job_store.finish_batch(batch_id)
         
-        self.after(0, lambda: self._on_batch_complete(successful_downloads, total, total_tracks))
+        self.after(0, lambda: self._on_batch_complete(successful_downloads[0], total, total_tracks[0]))
+
+    def _create_sync_pool(self, progress_callback):
+        """
+        Worker pool for a batch. Its size follows the adaptive concurrency limit minus the
+        foreground syncs running right now (each one takes a slot from the batch).
+        """
+        limit = lambda: self.downloader.concurrency.current_playlists() - self.downloader.foreground_count()
+        pool = SyncPool(self.downloader, self.logger, max_workers=self._get_parallel_syncs(),
+                        progress_callback=progress_callback, limit_fn=limit)
+        self._active_pools.append(pool)
+        self.after(0, self._update_stop_button)
+        return pool
+
+    def _release_sync_pool(self, pool):
+        if pool in self._active_pools:
+            self._active_pools.remove(pool)
+        self.after(0, self._update_stop_button)
+
+    def _update_stop_button(self):
+        try:
+            self.btn_stop_sync.configure(state="normal" if self._active_pools else "disabled")
+        except Exception:
+            pass
+
+    def stop_batch_sync(self):
+        """Stops running batches: drops queued/parked playlists and kills the running spotDL jobs."""
+        if not self._active_pools:
+            return
+        self.btn_stop_sync.configure(state="disabled")
+        for pool in list(self._active_pools):
+            pool.cancel()
+        cancelled = self.downloader.cancel_all(background_only=True)
+        self.spotify_service.interrupt_waits()
+        self.log_message(f"Batch stopped by user ({cancelled} running job(s) cancelled).")
+
+    def _get_parallel_syncs(self):
+        """Configured number of playlists synced at the same time (at least 1)."""
+        try:
+            return max(1, int(self.config_manager.get("max_parallel_syncs") or 1))
+        except (TypeError, ValueError):
+            return 1
+
+    def _on_batch_sync_progress(self, done, total, running):
+        """Aggregate progress for the Sync All worker pool."""
+        running_str = ", ".join(running[:3]) + (f" +{len(running) - 3}" if len(running) > 3 else "")
+        self.set_active_task(f"Batch Sync [{done}/{total}] {self.i18n.t('running_lbl')}: {running_str or '-'}")
+        def _update():
+            try: self.btn_sync.configure(text=f"{self.i18n.t('syncing')}... {done}/{total}")
+            except: pass
+        self.after(0, _update)
 
     def _on_batch_complete(self, success_count, total_count, track_count):
         self.refresh_history_ui()
@@ -1180,6 +1343,14 @@ class SpotDLApp(ctk.CTk):
         btn_refresh.pack(side="right", padx=5)
         ToolTip(btn_refresh, self.i18n.t("tip_refresh_lib"))
 
+        btn_usage = ctk.CTkButton(frm_header, text=self.i18n.t("disk_usage"), command=self.show_disk_usage, fg_color="#3a3a3a")
+        btn_usage.pack(side="right", padx=5)
+        ToolTip(btn_usage, self.i18n.t("tip_disk_usage"))
+
+        self.btn_orphans = ctk.CTkButton(frm_header, text=self.i18n.t("orphans"), command=self.show_orphans, fg_color="#3a3a3a")
+        self.btn_orphans.pack(side="right", padx=5)
+        ToolTip(self.btn_orphans, self.i18n.t("tip_orphans"))
+
         btn_import = ctk.CTkButton(frm_header, text=self.i18n.t("import_folder"), command=self.import_existing_folder, fg_color="#3a3a3a")
         btn_import.pack(side="right", padx=5)
         ToolTip(btn_import, self.i18n.t("tip_import_folder"))
@@ -1205,10 +1376,16 @@ class SpotDLApp(ctk.CTk):
         if library:
             self._render_library_results(library, remote_sync=False)
         
-        # Sync Button
-        self.btn_sync = ctk.CTkButton(self.tab_library, text=self.i18n.t("sync_all"), command=self.sync_all, fg_color="green", hover_color="darkgreen")
-        self.btn_sync.grid(row=2, column=0, pady=10)
+        # Sync / Stop Buttons
+        sync_bar = ctk.CTkFrame(self.tab_library, fg_color="transparent")
+        sync_bar.grid(row=2, column=0, pady=10)
+        self.btn_sync = ctk.CTkButton(sync_bar, text=self.i18n.t("sync_all"), command=self.sync_all, fg_color="green", hover_color="darkgreen")
+        self.btn_sync.pack(side="left", padx=5)
         ToolTip(self.btn_sync, self.i18n.t("tip_sync_all"))
+        self.btn_stop_sync = ctk.CTkButton(sync_bar, text=self.i18n.t("stop_sync"), command=self.stop_batch_sync, width=80,
+                                           fg_color="#C62828", hover_color="#8E0000", state="disabled")
+        self.btn_stop_sync.pack(side="left", padx=5)
+        ToolTip(self.btn_stop_sync, self.i18n.t("tip_stop_sync"))
 
     def refresh_library_ui(self, remote_sync=True):
         """Reloads the library list using a background thread for I/O tasks to keep the UI responsive."""
@@ -1218,6 +1395,7 @@ class SpotDLApp(ctk.CTk):
         
         # Clear runtime mapping to prevent memory leaks or stale refs
         self._item_widgets.clear()
+        self._group_usage_labels.clear()
 
         self.lbl_lib_refresh_status.configure(text="🔄 " + self.i18n.t("preparing_library"))
         if not self.lbl_lib_refresh_status.winfo_ismapped():
@@ -1420,6 +1598,10 @@ class SpotDLApp(ctk.CTk):
             
             lbl_group = ctk.CTkLabel(group_header, text=item.get("name", self.i18n.t("new_group")), font=("Arial", 14, "bold"), text_color="#1DB954")
             lbl_group.pack(side="left", padx=5)
+            # Filled in by the status worker from the catalog's usage aggregates
+            lbl_group_usage = ctk.CTkLabel(group_header, text="", font=("Arial", 11), text_color="gray")
+            lbl_group_usage.pack(side="left", padx=5)
+            self._group_usage_labels[id(item)] = (item, lbl_group_usage)
             
             ctk.CTkButton(group_header, text="✖", width=20, height=20, fg_color="transparent", 
                           hover_color="red", command=lambda it=item: self._remove_group(it)).pack(side="right", padx=5)
@@ -1591,16 +1773,23 @@ class SpotDLApp(ctk.CTk):
         lst = _find_list(library)
         if lst: self._show_move_to_group_dialog(target_item, lst)
 
-    def _async_lib_status_worker(self):
-        """Processes library sync status checks in the background."""
-        self.set_active_task(self.i18n.t("checking_sync"))
-        # Keep the indicator visible if it was already showing (e.g. startup)
-        if not self.lbl_lib_refresh_status.winfo_ismapped():
-            self.after(0, lambda: self.lbl_lib_refresh_status.pack(side="left", padx=20))
+    def _async_lib_status_worker(self, items=None, refresh_catalog=True, quiet=False):
+        """
+        Processes library sync status checks in the background.
+        `items` limits the check to some (item, badge) rows, e.g. the folders the watcher saw change.
+        `quiet` leaves the activity indicators alone (watcher updates while a sync reports its progress).
+        """
+        if not quiet:
+            self.set_active_task(self.i18n.t("checking_sync"))
+            # Keep the indicator visible if it was already showing (e.g. startup)
+            if not self.lbl_lib_refresh_status.winfo_ismapped():
+                self.after(0, lambda: self.lbl_lib_refresh_status.pack(side="left", padx=20))
             
-        queue = list(self._lib_status_queue)
+        queue = list(items if items is not None else self._lib_status_queue)
         total_items = len(queue)
         checked_count = [0] # List for mutability in closure
+        if refresh_catalog:
+            self._refresh_catalog()
         
         def _check_status(item_data):
             try:
@@ -1613,16 +1802,21 @@ class SpotDLApp(ctk.CTk):
                 raw_name = item.get("name", "Unknown")
                 target_count = item.get('total_tracks') or 0
                 
-                # Fast disk status
+                # Fast disk status (exact per-track when the expected filenames are known)
+                folder_status = self.get_playlist_folder_status(raw_name, item.get('local_path'), item.get('expected_files'),
+                                                                item.get('expected_ids'))
                 status_text, status_color, _ = self.get_playlist_sync_status(
-                    raw_name, target_count, item.get('local_path'), item.get('expected_files')
+                    raw_name, target_count, item.get('local_path'), item.get('expected_files'), folder_status=folder_status
                 )
+                folder = self._status_folder(raw_name, item.get('local_path'))
+                usage = self.file_catalog.usage([folder])[folder]
 
                 checked_count[0] += 1
-                prog = f"{self.i18n.t('refresh_metadata')} ({checked_count[0]}/{total_items})"
-                self.after(0, lambda: self.lbl_lib_refresh_status.configure(text=f"🔄 {prog}..."))
+                if not quiet:
+                    prog = f"{self.i18n.t('refresh_metadata')} ({checked_count[0]}/{total_items})"
+                    self.after(0, lambda: self.lbl_lib_refresh_status.configure(text=f"🔄 {prog}..."))
                 
-                def _update_ui(st=status_text, sc=status_color, b=lbl, it=item):
+                def _update_ui(st=status_text, sc=status_color, b=lbl, it=item, fs=folder_status, u=usage):
                     try:
                         if not b.winfo_exists(): return
                         
@@ -1662,6 +1856,9 @@ class SpotDLApp(ctk.CTk):
                             # st is now localized from get_playlist_sync_status
                             is_synced = st == self.i18n.t("synced")
                             tooltip_status = f"{st} ({self.i18n.t('warnings')})" if is_synced else st
+                        elif st == self.i18n.t("partial_sync"):
+                            icon = "🟡"
+                            color = "orange"
                         elif st == self.i18n.t("synced"):
                             icon = "🟢"
                             color = "#1DB954"
@@ -1669,6 +1866,8 @@ class SpotDLApp(ctk.CTk):
                         elif st == self.i18n.t("new"):
                             icon = "⚪"
                             color = "gray"
+                        if fs and fs.total:
+                            tooltip_status += f" ({fs.label})"
                         
                         b.configure(text=icon, text_color=color)
                         
@@ -1680,6 +1879,11 @@ class SpotDLApp(ctk.CTk):
                         tip += f"\n{self.i18n.t('last_sync')}: {f_time(sync_time)}"
                         if s_iso and (not sync_time or s_iso > sync_time):
                             tip += f"\n{self.i18n.t('spotify_updated_lbl')}: {f_time(s_iso)}"
+                        if fs and fs.missing:
+                            shown = ", ".join(fs.missing[:5]) + (f" +{len(fs.missing) - 5}" if len(fs.missing) > 5 else "")
+                            tip += f"\n{self.i18n.t('missing_lbl')}: {shown}"
+                        if u[1]:
+                            tip += "\n" + self.i18n.t("usage_line", size=format_size(u[0]), files=u[1])
                         
                         self._create_tooltip(b, tip)
                     except: pass
@@ -1687,13 +1891,159 @@ class SpotDLApp(ctk.CTk):
                 self.after(0, _update_ui)
             except: pass
 
-        # Parallelize the checks (up to 10 concurrent disk scans)
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            executor.map(_check_status, queue)
-            
+        # Catalog lookups are cheap; no need for parallel disk scans
+        for item_data in queue:
+            _check_status(item_data)
+        self._update_group_usage()
+        if quiet:
+            return
+
         self.after(0, self.lbl_lib_refresh_status.pack_forget)
         self.set_active_task(None)
 
+    def _playlist_usage(self, playlists):
+        """{id(item): (bytes, files)} of playlist items, from the catalog's per-folder aggregates."""
+        folders = {id(it): self._status_folder(it.get('name'), it.get('local_path')) for it in playlists}
+        usage = self.file_catalog.usage(set(folders.values()))
+        return {key: usage[folder] for key, folder in folders.items()}
+
+    def _update_group_usage(self):
+        """Shows each rendered group's total size and file count in its header."""
+        try:
+            groups = [(lbl, {self._status_folder(it.get('name'), it.get('local_path'))
+                             for it in self._flatten_library(group.get("items", []))})
+                      for group, lbl in list(self._group_usage_labels.values())]
+            updates = []
+            for lbl, folders in groups:
+                # A track hardlinked into several of the group's playlists takes its space once
+                size, files = self.file_catalog.folders_usage(folders)
+                updates.append((lbl, self.i18n.t("usage_short", size=format_size(size), files=files) if files else ""))
+
+            def _apply():
+                for lbl, text in updates:
+                    try:
+                        if lbl.winfo_exists():
+                            lbl.configure(text=text)
+                    except: pass
+            self.after(0, _apply)
+        except Exception as e:
+            self.log_message(f"Group usage update failed: {e}")
+
+    def show_disk_usage(self):
+        """Opens the sortable size view of the library's playlists (largest first)."""
+        def _worker():
+            try:
+                rows = []
+                def _collect(items, group_name=None):
+                    for it in items:
+                        if it.get("type") == "group":
+                            _collect(it.get("items", []), it.get("name"))
+                        elif it.get("type", "playlist") == "playlist":
+                            rows.append((it, group_name))
+                _collect(self.config_manager.get("library") or [])
+                usage = self._playlist_usage([it for it, _ in rows])
+                data = [{"name": it.get("name", "Unknown"), "group": g, "size": usage[id(it)][0], "files": usage[id(it)][1]}
+                        for it, g in rows]
+                total = self.file_catalog.total_usage(self.config_manager.get("output_path"))
+                self.after(0, lambda: DiskUsageDialog(self, data, self.i18n.t, total))
+            except Exception as e:
+                self.log_message(f"Disk usage view failed: {e}")
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def _confirm_disk_space(self, library):
+        """
+        Before a batch sync: estimates the space the missing tracks need (missing count × the library's
+        average track size, both from the catalog) and asks for confirmation if the music drive
+        can't hold it. Errs on the side of syncing when the estimate isn't possible.
+        """
+        try:
+            output_base = self.config_manager.get("output_path")
+            playlists = self._flatten_library(library)
+            # Audio files only: covers and .spotdl files aren't tracks
+            missing = sum(max(0, (it.get('total_tracks') or 0) -
+                              self.file_catalog.count_files(self._status_folder(it.get('name'), it.get('local_path')), AUDIO_EXTENSIONS))
+                          for it in playlists)
+            if not missing:
+                return True
+            total_bytes, total_files = self.file_catalog.total_usage(output_base, AUDIO_EXTENSIONS)
+            average = total_bytes / total_files if total_files else self.DEFAULT_TRACK_BYTES
+            needed = int(missing * average)
+            existing = output_base
+            while existing and not os.path.exists(existing):
+                parent = os.path.dirname(existing)
+                if parent == existing:
+                    break
+                existing = parent
+            free = shutil.disk_usage(existing).free
+        except Exception as e:
+            self.logger.debug(f"Disk space preflight skipped: {e}")
+            return True
+        if needed + self.DISK_RESERVE_BYTES <= free:
+            return True
+        self.log_message(f"Low disk space: ~{format_size(needed)} needed for {missing} missing track(s), {format_size(free)} free.")
+        return messagebox.askyesno(self.i18n.t("disk_space_title"),
+                                   self.i18n.t("disk_space_low", needed=format_size(needed), free=format_size(free)))
+
+    def _update_orphan_report(self):
+        """Rebuilds the file -> playlists index from the catalog and stored track lists (no disk scan)."""
+        try:
+            start = time.time()
+            playlists = [(it.get('name', 'Unknown'), self._status_folder(it.get('name'), it.get('local_path')),
+                          it.get('expected_files'), it.get('expected_ids'))
+                         for it in self._flatten_library()]
+            finder = OrphanFinder(self.file_catalog, self.downloader.matcher, self.downloader.tag_index(),
+                                  self.downloader.content_store())
+            report = finder.build(playlists)
+            self.orphan_report = report
+            self.log_message(f"Orphan report: {len(report.orphans)} file(s) ({format_size(report.total_bytes)}) in no playlist, "
+                             f"{len(report.owners)} owned ({time.time() - start:.2f}s).")
+            text = self.i18n.t("orphans_count", count=len(report.orphans)) if report.orphans else self.i18n.t("orphans")
+            self.after(0, lambda: self.btn_orphans.configure(text=text))
+            return report
+        except Exception as e:
+            self.log_message(f"Orphan report failed: {e}")
+            return None
+
+    def show_orphans(self):
+        """Builds the orphan report (catalog lookups only) and offers to archive or delete the files."""
+        def _worker():
+            self._refresh_catalog()
+            report = self._update_orphan_report()
+            if report is not None:
+                self.after(0, lambda: self._show_orphans_dialog(report))
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def _show_orphans_dialog(self, report):
+        if not report.orphans:
+            messagebox.showinfo(self.i18n.t("orphans_title"), self.i18n.t("orphans_none"))
+            return
+        root = self.config_manager.get("output_path")
+        mode = OrphansDialog(self, report, self.i18n.t, root).get_input()
+        if not mode:
+            return
+        if mode == "delete" and not messagebox.askyesno(self.i18n.t("orphans_title"),
+                                                        self.i18n.t("orphans_delete_confirm", files=len(report.orphans))):
+            return
+
+        def _worker():
+            paths = [p for p, _ in report.orphans]
+            if mode == "archive":
+                count = OrphanFinder.archive(paths, root)
+            else:
+                count = OrphanFinder.delete(paths)
+            self.log_message(f"Orphans {'archived' if mode == 'archive' else 'deleted'}: {count} of {len(paths)} file(s).")
+            store = self.downloader.content_store()
+            if store and report.store_ids:
+                # Stored copies no playlist links to anymore would keep the space in use
+                freed = store.prune(set(report.store_ids.values()))
+                if freed:
+                    self.log_message(f"Content store: freed {format_size(freed)} of tracks no playlist uses.")
+            self._refresh_catalog()
+            self._update_orphan_report()
+            msg = self.i18n.t("orphans_done", count=count)
+            self.after(0, lambda: messagebox.showinfo(self.i18n.t("orphans_title"), msg))
+        threading.Thread(target=_worker, daemon=True).start()
+
     def _background_discovery_task(self):
         """Discovers playlists on disk in the background."""
         self.set_active_task(self.i18n.t("scanning_disk"))
@@ -1708,25 +2058,15 @@ class SpotDLApp(ctk.CTk):
 
             discovered_disk_count = 0
             
-            # Recursive Discovery (os.walk for reliability)
+            # Folder lookup from the file catalog (the shared track store is never cataloged).
+            # Only the levels that can hold playlist folders are checked: listing depth-1 folders
+            # is enough to learn the names at the deepest level, so playlists aren't listed there.
             existing_folders = {} # Mapping: name.lower -> full_path
             try:
-                # Walk down up to a certain depth (e.g. 5)
-                # output_base is root
-                for root, dirs, files in os.walk(output_base):
-                    # Calculate depth relative to output_base
-                    rel_path = os.path.relpath(root, output_base)
-                    depth = 0 if rel_path == "." else len(rel_path.split(os.sep))
-                    
-                    if depth > 4: # Allow 4 levels of nesting
-                        continue
-                        
-                    for d in dirs:
-                        full_d_path = os.path.join(root, d)
-                        # Store the first one we find (best effort)
-                        d_low = d.lower()
-                        if d_low not in existing_folders:
-                             existing_folders[d_low] = full_d_path
+                depth = max(1, int(self.config_manager.get("discovery_depth") or 5))
+                rescanned, checked = self.file_catalog.refresh(output_base, max_depth=depth - 1)
+                self.logger.debug(f"Discovery: checked {checked} folder(s), re-listed {rescanned}.")
+                existing_folders = self.file_catalog.dirs_by_name(output_base, max_depth=depth)
             except Exception as e:
                 self.log_message(f"Discovery Scan Error: {e}")
 
@@ -1918,6 +2258,7 @@ class SpotDLApp(ctk.CTk):
         cid = self.config_manager.get("spotify_client_id")
         secret = self.config_manager.get("spotify_client_secret")
         if not cid or not secret: return
+        if self._refuse_if_rate_limited(self.spotify_service.rate_limit_remaining()): return
 
         self.lbl_lib_refresh_status.pack(side="left", padx=20)
 
@@ -1957,8 +2298,9 @@ class SpotDLApp(ctk.CTk):
                             item['name'] = data.get('name', item['name'])
                             item['total_tracks'] = data['tracks']['total']
                     
-                    variants_list, max_spotify_date = self._get_expected_filenames(url, sp=sp)
+                    variants_list, max_spotify_date, id_list = self._get_expected_filenames(url, sp=sp)
                     item['expected_files'] = variants_list
+                    item['expected_ids'] = id_list
                     item['total_tracks'] = len(variants_list)
                     
                     if 'last_synced' not in item:
@@ -1987,6 +2329,8 @@ class SpotDLApp(ctk.CTk):
                 executor.map(_refresh_item, all_playlists)
 
             self.config_manager.set("library", library)
+            # Fresh track lists: re-derive which local files no playlist contains anymore
+            self._update_orphan_report()
             self.set_active_task(None)
             self.after(0, self.lbl_lib_refresh_status.pack_forget)
             self.after(0, self.refresh_library_ui) 
@@ -1995,9 +2339,9 @@ class SpotDLApp(ctk.CTk):
         threading.Thread(target=work, daemon=True).start()
 
     def _get_expected_filenames(self, spotify_url, sp=None):
-        """Helper to fetch tracklist and return (list of variants per track, max_spotify_date)."""
+        """Helper to fetch tracklist and return (one signature per track, max_spotify_date, [track_id, isrc] per track)."""
         if not SPOTIPY_AVAILABLE or not spotify_url:
-            return [], None
+            return [], None, []
             
         try:
             if not sp:
@@ -2011,7 +2355,7 @@ class SpotDLApp(ctk.CTk):
             
             if 'playlist' in spotify_url:
                 # Include added_at to track when the playlist was last updated on Spotify
-                results = self.spotify_service.safe_call(sp.playlist_items, spotify_url, fields="items(added_at,track(name,artists(name))),next")
+                results = self.spotify_service.safe_call(sp.playlist_items, spotify_url, fields="items(added_at,track(id,name,artists(name),external_ids(isrc))),next")
                 if results and 'items' in results:
                     tracks.extend(results['items'])
                     while results['next']:
@@ -2036,57 +2380,19 @@ class SpotDLApp(ctk.CTk):
                         if not results: break
                         tracks.extend([{"track": t} for t in results['items']])
 
-            expected_variants = []
+            # One canonical signature per track (artists + title, see app.utils.track_signature)
+            expected_variants, expected_ids = [], []
             for item in tracks:
                 t = item.get('track')
                 if not t: continue
+                expected_variants.append(track_signature([a['name'] for a in t['artists']], t['name']))
+                # Album tracks carry no ISRC; the Spotify ID alone identifies them
+                expected_ids.append([t.get('id'), (t.get('external_ids') or {}).get('isrc')])
                 
-                artists = [a['name'] for a in t['artists']]
-                title = t['name']
-                
-                # VARIANT EXPLOSION ENGINE
-                # -------------------------
-                base_variants = []
-                
-                # 1. Primary Artist only
-                primary = artists[0]
-                base_variants.append(f"{primary} - {title}")
-                
-                # 2. All Artists with different separators
-                if len(artists) > 1:
-                    # spotDL default: "Artist 1, Artist 2 - Title"
-                    base_variants.append(f"{', '.join(artists)} - {title}")
-                    # Common alternative: "Artist 1 & Artist 2 - Title"
-                    base_variants.append(f"{' & '.join(artists)} - {title}")
-                    # Common alternative: "Artist 1 and Artist 2 - Title"
-                    base_variants.append(f"{' and '.join(artists)} - {title}")
-                    # Space separated: "Artist 1 Artist 2 - Title"
-                    base_variants.append(f"{' '.join(artists)} - {title}")
-
-                # 3. Handle (feat. X) variations in Title
-                # Some spotDL versions move feat to the end or strip it
-                expanded = []
-                for bv in base_variants:
-                    expanded.append(bv)
-                    if " (feat. " in bv:
-                        # Variant without feat. suffix
-                        expanded.append(bv.split(" (feat. ")[0])
-                    elif " feat. " in bv:
-                        expanded.append(bv.split(" feat. ")[0])
-
-                # Sanitize all and deduplicate
-                track_variants = set()
-                for v in expanded:
-                    sanitized = self._sanitize_filename(v).lower()
-                    if sanitized:
-                        track_variants.add(sanitized)
-                
-                expected_variants.append(list(track_variants))
-                
-            return expected_variants, max_date
+            return expected_variants, max_date, expected_ids
         except Exception as e:
             self.log_message(f"Error fetching expected filenames: {e}")
-            return []
+            return [], None, []
 
     def _update_item_timestamps(self, url, downloaded=False, checked=False, synced=False):
         """Helper to update timestamp fields for a playlist in the library."""
@@ -2110,8 +2416,9 @@ class SpotDLApp(ctk.CTk):
                         found = True
             return found
 
-        if _update_recursive(library):
-            self.config_manager.set("library", library)
+        with self.config_manager.lock:
+            if _update_recursive(library):
+                self.config_manager.set("library", library)
 
     def _on_drag_start(self, event, item_list, index):
         """Initializes drag-and-drop reordering within a specific list (root or group)."""
@@ -2302,6 +2609,10 @@ class SpotDLApp(ctk.CTk):
         if not library:
             messagebox.showinfo(self.i18n.t("info"), self.i18n.t("nothing_to_sync_msg"))
             return
+        if self._refuse_if_rate_limited(self.downloader.rate_limit_remaining()):
+            return
+        if not self._confirm_disk_space(library):
+            return
         
         self.btn_sync.configure(state="disabled", text=self.i18n.t("syncing") + "...")
         threading.Thread(target=self.run_batch_sync, args=(library,), daemon=True).start()
@@ -2309,6 +2620,8 @@ class SpotDLApp(ctk.CTk):
     def sync_individual(self, url, name, button=None, local_path=None):
         """Syncs a single playlist/album from the library."""
         if not url: return
+        if self._refuse_if_rate_limited(self.downloader.rate_limit_remaining()):
+            return
         
         if button:
             button.configure(state="disabled", text=self.i18n.t("syncing") + "...", fg_color="gray")
@@ -2317,8 +2630,9 @@ class SpotDLApp(ctk.CTk):
         threading.Thread(target=self.run_individual_sync, args=(url, name, button, local_path), daemon=True).start()
 
     def _prepare_sync_context(self, url, last_synced):
-        """Helper to get newly added tracks since last_synced."""
+        """Helper to get newly added tracks since last_synced, plus the full remote track list."""
         new_track_names = []
+        remote_tracks = []
         is_first_sync = last_synced is None
         if self.spotify_service.sp:
             try:
@@ -2328,30 +2642,55 @@ class SpotDLApp(ctk.CTk):
                 else:
                     target_id = url
                 
-                tracks_with_dates = self.spotify_service.get_playlist_tracks_with_dates(target_id)
+                remote_tracks = self.spotify_service.get_playlist_tracks(target_id)
                 if is_first_sync:
-                    new_track_names = [t[0] for t in tracks_with_dates]
+                    new_track_names = [t['name'] for t in remote_tracks]
                 else:
-                    new_track_names = [t[0] for t, d in tracks_with_dates if d and d > last_synced]
+                    new_track_names = [t['name'] for t in remote_tracks if t['added_at'] and t['added_at'] > last_synced]
             except:
                 is_first_sync = True
         else:
             is_first_sync = True
-        return is_first_sync, new_track_names
+        return is_first_sync, new_track_names, remote_tracks
+
+    def _download_with_plan(self, url, name, target_cwd, remote_tracks, status_callback=None, **kwargs):
+        """Hands spotDL only the tracks missing locally; falls back to the full URL without a track list."""
+        if not remote_tracks and self._folder_complete(url, name, target_cwd):
+            # No track list, but every expected file is on disk: nothing for spotDL to do
+            self.log_message(f"'{name}' is complete on disk. spotDL not launched.")
+            return True, [], [], False, None
+        if not remote_tracks:
+            # Albums, Liked Songs or metadata unavailable: let spotDL resolve the whole URL
+            return self.downloader.download(url, cwd=target_cwd, playlist_name=name, status_callback=status_callback, **kwargs)
+        plan = SyncPlanner(self.downloader.matcher, self.downloader.tag_index()).plan(remote_tracks, target_cwd)
+        return self.downloader.download_planned(url, plan, cwd=target_cwd, playlist_name=name, status_callback=status_callback, **kwargs)
+
+    def _folder_complete(self, url, name, target_cwd):
+        """True if the library item's expected filenames are all present in target_cwd."""
+        norm_url = normalize_spotify_url(url)
+        item = next((it for it in self._flatten_library(self.config_manager.get("library") or [])
+                     if normalize_spotify_url(it.get('url')) == norm_url), None)
+        if not item or not item.get('expected_files'):
+            return False
+        # Spotify changed after the last sync: the expected list may be stale
+        if item.get('spotify_updated') and (not item.get('last_synced') or item['spotify_updated'] > item['last_synced']):
+            return False
+        # Skipping spotDL on stale catalog rows would leave deleted files missing; list the folder now
+        self.file_catalog.refresh_dir(target_cwd)
+        status = self.get_playlist_folder_status(name, target_cwd, item['expected_files'], item.get('expected_ids'))
+        return bool(status and status.is_complete)
 
     def _evaluate_sync_failures(self, failed_tracks, new_track_names, is_first_sync):
         """Determines if any NEW failures occurred."""
         if is_first_sync:
             return len(failed_tracks) > 0, failed_tracks
             
-        new_failures = []
-        for ft in failed_tracks:
-            ft_norm = ft.lower().replace(" - ", " ").strip()
-            for nt in new_track_names:
-                nt_norm = nt.lower().replace(" - ", " ").strip()
-                if ft_norm in nt_norm or nt_norm in ft_norm:
-                    new_failures.append(ft)
-                    break
+        # Exact signature lookup first, then the trigram index for spelling differences
+        new_sigs = {filename_signature(nt) for nt in new_track_names}
+        failed_sigs = [(ft, filename_signature(ft)) for ft in failed_tracks]
+        unmatched = [sig for _, sig in failed_sigs if sig not in new_sigs]
+        fuzzy = self.downloader.matcher.match(unmatched, list(new_sigs), remember=False)
+        new_failures = [ft for ft, sig in failed_sigs if sig in new_sigs or sig in fuzzy]
         return len(new_failures) > 0, new_failures
 
     def run_individual_sync(self, url, name, button=None, local_path=None):
@@ -2364,7 +2703,7 @@ class SpotDLApp(ctk.CTk):
         item = next((it for it in self._flatten_library(library) if normalize_spotify_url(it.get('url')) == norm_url), {})
         last_synced = item.get('last_synced')
         
-        is_first_sync, new_track_names = self._prepare_sync_context(url, last_synced)
+        is_first_sync, new_track_names, remote_tracks = self._prepare_sync_context(url, last_synced)
         if new_track_names and not is_first_sync:
              self.log_message(f"Found {len(new_track_names)} tracks added since last sync.")
 
@@ -2384,7 +2723,12 @@ class SpotDLApp(ctk.CTk):
 
         # Track progress for crash recovery
         self._set_item_progress_flag(url, True)
-        success, tracks, failed_tracks, crashed, error_msg = self.downloader.download(url, cwd=target_cwd, playlist_name=name)
+        # A foreground sync borrows a slot from a running batch (pauses one of its jobs meanwhile)
+        preempted = self.downloader.begin_foreground()
+        try:
+            success, tracks, failed_tracks, crashed, error_msg = self._download_with_plan(url, name, target_cwd, remote_tracks)
+        finally:
+            self.downloader.end_foreground(preempted)
         self._set_item_progress_flag(url, False)
         
         # Update sync_interrupted flag 
@@ -2397,7 +2741,7 @@ class SpotDLApp(ctk.CTk):
         self._set_item_interrupted_flag(url, is_interrupted)
         
         # Phase 111: Sync History with Smart Logic
-        self.history_manager.set_last_entry_interrupted(is_interrupted, error=error_msg)
+        self.history_manager.set_last_entry_interrupted(is_interrupted, error=error_msg, source=url)
         
         # Final UI update
         # Always update last_synced if the sync completed (even with warnings), to prevent infinite first-sync loops
@@ -2467,19 +2811,27 @@ class SpotDLApp(ctk.CTk):
                     except: pass
                 self.after(0, _safe_button_reset)
 
-    def run_batch_sync(self, library):
+    def run_batch_sync(self, library, resume_batch=None):
         self.set_active_task("Batch Syncing")
-        self.log_message("Starting Batch Sync...")
-        # Flatten the library for batch sync processing
-        flat_library = self._flatten_library(library)
-        total = len(flat_library)
+        if resume_batch is not None:
+            # Continue an interrupted batch; prefer the current library entry (fresh timestamps/paths)
+            resumed = self.job_store.resume_jobs(resume_batch)
+            batch_id, job_ids = resume_batch, [jid for jid, _ in resumed]
+            current = {normalize_spotify_url(it.get('url')): it for it in self._flatten_library(self.config_manager.get("library") or [])}
+            flat_library = [current.get(normalize_spotify_url(p.get('url')), p) for _, p in resumed]
+            self.log_message(f"Resuming Batch Sync: {len(flat_library)} playlist(s) left.")
+        else:
+            self.log_message("Starting Batch Sync...")
+            # Flatten the library for batch sync processing
+            flat_library = self._flatten_library(library)
+            batch_id, job_ids = self.job_store.create_batch("sync_all", flat_library)
+        job_of = {id(it): jid for it, jid in zip(flat_library, job_ids)}
         base_path = self.config_manager.get("output_path")
         all_new_tracks = []
         
-        for i, item in enumerate(flat_library):
+        def _sync_item(item, retry=None):
             name = item.get('name', 'Unknown')
-            self.set_active_task(f"Batch Sync [{i+1}/{total}]: {name}")
-            self.log_message(f"[{i+1}/{total}] Syncing: {name}")
+            job_id = job_of.get(id(item))
             
             # Subfolder Logic
             if item.get('local_path') and os.path.exists(item['local_path']):
@@ -2491,13 +2843,29 @@ class SpotDLApp(ctk.CTk):
             if not os.path.exists(target_cwd):
                 os.makedirs(target_cwd, exist_ok=True)
                 
-            self._set_item_progress_flag(item['url'], True)
-            
-            # Phase 110: Date-Aware check for batch
-            last_synced = item.get('last_synced')
-            is_first_sync, new_track_names = self._prepare_sync_context(item['url'], last_synced)
+            if retry and retry.context:
+                # Resumed after being parked: reuse the track list fetched the first time
+                is_first_sync, new_track_names, remote_tracks = retry.context
+            else:
+                self.job_store.mark_running(job_id)
+                self._set_item_progress_flag(item['url'], True)
+                
+                # Phase 110: Date-Aware check for batch
+                last_synced = item.get('last_synced')
+                is_first_sync, new_track_names, remote_tracks = self._prepare_sync_context(item['url'], last_synced)
             
-            success, tracks, failed_tracks, crashed, error_msg = self.downloader.download(item['url'], cwd=target_cwd, playlist_name=name)
+            try:
+                success, tracks, failed_tracks, crashed, error_msg = self._download_with_plan(
+                    item['url'], name, target_cwd, remote_tracks,
+                    defer_retries=True, resume_state=retry.state if retry else None,
+                    on_track=lambda t: self.job_store.record_track(job_id, t))
+            except RetryLater as e:
+                e.context = (is_first_sync, new_track_names, remote_tracks)
+                raise
+            if crashed:
+                self.job_store.mark_failed(job_id, error_msg)
+            else:
+                self.job_store.mark_done(job_id)
             self._set_item_progress_flag(item['url'], False)
             
             has_new_failures, _ = self._evaluate_sync_failures(failed_tracks, new_track_names, is_first_sync)
@@ -2505,14 +2873,24 @@ class SpotDLApp(ctk.CTk):
             self._set_item_interrupted_flag(item['url'], is_interrupted)
             
             # Phase 111: Sync History with Smart Logic
-            self.history_manager.set_last_entry_interrupted(is_interrupted, error=error_msg)
+            self.history_manager.set_last_entry_interrupted(is_interrupted, error=error_msg, source=item['url'])
             
             if success or len(tracks) > 0 or not crashed:
-                all_new_tracks.extend(tracks)
                 # Always update last_synced if the sync completed (even with normal lookup warnings)
                 self._update_item_timestamps(item['url'], downloaded=(len(tracks) > 0), checked=True, synced=not is_interrupted)
                 for track in tracks:
                     self.log_download(track)
+                return tracks
+            return []
+
+        # Several playlists at once; each job owns its own spotDL process
+        pool = self._create_sync_pool(self._on_batch_sync_progress)
+        try:
+            for tracks in pool.run(flat_library, _sync_item, label_fn=lambda it: it.get('name', 'Unknown')):
+                all_new_tracks.extend(tracks or [])
+        finally:
+            self._release_sync_pool(pool)
+        self.job_store.finish_batch(batch_id)
         
         self.after(0, lambda: self.btn_sync.configure(state="normal", text=self.i18n.t("sync_all")))
         self.after(0, self.refresh_library_ui)
@@ -2623,6 +3001,7 @@ class SpotDLApp(ctk.CTk):
         # Sort history by newest first (create a copy)
         history_items = history[::-1]
         history_updated = False
+        quarantine_cache = {}
 
         for i, entry in enumerate(history_items):
             card = ctk.CTkFrame(self.history_frame)
@@ -2706,6 +3085,21 @@ class SpotDLApp(ctk.CTk):
                 txt_tracks.pack(fill="x", pady=5)
             else:
                 ctk.CTkLabel(details_frame, text=self.i18n.t("no_tracks_recorded"), text_color="gray").pack()
+
+            # Tracks of this playlist held back after repeated failures
+            if source_url not in quarantine_cache:
+                quarantine_cache[source_url] = self.quarantine_manager.entries_for_source(source_url)
+            quarantined = quarantine_cache[source_url]
+            if quarantined:
+                ctk.CTkLabel(details_frame, text=self.i18n.t("quarantined_tracks", count=len(quarantined)),
+                             text_color="orange", font=("Arial", 11, "bold"), anchor="w").pack(fill="x", pady=(5, 0))
+                lines = [self.i18n.t("quarantine_line", name=q.get('name'), failures=q.get('failures', 0),
+                                     next=datetime.fromtimestamp(q.get('next_retry', 0)).strftime(ts_format))
+                         for q in quarantined]
+                txt_q = ctk.CTkTextbox(details_frame, height=min(max(40, len(lines) * 20), 120), font=("Courier", 11))
+                txt_q.insert("1.0", "\n".join(lines))
+                txt_q.configure(state="disabled")
+                txt_q.pack(fill="x", pady=5)
             
         if history_updated:
             self.history_manager.save_history()
@@ -2763,6 +3157,18 @@ class SpotDLApp(ctk.CTk):
         self.combo_log = ctk.CTkComboBox(self.tab_settings, values=["DEBUG", "INFO", "WARNING", "ERROR"])
         self.combo_log.set(self.config_manager.get("log_level"))
         self.combo_log.grid(row=6, column=1, padx=10, pady=10, sticky="w")
+
+        # Parallel Syncs (worker pool size for Sync All / profile downloads)
+        ctk.CTkLabel(self.tab_settings, text=self.i18n.t("parallel_syncs") + ":").grid(row=7, column=0, padx=10, pady=10, sticky="w")
+        self.combo_parallel = ctk.CTkComboBox(self.tab_settings, values=[str(n) for n in range(1, 9)])
+        self.combo_parallel.set(str(self._get_parallel_syncs()))
+        self.combo_parallel.grid(row=7, column=1, padx=10, pady=10, sticky="w")
+        ToolTip(self.combo_parallel, self.i18n.t("tip_parallel_syncs"))
+
+        # Maintenance
+        self.btn_duplicates = ctk.CTkButton(self.tab_settings, text=self.i18n.t("find_duplicates"), command=self.find_duplicates)
+        self.btn_duplicates.grid(row=8, column=1, padx=10, pady=10, sticky="w")
+        ToolTip(self.btn_duplicates, self.i18n.t("tip_find_duplicates"))
         
         btn_save = ctk.CTkButton(self.tab_settings, text=self.i18n.t("save"), command=self.save_settings)
         btn_save.grid(row=10, column=0, columnspan=3, pady=(20, 10))
@@ -3056,6 +3462,7 @@ class SpotDLApp(ctk.CTk):
             self.entry_output.delete(0, "end")
             self.entry_output.insert(0, directory)
             self.config_manager.set("output_path", directory) # Auto-save
+            self._start_library_watcher()
 
 
     def save_settings(self):
@@ -3076,9 +3483,13 @@ class SpotDLApp(ctk.CTk):
             "spotify_client_secret": secret,
             "spotify_user_id": self.entry_user_id.get(),
             "log_level": self.combo_log.get(),
+            "max_parallel_syncs": self._parse_int(self.combo_parallel.get(), 3, 1, 16),
             "language": "tr" if self.combo_lang.get() == "Türkçe" else "en"
         }, bypass_safety=True)
         
+        self.logger.set_level(self.config_manager.get("log_level"))
+        self._start_library_watcher()
+
         new_lang = self.config_manager.get("language")
         old_lang = self.i18n.lang
         
@@ -3089,10 +3500,69 @@ class SpotDLApp(ctk.CTk):
         
         self.update_profile_display() # Refresh profile
 
+    def find_duplicates(self):
+        """Scans the music folder for identical audio files in the background, then offers to reclaim them."""
+        if getattr(self, '_duplicates_running', False):
+            return
+        self._duplicates_running = True
+        self.btn_duplicates.configure(state="disabled")
+        threading.Thread(target=self._duplicates_worker, daemon=True).start()
+
+    def _duplicates_worker(self):
+        self.set_active_task(self.i18n.t("duplicates_scanning"))
+        try:
+            output_base = self.config_manager.get("output_path")
+            self._refresh_catalog()
+            files = self.file_catalog.files_under(output_base, AUDIO_EXTENSIONS)
+            start = time.time()
+            groups = self.duplicate_finder.find(files)
+            reclaimable = sum(g.reclaimable for g in groups)
+            self.log_message(f"Duplicate scan: {len(files)} files, {len(groups)} duplicate group(s), "
+                             f"{format_size(reclaimable)} reclaimable ({time.time() - start:.1f}s).")
+            self.after(0, lambda: self._show_duplicates(groups, output_base))
+        except Exception as e:
+            self.log_message(f"Duplicate scan failed: {e}")
+            self.after(0, lambda: self.btn_duplicates.configure(state="normal"))
+        finally:
+            self._duplicates_running = False
+            self.set_active_task(None)
+
+    def _show_duplicates(self, groups, root):
+        self.btn_duplicates.configure(state="normal")
+        if not groups:
+            messagebox.showinfo(self.i18n.t("duplicates_title"), self.i18n.t("duplicates_none"))
+            return
+        mode = DuplicatesDialog(self, groups, self.i18n.t, root).get_input()
+        if not mode:
+            return
+        if mode == "delete":
+            extra = sum(g.copies - 1 for g in groups)
+            if not messagebox.askyesno(self.i18n.t("duplicates_title"), self.i18n.t("duplicates_delete_confirm", files=extra)):
+                return
+        threading.Thread(target=self._resolve_duplicates, args=(groups, mode), daemon=True).start()
+
+    def _resolve_duplicates(self, groups, mode):
+        """Keeps the first file of each group and hardlinks or deletes the others."""
+        self.set_active_task(self.i18n.t("duplicates_title"))
+        try:
+            reclaimed = sum(self.duplicate_finder.resolve(g, mode) for g in groups)
+            self.duplicate_finder.save_cache()
+            self.log_message(f"Duplicates {'hardlinked' if mode == 'link' else 'deleted'}: {format_size(reclaimed)} reclaimed.")
+            self._refresh_catalog()
+            msg = self.i18n.t("duplicates_done", size=format_size(reclaimed))
+            self.after(0, lambda: messagebox.showinfo(self.i18n.t("duplicates_title"), msg))
+            if mode == "delete":
+                self.after(0, lambda: self.refresh_library_ui(remote_sync=False))
+        except Exception as e:
+            self.log_message(f"Resolving duplicates failed: {e}")
+        finally:
+            self.set_active_task(None)
+
     def confirm_restore_defaults(self):
         if messagebox.askyesno(self.i18n.t("restore_defaults"), self.i18n.t("restore_confirm")):
             self.config_manager.reset_defaults()
             self.history_manager.clear_history()
+            self.quarantine_manager.clear()
             
             # Remove spotipy cache files (tokens)
             try:
@@ -3115,6 +3585,8 @@ class SpotDLApp(ctk.CTk):
             self.entry_user_id.delete(0, "end")
             
             self.combo_log.set("INFO")
+            self.logger.set_level("INFO")
+            self.combo_parallel.set(str(self._get_parallel_syncs()))
             
             # self.setup_logging()
             self.update_profile_display()
@@ -3125,66 +3597,63 @@ class SpotDLApp(ctk.CTk):
 
 
     def log_message(self, message: str):
-        """Appends message to the Log tab in a thread-safe way and writes to file."""
-        # File logging
-        logging.info(message)
-        
-        # GUI logging
-        def _log():
-             self.txt_logs.insert("end", f"{datetime.now().strftime('%H:%M:%S')} - {message}\n")
-             self.txt_logs.see("end")
-        self.after(0, _log)
+        """Logs a message to file and the Log tab. Thread-safe; the tab is updated by _flush_log_sink."""
+        self.logger.log(message)
+
+    def _flush_log_sink(self):
+        """Moves buffered log lines into the Log tab in one insert and trims it to the newest lines."""
+        try:
+            lines = self.logger.drain_gui()
+            if lines:
+                self.txt_logs.insert("end", "".join(lines))
+                line_count = int(self.txt_logs.index("end-1c").split(".")[0]) - 1
+                excess = line_count - LogService.MAX_GUI_LINES
+                if excess > 0:
+                    self.txt_logs.delete("1.0", f"{excess + 1}.0")
+                self.txt_logs.see("end")
+        except Exception:
+            pass
+        self.after(LogService.GUI_FLUSH_MS, self._flush_log_sink)
 
 
 
     def start_download(self):
-        """Initiates the download process."""
-        url = self.entry_url.get().strip()
-        if not url:
+        """Queues every URL in the Quick Download box as a parallel download job."""
+        urls = self._parse_quick_urls(self.entry_url.get())
+        if not urls:
             messagebox.showwarning(self.i18n.t("warning"), self.i18n.t("enter_url_notice"))
             return
+        if self._refuse_if_rate_limited():
+            return
 
         fmt = self.opt_format.get()
         self.btn_download.configure(state="disabled", text="Downloading...")
         self.lbl_status.configure(text="Starting download process...", text_color="orange")
-        self.log_message(f"Starting download for: {url}")
+        self.log_message(f"Starting Quick Download for {len(urls)} URL(s).")
         
         # Run in background thread
-        threading.Thread(target=self.run_spotdl, args=(url, fmt), daemon=True).start()
+        threading.Thread(target=self.run_spotdl, args=(urls, fmt), daemon=True).start()
+
+    @staticmethod
+    def _parse_quick_urls(text):
+        """Splits pasted text (spaces, commas or newlines) into unique normalized URLs, in order."""
+        urls = []
+        for part in re.split(r"[\s,]+", text or ""):
+            if part and normalize_spotify_url(part) not in urls:
+                urls.append(normalize_spotify_url(part))
+        return urls
 
-    def _get_spotdl_command(self, url, fmt="mp3"):
-        """Constructs the spotDL command with all necessary flags and credentials."""
-        cookie_file = self.config_manager.get("cookie_file")
+    def _quick_download_args(self, fmt="mp3"):
+        """spotDL options specific to Quick Download."""
+        args = ["--bitrate", "disable", "--format", fmt]
         cid = self.config_manager.get("spotify_client_id")
         secret = self.config_manager.get("spotify_client_secret")
-        
-        # Absolute path for cookie file
-        if cookie_file:
-            cookie_file = os.path.abspath(cookie_file)
-
-        import sys
-        if getattr(sys, 'frozen', False):
-            # When bundled with PyInstaller, route back to main.py's internal hook
-            cmd = [sys.executable, "--internal-spotdl-run"]
-        else:
-            # When running from source, use the spotdl entry point (sys.executable -m spotdl is safer than just 'spotdl')
-            cmd = [sys.executable, "-m", "spotdl"]
-            
-        cmd.extend([
-            "--cookie-file", cookie_file,
-            "--bitrate", "disable",
-            "--format", fmt,
-            "--output", "{artists} - {title}.{output-ext}"
-        ])
-
         if cid and secret:
-            cmd.extend(["--client-id", cid, "--client-secret", secret])
-
-        cmd.extend(["download", normalize_spotify_url(url)])
-        return cmd
+            args.extend(["--client-id", cid, "--client-secret", secret])
+        return args
 
-    def run_spotdl(self, url: str, fmt: str = "mp3"):
-        """Executes the spotDL command using subprocess with a dedicated Quick Downloads folder."""
+    def run_spotdl(self, urls, fmt: str = "mp3"):
+        """Downloads Quick Download URLs through the downloader's job pool into the Quick Downloads folder."""
         base_output = self.config_manager.get("output_path")
         qd_folder = os.path.join(base_output, "Quick Downloads")
         
@@ -3197,68 +3666,46 @@ class SpotDLApp(ctk.CTk):
                 # Fallback to base output
                 qd_folder = base_output
 
-        cmd = self._get_spotdl_command(url, fmt)
-        
-        try:
-            self.log_message(f"EXECUTING COMMAND: {' '.join(cmd)}")
-            
-            # Start process
-            process = subprocess.Popen(
-                cmd,
-                cwd=qd_folder,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1
-            )
-            
-            downloaded_tracks = []
-            
-            # Read output in real-time
-            for line in process.stdout:
-                line = line.strip()
-                if line:
-                    self.log_message(line)
-                    # Detect downloaded tracks
-                    if 'Downloaded "' in line:
-                        try:
-                            track_name = line.split('Downloaded "')[1].split('"')[0]
-                            if track_name not in downloaded_tracks:
-                                downloaded_tracks.append(track_name)
-                        except: pass
-                    # Detect skipped tracks
-                    elif 'Skipping' in line and '(file already exists)' in line:
-                        try:
-                            track_name = line.split('Skipping ')[1].split(' (file already exists)')[0]
-                            if track_name not in downloaded_tracks:
-                                downloaded_tracks.append(track_name)
-                        except: pass
-
-            process.wait()
-            
-            # Context for logging
-            resolved_name = self.i18n.t("quick_download")
-            
-            if process.returncode == 0:
-                # Log success even if 0 tracks were 'newly' downloaded (some might have been skipped)
-                self.history_manager.add_entry(url, downloaded_tracks, name=resolved_name)
-                self.after(0, self.refresh_history_ui)
-                self.after(0, lambda: self.on_download_success(url, downloaded_tracks, final_path=qd_folder))
+        resolved_name = self.i18n.t("quick_download")
+        extra_args = self._quick_download_args(fmt)
+        errors = []
+
+        def _download_url(url, retry=None):
+            tracker = retry.state['tracker'] if retry else SpotDLOutputTracker()
+            success, tracks, failed_tracks, crashed, error_msg = self.downloader.download(
+                url, resolved_name, cwd=qd_folder, extra_args=extra_args, record_history=False, tracker=tracker,
+                defer_retries=True, resume_state=retry.state if retry else None)
+            # Skipped tracks (file already exists) count as part of the download
+            tracks = tracks + [t for t in tracker.skipped if t not in set(tracks)]
+            if crashed or (not success and not tracks):
+                error = error_msg or "Download failed"
+                errors.append(f"{url}: {error}")
+                self.history_manager.add_entry(url, tracks, name=resolved_name, error=error)
             else:
-                # Failed process
-                err_msg = f"spotDL process failed with code {process.returncode}"
-                self.history_manager.add_entry(url, [], name=resolved_name, error=err_msg)
-                self.after(0, self.refresh_history_ui)
-                self.after(0, lambda m=err_msg: self.on_download_error(m))
+                # Logged even if 0 tracks were newly downloaded (some might have been skipped)
+                self.history_manager.add_entry(url, tracks, name=resolved_name)
+            return tracks
 
-        except FileNotFoundError:
-             error_msg = "spotDL command not found. Please ensure it is installed and in PATH."
-             self.history_manager.add_entry(url, [], name=self.i18n.t("quick_download"), error=error_msg)
-             self.after(0, lambda m=error_msg: self.on_download_error(m))
-        except Exception as e:
-             error_msg = str(e)
-             self.history_manager.add_entry(url, [], name=self.i18n.t("quick_download"), error=error_msg)
-             self.after(0, lambda m=error_msg: self.on_download_error(m))
+        def _on_progress(done, total, running):
+            self.set_active_task(f"Quick Download [{done}/{total}]")
+            self.after(0, lambda: self.lbl_status.configure(text=f"Downloading [{done}/{total}]...", text_color="orange"))
+
+        pool = self._create_sync_pool(_on_progress)
+        try:
+            results = pool.run(urls, _download_url)
+        finally:
+            self._release_sync_pool(pool)
+        self.after(0, self.refresh_history_ui)
+
+        downloaded_tracks = []
+        for tracks in results:
+            downloaded_tracks.extend(t for t in (tracks or []) if t not in downloaded_tracks)
+        if errors and len(errors) == len(urls):
+            self.after(0, lambda m="\n".join(errors): self.on_download_error(m))
+            return
+        for err in errors:
+            self.log_message(f"Quick Download error: {err}")
+        self.after(0, lambda: self.on_download_success(urls, downloaded_tracks, final_path=qd_folder))
 
     def on_download_success(self, url, tracks, final_path=None):
         self.set_active_task(None)
@@ -3303,6 +3750,32 @@ class SpotDLApp(ctk.CTk):
             pass
 
     # --- Sync & History Helpers ---
+    def _get_rate_limit_remaining(self):
+        """Longest persisted Spotify ban affecting either syncs or metadata requests."""
+        return self.rate_limit_manager.get_max_remaining([self.spotify_service.credential_key(), self.downloader.credential_key()])
+
+    def _refuse_if_rate_limited(self, remaining=None):
+        """Warns and returns True while a persisted rate-limit ban is still running."""
+        if remaining is None:
+            remaining = self._get_rate_limit_remaining()
+        if remaining <= 0:
+            return False
+        self.log_message(f"Request refused: Extreme Rate Limit active ({remaining}s remaining).")
+        messagebox.showwarning(self.i18n.t("warning"), self.i18n.t("rate_limit_active_msg", remaining=format_duration(remaining)))
+        return True
+
+    def _tick_rate_limit_countdown(self):
+        """Refreshes the rate-limit countdown label once per second."""
+        try:
+            remaining = self._get_rate_limit_remaining()
+            if remaining > 0:
+                self.lbl_rate_limit.configure(text=self.i18n.t("rate_limit_countdown", remaining=format_duration(remaining)))
+            else:
+                self.lbl_rate_limit.configure(text="")
+        except Exception:
+            pass
+        self.after(1000, self._tick_rate_limit_countdown)
+
     def _set_item_interrupted_flag(self, url, is_interrupted):
         """Sets the sync_interrupted flag for a library item."""
         library = self.config_manager.get("library") or []
@@ -3318,8 +3791,9 @@ class SpotDLApp(ctk.CTk):
                     if _set_rec(item.get("items", [])): return True
             return False
             
-        if _set_rec(library):
-            self.config_manager.set("library", library)
+        with self.config_manager.lock:
+            if _set_rec(library):
+                self.config_manager.set("library", library)
 
     def confirm_clear_history(self):
         """Prompts and wipes history."""
@@ -3328,6 +3802,35 @@ class SpotDLApp(ctk.CTk):
             self.refresh_history_ui()
             messagebox.showinfo(self.i18n.t("info"), self.i18n.t("history_cleared_msg"))
 
+    def _offer_batch_resume(self):
+        """Offers to continue a batch sync that was cut short by a crash or shutdown."""
+        try:
+            batch = self.job_store.get_unfinished_batch()
+        except Exception as e:
+            self.log_message(f"Job store unavailable: {e}")
+            return
+        if not batch:
+            return
+        if not batch['remaining']:
+            self.job_store.finish_batch(batch['id'])
+            return
+        if self.downloader.rate_limit_remaining() > 0:
+            # Keep the batch queued; it can be resumed on a later start
+            self.log_message(f"Interrupted batch ({batch['remaining']} left) not resumed: rate limit active.")
+            return
+        
+        if not messagebox.askyesno(self.i18n.t("confirmation"),
+                                   self.i18n.t("resume_batch_qn", remaining=batch['remaining'], total=batch['total'])):
+            self.job_store.cancel_unfinished()
+            return
+        
+        if batch['kind'] == "profile":
+            self.btn_dl_selected.configure(state="disabled", text=self.i18n.t("starting"))
+            threading.Thread(target=self.run_batch_profile_download, args=([],), kwargs={"resume_batch": batch['id']}, daemon=True).start()
+        else:
+            self.btn_sync.configure(state="disabled", text=self.i18n.t("syncing") + "...")
+            threading.Thread(target=self.run_batch_sync, args=(None,), kwargs={"resume_batch": batch['id']}, daemon=True).start()
+
     def _recover_interrupted_syncs(self):
         """Checks library for items that were in progress when the app closed."""
         library = self.config_manager.get("library") or []
@@ -3362,10 +3865,18 @@ class SpotDLApp(ctk.CTk):
                     if _set_rec(item.get("items", [])): return True
             return False
             
-        if _set_rec(library):
-            self.config_manager.set("library", library)
+        with self.config_manager.lock:
+            if _set_rec(library):
+                self.config_manager.set("library", library)
 
     # --- UI Helpers ---
+    def _parse_int(self, value, default, lo, hi):
+        """Parses a numeric settings field, clamped to [lo, hi]."""
+        try:
+            return max(lo, min(hi, int(str(value).strip())))
+        except (TypeError, ValueError):
+            return default
+
     def _create_tooltip(self, widget, text):
         """Simple hover tooltip for CTK widgets that supports dynamic updates."""
         widget.tooltip_text = text
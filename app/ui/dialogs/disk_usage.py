@@ -0,0 +1,75 @@
+import customtkinter as ctk
+from app.utils import format_size
+
+class DiskUsageDialog(ctk.CTkToplevel):
+    """Library playlists with their size and file count; click a column header to sort by it."""
+    COLUMNS = (("name", "usage_col_name"), ("group", "usage_col_group"), ("files", "usage_col_files"), ("size", "usage_col_size"))
+
+    def __init__(self, parent, rows, t, total=None):
+        super().__init__(parent)
+        self.title(t("disk_usage"))
+        self.geometry("650x550")
+
+        # Center
+        self.update_idletasks()
+        try:
+            x = parent.winfo_x() + (parent.winfo_width() // 2) - (650 // 2)
+            y = parent.winfo_y() + (parent.winfo_height() // 2) - (550 // 2)
+            self.geometry(f"650x550+{x}+{y}")
+        except: pass
+
+        self.rows = rows  # dicts: name, group, files, size
+        self.t = t
+        self.sort_key, self.descending = "size", True
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        size = sum(r["size"] for r in rows) if total is None else total[0]
+        files = sum(r["files"] for r in rows) if total is None else total[1]
+        ctk.CTkLabel(self, text=t("usage_summary", size=format_size(size), files=files, count=len(rows)),
+                     font=("Arial", 14, "bold")).grid(row=0, column=0, padx=20, pady=10, sticky="w")
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.grid(row=1, column=0, padx=20, sticky="ew")
+        self.header_buttons = {}
+        for col, (key, label) in enumerate(self.COLUMNS):
+            header.grid_columnconfigure(col, weight=3 if key == "name" else 1)
+            btn = ctk.CTkButton(header, text=t(label), fg_color="#3a3a3a", height=24,
+                                command=lambda k=key: self._sort_by(k))
+            btn.grid(row=0, column=col, padx=2, sticky="ew")
+            self.header_buttons[key] = btn
+
+        self.list_frame = ctk.CTkScrollableFrame(self)
+        self.list_frame.grid(row=2, column=0, padx=20, pady=5, sticky="nsew")
+        for col, (key, _) in enumerate(self.COLUMNS):
+            self.list_frame.grid_columnconfigure(col, weight=3 if key == "name" else 1)
+
+        ctk.CTkButton(self, text="OK", width=100, command=self.destroy).grid(row=3, column=0, pady=15)
+        self._render()
+
+        self.transient(parent)
+        self.focus_set()
+
+    def _sort_by(self, key):
+        if key == self.sort_key:
+            self.descending = not self.descending
+        else:
+            # Text columns start A→Z, numbers largest first
+            self.sort_key, self.descending = key, key in ("files", "size")
+        self._render()
+
+    def _render(self):
+        for widget in self.list_frame.winfo_children():
+            widget.destroy()
+        for key, label in self.COLUMNS:
+            arrow = (" ▼" if self.descending else " ▲") if key == self.sort_key else ""
+            self.header_buttons[key].configure(text=self.t(label) + arrow)
+
+        text_sort = self.sort_key in ("name", "group")
+        rows = sorted(self.rows, key=lambda r: (r[self.sort_key] or "").lower() if text_sort else r[self.sort_key],
+                      reverse=self.descending)
+        for i, r in enumerate(rows):
+            values = (r["name"], r["group"] or "", str(r["files"]), format_size(r["size"]))
+            for col, value in enumerate(values):
+                ctk.CTkLabel(self.list_frame, text=value, anchor="w" if col < 2 else "e").grid(row=i, column=col, padx=6, sticky="ew")
@@ -0,0 +1,64 @@
+import os
+import customtkinter as ctk
+from app.utils import format_size
+
+class DuplicatesDialog(ctk.CTkToplevel):
+    """Lists duplicate groups (DuplicateGroup) and asks how to reclaim them: "link", "delete" or None."""
+    MAX_GROUPS_SHOWN = 200
+
+    def __init__(self, parent, groups, t, root=None):
+        super().__init__(parent)
+        self.title(t("duplicates_title"))
+        self.geometry("700x550")
+
+        # Center
+        self.update_idletasks()
+        try:
+            x = parent.winfo_x() + (parent.winfo_width() // 2) - (700 // 2)
+            y = parent.winfo_y() + (parent.winfo_height() // 2) - (550 // 2)
+            self.geometry(f"700x550+{x}+{y}")
+        except: pass
+
+        self.result = None
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        total = sum(g.reclaimable for g in groups)
+        files = sum(g.copies - 1 for g in groups)
+        summary = t("duplicates_summary", groups=len(groups), files=files, size=format_size(total))
+        ctk.CTkLabel(self, text=summary, font=("Arial", 14, "bold")).grid(row=0, column=0, padx=20, pady=10, sticky="w")
+
+        scroll = ctk.CTkScrollableFrame(self)
+        scroll.grid(row=1, column=0, padx=20, pady=5, sticky="nsew")
+        for group in groups[:self.MAX_GROUPS_SHOWN]:
+            header = f"{format_size(group.size)} × {group.copies}"
+            ctk.CTkLabel(scroll, text=header, font=("Arial", 12, "bold"), anchor="w").pack(fill="x", padx=5, pady=(8, 0))
+            for i, path in enumerate(group.paths):
+                shown = os.path.relpath(path, root) if root else path
+                prefix = "✓ " if i == 0 else "   "
+                ctk.CTkLabel(scroll, text=prefix + shown, anchor="w", text_color=None if i == 0 else "gray").pack(fill="x", padx=15)
+        if len(groups) > self.MAX_GROUPS_SHOWN:
+            ctk.CTkLabel(scroll, text=t("duplicates_more", count=len(groups) - self.MAX_GROUPS_SHOWN), text_color="gray").pack(pady=8)
+
+        ctk.CTkLabel(self, text=t("duplicates_hint"), text_color="gray", wraplength=640, justify="left").grid(row=2, column=0, padx=20, pady=5, sticky="w")
+
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.grid(row=3, column=0, pady=15)
+        state = "normal" if groups else "disabled"
+        ctk.CTkButton(btn_frame, text=t("duplicates_link"), state=state, command=lambda: self._finish("link")).pack(side="left", padx=10)
+        ctk.CTkButton(btn_frame, text=t("duplicates_delete"), state=state, fg_color="red", hover_color="darkred",
+                      command=lambda: self._finish("delete")).pack(side="left", padx=10)
+        ctk.CTkButton(btn_frame, text=t("cancel"), fg_color="gray", command=lambda: self._finish(None)).pack(side="left", padx=10)
+
+        self.transient(parent)
+        self.grab_set()
+        self.focus_set()
+        self.protocol("WM_DELETE_WINDOW", lambda: self._finish(None))
+
+    def _finish(self, result):
+        self.result = result
+        self.destroy()
+
+    def get_input(self):
+        self.wait_window()
+        return self.result
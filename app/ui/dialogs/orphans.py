@@ -0,0 +1,64 @@
+import os
+import customtkinter as ctk
+from app.utils import format_size
+
+class OrphansDialog(ctk.CTkToplevel):
+    """Lists files no library playlist contains anymore (OrphanReport) and asks what to do: "archive", "delete" or None."""
+    MAX_SHOWN = 300
+
+    def __init__(self, parent, report, t, root=None):
+        super().__init__(parent)
+        self.title(t("orphans_title"))
+        self.geometry("700x550")
+
+        # Center
+        self.update_idletasks()
+        try:
+            x = parent.winfo_x() + (parent.winfo_width() // 2) - (700 // 2)
+            y = parent.winfo_y() + (parent.winfo_height() // 2) - (550 // 2)
+            self.geometry(f"700x550+{x}+{y}")
+        except: pass
+
+        self.result = None
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        summary = t("orphans_summary", files=len(report.orphans), size=format_size(report.total_bytes))
+        ctk.CTkLabel(self, text=summary, font=("Arial", 14, "bold")).grid(row=0, column=0, padx=20, pady=10, sticky="w")
+
+        scroll = ctk.CTkScrollableFrame(self)
+        scroll.grid(row=1, column=0, padx=20, pady=5, sticky="nsew")
+        scroll.grid_columnconfigure(0, weight=1)
+        for i, (path, size) in enumerate(report.orphans[:self.MAX_SHOWN]):
+            shown = os.path.relpath(path, root) if root else path
+            ctk.CTkLabel(scroll, text=shown, anchor="w").grid(row=i, column=0, padx=5, sticky="ew")
+            ctk.CTkLabel(scroll, text=format_size(size), anchor="e", text_color="gray").grid(row=i, column=1, padx=5, sticky="e")
+        if len(report.orphans) > self.MAX_SHOWN:
+            ctk.CTkLabel(scroll, text=t("duplicates_more", count=len(report.orphans) - self.MAX_SHOWN),
+                         text_color="gray").grid(row=self.MAX_SHOWN, column=0, pady=8)
+
+        hint = t("orphans_hint")
+        if report.skipped:
+            hint += "\n" + t("orphans_skipped", count=report.skipped)
+        ctk.CTkLabel(self, text=hint, text_color="gray", wraplength=640, justify="left").grid(row=2, column=0, padx=20, pady=5, sticky="w")
+
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.grid(row=3, column=0, pady=15)
+        state = "normal" if report.orphans else "disabled"
+        ctk.CTkButton(btn_frame, text=t("orphans_archive"), state=state, command=lambda: self._finish("archive")).pack(side="left", padx=10)
+        ctk.CTkButton(btn_frame, text=t("orphans_delete"), state=state, fg_color="red", hover_color="darkred",
+                      command=lambda: self._finish("delete")).pack(side="left", padx=10)
+        ctk.CTkButton(btn_frame, text=t("cancel"), fg_color="gray", command=lambda: self._finish(None)).pack(side="left", padx=10)
+
+        self.transient(parent)
+        self.grab_set()
+        self.focus_set()
+        self.protocol("WM_DELETE_WINDOW", lambda: self._finish(None))
+
+    def _finish(self, result):
+        self.result = result
+        self.destroy()
+
+    def get_input(self):
+        self.wait_window()
+        return self.result
@@ -1,8 +1,14 @@
 import re
 import os
 import sys
+import unicodedata
 from datetime import datetime
 
+# "(feat. X)", "[ft X]", "(with X)" and a trailing "feat. X" in titles
+_FEAT_BRACKET = re.compile(r"[\(\[]\s*(?:feat|ft|featuring|with)\b\.?[^\)\]]*[\)\]]", re.IGNORECASE)
+_FEAT_TAIL = re.compile(r"\s(?:feat|ft|featuring)\b\.?\s[^\-\(\[]*", re.IGNORECASE)
+_ARTIST_NOISE = {"and", "feat", "ft", "featuring"}  # Dropped only between two artist words
+
 def get_resource_path(relative_path: str) -> str:
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -36,6 +42,69 @@ def get_safe_dirname(name: str) -> str:
     keepcharacters = (' ', '.', '_', '-', '(', ')', '[', ']', '&', ',', '!', "'", '#', '+')
     return "".join(c for c in name if c.isalnum() or c in keepcharacters).strip()
 
+def sanitize_filename(filename: str) -> str:
+    """
+    Sanitizes a string to match spotDL's default filename behavior.
+    Replaces invalid filesystem characters and standardizes whitespace.
+    """
+    if not filename:
+        return ""
+    # 1. Standardize whitespace
+    filename = " ".join(filename.split())
+    # 2. Characters spotDL/OS usually replace or strip
+    # Note: spotDL uses a complex mapping, but these are the most common
+    invalid = '<>:"/\\|?*'
+    for char in invalid:
+        filename = filename.replace(char, '_')
+    # 3. spotDL often replaces special quotes with standard ones
+    filename = filename.replace('’', "'").replace('“', '"').replace('”', '"')
+    return filename.strip()
+
+def _tokens(text: str) -> list:
+    # "_" separates words: sanitize_filename turns "/", ":" etc. into "_" ("AC/DC" -> "AC_DC")
+    return re.findall(r"[^\W_]+", unicodedata.normalize("NFKC", text or "").casefold())
+
+def _raw(text: str) -> str:
+    # Fallback for names without a single word character ("!!!", "?"): they must not all collapse to ""
+    return sanitize_filename(unicodedata.normalize("NFKC", text or "")).casefold()
+
+def _artist_words(artists) -> list:
+    """
+    Unique artist words: "and"/"feat" between two words of one name ("Simon and Garfunkel") are
+    connectors and dropped; elsewhere ("And", "And One") they are part of the name and kept,
+    placed first so that re-reading the signature keeps them too. spotDL joins artists with ", ".
+    """
+    kept, words = set(), set()
+    for name in (artists or []):
+        for part in name.split(","):
+            tokens = _tokens(part)
+            for i, w in enumerate(tokens):
+                if w not in _ARTIST_NOISE:
+                    words.add(w)
+                elif 0 < i < len(tokens) - 1 and tokens[i - 1] not in _ARTIST_NOISE and tokens[i + 1] not in _ARTIST_NOISE:
+                    continue
+                else:
+                    kept.add(w)
+    return sorted(kept) + sorted(words)
+
+def track_signature(artists, title: str) -> str:
+    """
+    Canonical form of a track for matching Spotify metadata against local filenames:
+    sorted unique artist words + title words, casefolded, without feat. clauses,
+    artist separators or punctuation. "B & A - Song (feat. C)" and ["A", "B"]/"Song" agree.
+    """
+    title = _FEAT_TAIL.sub("", _FEAT_BRACKET.sub(" ", title or ""))
+    artist_words = " ".join(_artist_words(artists)) or _raw(", ".join(artists or []))
+    title_words = " ".join(_tokens(title)) or _raw(title)
+    return f"{artist_words} - {title_words}" if artist_words else title_words
+
+def filename_signature(stem: str) -> str:
+    """Signature of a local "{artists} - {title}" filename stem. Idempotent on signatures."""
+    artists, sep, title = (stem or "").partition(" - ")
+    if not sep:
+        return track_signature([], stem)
+    return track_signature([artists], title)
+
 def format_timestamp(iso_str: str) -> str:
     """Formats an ISO timestamp into a readable string."""
     if not iso_str: return "Never"
@@ -46,3 +115,21 @@ def format_timestamp(iso_str: str) -> str:
             return dt.strftime("%d/%m/%Y %H:%M:%S")
         return iso_str
     except: return iso_str
+
+def format_duration(seconds: int) -> str:
+    """Formats a number of seconds as HH:MM:SS (or MM:SS under an hour)."""
+    seconds = max(0, int(seconds))
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    if h:
+        return f"{h:02d}:{m:02d}:{s:02d}"
+    return f"{m:02d}:{s:02d}"
+
+def format_size(num_bytes: int) -> str:
+    """Formats a byte count as a human readable size (e.g. 3.4 GB)."""
+    size = float(max(0, num_bytes or 0))
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
@@ -1,19 +1,27 @@
 #!/usr/bin/env python3
 import sys
 import os
+import multiprocessing
 
 # Ensure the project root is in sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.ui.app import SpotDLApp
-from app.core.constants import APP_NAME, APP_VERSION
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] == '--internal-spotdl-worker':
+    # Persistent spotDL worker for the bundled app; must not load the GUI
+    from app.services.spotdl_worker import worker_main
+    sys.exit(worker_main())
 
 if __name__ == "__main__":
+    # Integrity checks run in a process pool; frozen builds must hand pool children off here
+    multiprocessing.freeze_support()
+
     if len(sys.argv) > 1 and sys.argv[1] == '--internal-spotdl-run':
         # Internal bypass to use the bundled spotdl module directly
         sys.argv.pop(1)
         from spotdl.console.entry_point import console_entry_point
         sys.exit(console_entry_point())
 
+    # GUI imports stay under the main guard so pool children don't load them
+    from app.ui.app import SpotDLApp
     app = SpotDLApp()
     app.mainloop()
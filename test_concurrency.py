@@ -0,0 +1,31 @@
+from app.core.config import ConfigManager
+from app.services.concurrency import ConcurrencyController
+from app.services.spotdl_events import Downloaded, RateLimited
+
+class _Logger:
+    def __init__(self):
+        self.lines = []
+
+    def info(self, message):
+        self.lines.append(message)
+
+def test_reads_real_config():
+    # ConfigManager.get takes no default: every setting must be read with one argument
+    controller = ConcurrencyController(ConfigManager(), _Logger())
+    assert controller.adaptive() is True
+    assert controller.current_threads() >= 1
+    assert controller.current_playlists() >= 1
+
+def test_rate_limit_halves_threads():
+    logger = _Logger()
+    controller = ConcurrencyController(ConfigManager(), logger)
+    before = controller.current_threads()
+    controller.observe(Downloaded("line", "A - Song"))
+    controller.observe(RateLimited("429"))
+    assert controller.current_threads() == max(1, before // 2)
+    assert logger.lines
+
+if __name__ == "__main__":
+    test_reads_real_config()
+    test_rate_limit_halves_threads()
+    print("OK")
@@ -0,0 +1,34 @@
+import os
+
+from app.core.file_catalog import FileCatalog
+
+def _library(tmp_path):
+    root = tmp_path / "Music"
+    a, b = root / "Playlist A", root / "Playlist B"
+    a.mkdir(parents=True)
+    b.mkdir()
+    (a / "Artist - Song.mp3").write_bytes(b"x" * 1000)
+    os.link(a / "Artist - Song.mp3", b / "Artist - Song.mp3")  # Same track, linked from the content store
+    (b / "Other - Track.mp3").write_bytes(b"x" * 500)
+    (b / "cover.jpg").write_bytes(b"x" * 50)
+    catalog = FileCatalog(str(tmp_path / "catalog.db"))
+    catalog.refresh(str(root))
+    return catalog, str(root), str(a), str(b)
+
+def test_hardlinks_counted_once(tmp_path):
+    catalog, root, a, b = _library(tmp_path)
+    assert catalog.total_usage(root) == (1550, 3)
+    assert catalog.folders_usage([a, b]) == (1550, 3)
+    assert catalog.usage([b])[b] == (1550, 3)  # A single folder keeps its own aggregate
+
+def test_audio_only(tmp_path):
+    catalog, root, a, b = _library(tmp_path)
+    assert catalog.total_usage(root, (".mp3",)) == (1500, 2)
+    assert catalog.count_files(b, (".mp3",)) == 2
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    for test in (test_hardlinks_counted_once, test_audio_only):
+        with tempfile.TemporaryDirectory() as d:
+            test(pathlib.Path(d))
+    print("OK")
@@ -0,0 +1,50 @@
+import random
+import string
+import time
+
+from app.services.fuzzy_matcher import FuzzyMatcher
+
+def _library(count, seed=7):
+    """`count` distinct signatures and their local counterparts: half remasters, half remasters with a typo."""
+    rng = random.Random(seed)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(3000)]
+    phrase = lambda low, high: " ".join(rng.choice(words) for _ in range(rng.randint(low, high)))
+    missing = list(dict.fromkeys(f"{phrase(1, 2)} - {phrase(1, 4)}" for _ in range(count * 2)))[:count]
+    local = {}
+    for n, sig in enumerate(missing):
+        if n % 2:
+            i = rng.randrange(len(sig))
+            sig_on_disk = sig[:i] + rng.choice(string.ascii_lowercase) + sig[i + 1:]
+        else:
+            sig_on_disk = sig
+        local[sig] = f"{sig_on_disk} remastered 2011"
+    return missing, local
+
+def test_matches_version_noise_and_typos():
+    matcher = FuzzyMatcher()
+    result = matcher.match(["queen - bohemian rhapsody", "a-ha - take on me", "nobody - nothing alike"],
+                           ["queen - bohemian rhapsody remastered 2011", "a-ha - take on mee", "other - song"])
+    assert result == {"queen - bohemian rhapsody": "queen - bohemian rhapsody remastered 2011",
+                      "a-ha - take on me": "a-ha - take on mee"}
+
+def test_pairing_is_one_to_one():
+    result = FuzzyMatcher().match(["artist - song", "artist - song remastered"], ["artist - song 2011"], remember=False)
+    assert len(result) == 1
+
+def test_5k_fuzzy_tracks_under_a_second():
+    missing, local = _library(5000)
+    spare = list(local.values())
+    random.Random(1).shuffle(spare)
+    elapsed = []
+    for _ in range(3):
+        start = time.perf_counter()
+        result = FuzzyMatcher().match(missing, spare, remember=False)
+        elapsed.append(time.perf_counter() - start)
+    assert sum(result.get(sig) == local[sig] for sig in missing) >= 0.99 * len(missing)
+    assert min(elapsed) < 1.0, f"5k fuzzy matches took {min(elapsed):.2f}s"
+
+if __name__ == "__main__":
+    test_matches_version_noise_and_typos()
+    test_pairing_is_one_to_one()
+    test_5k_fuzzy_tracks_under_a_second()
+    print("OK")
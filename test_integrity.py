@@ -0,0 +1,59 @@
+import subprocess
+import types
+
+import app.services.integrity as integrity
+from app.services.integrity import IntegrityVerifier, probe_file
+
+MP3_BYTES = b"ID3" + b"\0" * 64 * 1024
+
+def _mp3(tmp_path, name="A - Song.mp3", data=MP3_BYTES):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+def _ffprobe(monkeypatch, stdout="", returncode=0, stderr="", raises=None):
+    def run(*args, **kwargs):
+        if raises:
+            raise raises
+        return subprocess.CompletedProcess(args, returncode, stdout=stdout, stderr=stderr)
+    monkeypatch.setattr(integrity.shutil, "which", lambda name: "/usr/bin/ffprobe")
+    monkeypatch.setattr(integrity.subprocess, "run", run)
+
+def test_duration_na_is_readable(tmp_path, monkeypatch):
+    _ffprobe(monkeypatch, stdout="N/A\n")
+    assert probe_file(_mp3(tmp_path)) == (True, None, "")
+
+def test_ffprobe_failure_is_unknown(tmp_path, monkeypatch):
+    _ffprobe(monkeypatch, raises=subprocess.TimeoutExpired("ffprobe", 60))
+    readable, duration, reason = probe_file(_mp3(tmp_path))
+    assert readable is None and duration is None and reason
+
+def test_mutagen_exception_is_unknown(tmp_path, monkeypatch):
+    def broken_file(path):
+        raise ValueError("parser quirk")
+    monkeypatch.setattr(integrity.shutil, "which", lambda name: None)
+    monkeypatch.setattr(integrity, "MUTAGEN_AVAILABLE", True)
+    monkeypatch.setattr(integrity, "mutagen", types.SimpleNamespace(File=broken_file), raising=False)
+    assert probe_file(_mp3(tmp_path))[0] is None
+
+def test_missing_file_is_unknown(tmp_path):
+    assert probe_file(str(tmp_path / "gone.mp3"))[0] is None
+
+def test_positive_findings_are_broken(tmp_path, monkeypatch):
+    _ffprobe(monkeypatch, returncode=1, stderr="Invalid data found when processing input\n")
+    assert probe_file(_mp3(tmp_path, "small.mp3", b"ID3"))[:2] == (False, None)
+    assert probe_file(_mp3(tmp_path, "junk.mp3", b"\0" * 64 * 1024))[2] == "unrecognized header"
+    assert probe_file(_mp3(tmp_path)) == (False, None, "Invalid data found when processing input")
+
+def test_verify_keeps_unchecked_files(tmp_path, monkeypatch):
+    _ffprobe(monkeypatch, raises=OSError("ffprobe not runnable"))
+    verifier = IntegrityVerifier(str(tmp_path / "cache.json"))
+    path = _mp3(tmp_path)
+    assert verifier.verify([(path, 200000)]) == []
+    assert path not in verifier.cache  # Checked again next time
+
+def test_verify_reports_truncation(tmp_path, monkeypatch):
+    _ffprobe(monkeypatch, stdout="30.0\n")
+    verifier = IntegrityVerifier(str(tmp_path / "cache.json"))
+    path = _mp3(tmp_path)
+    assert [p for p, _ in verifier.verify([(path, 200000)])] == [path]
@@ -0,0 +1,35 @@
+from app.utils import filename_signature, sanitize_filename, track_signature
+
+def test_sanitized_separator_matches_track():
+    # spotDL writes "AC/DC" as "AC_DC"; both must give the same signature
+    stem = sanitize_filename("AC/DC - Back In Black")
+    assert stem == "AC_DC - Back In Black"
+    assert filename_signature(stem) == track_signature(["AC/DC"], "Back In Black")
+
+def test_sanitized_title_matches_track():
+    assert filename_signature("Artist - What_ Now") == track_signature(["Artist"], "What? Now")
+
+def test_connector_dropped_between_names():
+    assert filename_signature("Simon and Garfunkel - The Boxer") == track_signature(["Simon & Garfunkel"], "The Boxer")
+
+def test_connector_words_kept_as_names():
+    assert track_signature(["And"], "Song") == "and - song"
+    assert track_signature(["And One"], "Song") != track_signature(["One"], "Song")
+    # spotDL writes the artists comma-separated; a band called "And" among them stays
+    sig = track_signature(["Abba", "And", "Carl"], "Song")
+    assert filename_signature("Abba, And, Carl - Song") == sig
+    assert filename_signature(sig) == sig
+
+def test_punctuation_only_names_stay_apart():
+    assert track_signature(["Artist"], "...") != track_signature(["Artist"], "!!!")
+    assert filename_signature(sanitize_filename("Artist - ?")) == track_signature(["Artist"], "?")
+    sig = track_signature(["!!!"], "Heart of Hearts")
+    assert sig == "!!! - heart of hearts" and filename_signature(sig) == sig
+
+if __name__ == "__main__":
+    test_sanitized_separator_matches_track()
+    test_sanitized_title_matches_track()
+    test_connector_dropped_between_names()
+    test_connector_words_kept_as_names()
+    test_punctuation_only_names_stay_apart()
+    print("OK")